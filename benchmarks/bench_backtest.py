@@ -0,0 +1,34 @@
+import argparse
+import numpy as np
+import structlog
+from crypto_auto.analysis.backtest import run_dca_backtest
+from benchmarks.timing import timed
+
+
+def run(weeks: int, assets: int, scenarios: int, repeat: int) -> None:
+    structlog.configure(logger_factory=structlog.ReturnLoggerFactory())
+
+    rng = np.random.default_rng(42)
+    prices = np.cumprod(1 + rng.normal(0.002, 0.08, (weeks, assets)), axis=0) * 100
+    allocations = rng.dirichlet(np.ones(assets), scenarios)
+
+    elapsed = min(
+        timed(lambda: run_dca_backtest(prices, allocations, dca_amount=1000.0))
+        for _ in range(repeat)
+    )
+
+    print(f"weeks:            {weeks}")
+    print(f"assets:           {assets}")
+    print(f"scenarios:        {scenarios}")
+    print(f"backtest:         {elapsed * 1000:9.2f} ms")
+    print(f"per scenario:     {elapsed / scenarios * 1000:9.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vectorized DCA backtest throughput")
+    parser.add_argument("--weeks", type=int, default=520)
+    parser.add_argument("--assets", type=int, default=200)
+    parser.add_argument("--scenarios", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.weeks, args.assets, args.scenarios, args.repeat)
@@ -0,0 +1,235 @@
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+from benchmarks.fake_server import FakeServerConfig, serve
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_PATH = REPO_ROOT / "benchmarks" / "results" / "end_to_end.jsonl"
+
+_CATEGORIES = ("core", "midcap", "experimental")
+
+
+def generate_universe(size: int) -> list[dict]:
+    return [
+        {
+            "ticker": f"T{i:05d}",
+            "name": f"Token {i}",
+            "defillama_slug": f"token-{i}",
+            "github_repos": [f"org{i}/repo{j}" for j in range(1 + i % 2)],
+            "category": _CATEGORIES[i % len(_CATEGORIES)],
+            "target_allocation": 1 / size,
+        }
+        for i in range(size)
+    ]
+
+
+def child(result_path: str) -> None:
+    # Runs inside the measured subprocess: times main() and collects phase_completed events
+    import asyncio
+    import resource
+    import structlog
+
+    phases: dict[str, float] = {}
+
+    def capture(logger, method_name, event_dict):
+        if event_dict.get("event") == "phase_completed":
+            phases[event_dict["phase"]] = event_dict["seconds"]
+        raise structlog.DropEvent
+
+    structlog.configure(processors=[capture], cache_logger_on_first_use=True)
+
+    from crypto_auto.main import main
+
+    start = time.perf_counter()
+    exit_code = asyncio.run(main())
+    wall_time = time.perf_counter() - start
+
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "exit_code": exit_code,
+                "wall_time": wall_time,
+                # ru_maxrss is reported in KiB on Linux
+                "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                "phases": phases,
+                "p95_latency_ms": _p95_latency_ms(Path("data/metrics")),
+            },
+            f,
+        )
+
+
+def _p95_latency_ms(metrics_dir: Path) -> float | None:
+    # Merges the per-endpoint histograms of the run's metrics file into one
+    from crypto_auto.api.metrics import LatencyHistogram
+
+    histogram = LatencyHistogram()
+    for path in metrics_dir.glob("metrics_*.json"):
+        for endpoint in json.loads(path.read_text())["requests"]:
+            latency = endpoint["latency"]
+            for i, count in enumerate(latency["buckets"].values()):
+                histogram.bucket_counts[i] += count
+            histogram.count += latency["count"]
+
+    p95 = histogram.quantile(0.95)
+    return p95 * 1000 if p95 is not None else None
+
+
+def run_scenario(size: int, config: FakeServerConfig, env_overrides: dict | None = None) -> dict:
+    projects = generate_universe(size)
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    server = multiprocessing.Process(target=serve, args=(projects, config, sender), daemon=True)
+    server.start()
+
+    try:
+        base_url = receiver.recv()
+        with tempfile.TemporaryDirectory(prefix="crypto_auto_e2e_") as workdir:
+            (Path(workdir) / "cryptos.json").write_text(json.dumps({"projects": projects}))
+            env = {
+                **os.environ,
+                "PYTHONPATH": str(REPO_ROOT),
+                "GITHUB_TOKEN": "benchmark",
+                "DEFILLAMA_BASE_URL": base_url,
+                "DEFILLAMA_COINS_BASE_URL": base_url,
+                "GITHUB_BASE_URL": base_url,
+                "HTTP_CACHE_ENABLED": "false",
+                "PRICE_HISTORY_ENABLED": "false",
+                "SNAPSHOT_DB_PATH": "snapshots.db",
+                **(env_overrides or {}),
+            }
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    "from benchmarks.bench_end_to_end import child; child('result.json')",
+                ],
+                cwd=workdir,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                check=True,
+            )
+            result = json.loads((Path(workdir) / "result.json").read_text())
+
+        with urllib.request.urlopen(f"{base_url}/__stats") as response:
+            stats = json.load(response)
+    finally:
+        server.terminate()
+        server.join()
+
+    result["projects"] = size
+    result["requests"] = stats["requests"]
+    result["requests_per_sec"] = stats["requests"] / result["wall_time"]
+    # Less the connection that fetched the stats themselves
+    result["connections"] = stats["connections"] - 1
+    result["by_endpoint"] = stats["by_endpoint"]
+    result["by_status"] = stats["by_status"]
+    return result
+
+
+def _version() -> str:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _previous_results(config: dict) -> dict[int, dict]:
+    if not RESULTS_PATH.exists():
+        return {}
+    previous = {}
+    for line in RESULTS_PATH.read_text().splitlines():
+        entry = json.loads(line)
+        if entry["config"] == config:
+            previous[entry["result"]["projects"]] = entry
+    return previous
+
+
+def run(
+    sizes: list[int], config: FakeServerConfig, save: bool, env_overrides: dict | None = None
+) -> None:
+    # Settings overrides are part of the configuration, so differently tuned runs never
+    # compare against each other
+    config_key = {**vars(config), **(env_overrides or {})}
+    previous = _previous_results(config_key)
+    version = _version()
+
+    print(
+        f"latency={config.latency_ms}ms payload={config.payload_kb}KB "
+        f"errors={config.error_rate:.1%} 429s={config.rate_limit_rate:.1%} version={version}"
+        + "".join(f" {name}={value}" for name, value in (env_overrides or {}).items())
+    )
+    print(
+        f"{'projects':>9} {'wall (s)':>9} {'req':>7} {'req/s':>8} {'conns':>6} "
+        f"{'p95 (ms)':>9} {'RSS (MB)':>9} {'vs last':>8}  phases"
+    )
+
+    for size in sizes:
+        result = run_scenario(size, config, env_overrides)
+        last = previous.get(size)
+        change = (
+            f"{result['wall_time'] / last['result']['wall_time'] - 1:+.1%}" if last else "-"
+        )
+        phases = " ".join(f"{name}={seconds:.2f}" for name, seconds in result["phases"].items())
+        p95 = result["p95_latency_ms"]
+        print(
+            f"{size:>9} {result['wall_time']:>9.2f} {result['requests']:>7} "
+            f"{result['requests_per_sec']:>8.1f} {result['connections']:>6} "
+            f"{p95 if p95 is not None else float('nan'):>9.1f} "
+            f"{result['peak_rss_mb']:>9.1f} {change:>8}  {phases}"
+        )
+
+        if save:
+            RESULTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(RESULTS_PATH, "a", encoding="utf-8") as f:
+                entry = {
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "version": version,
+                    "config": config_key,
+                    "result": result,
+                }
+                f.write(json.dumps(entry) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end run against a local fake API server")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--payload-kb", type=int, default=64)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--index-coverage", type=float, default=0.9)
+    parser.add_argument("--max-connections", type=int, default=None)
+    parser.add_argument("--max-keepalive", type=int, default=None)
+    parser.add_argument("--keepalive-expiry", type=float, default=None)
+    parser.add_argument("--no-save", action="store_true", help="Do not append to the results log")
+    args = parser.parse_args()
+    overrides = {
+        "HTTP_MAX_CONNECTIONS": args.max_connections,
+        "HTTP_MAX_KEEPALIVE_CONNECTIONS": args.max_keepalive,
+        "HTTP_KEEPALIVE_EXPIRY": args.keepalive_expiry,
+    }
+    run(
+        args.sizes,
+        FakeServerConfig(
+            latency_ms=args.latency_ms,
+            payload_kb=args.payload_kb,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            index_coverage=args.index_coverage,
+        ),
+        save=not args.no_save,
+        env_overrides={name: str(value) for name, value in overrides.items() if value is not None},
+    )
@@ -0,0 +1,41 @@
+import argparse
+import numpy as np
+import structlog
+from crypto_auto.analysis.fdv_analyzer import FDVAnalyzer
+from crypto_auto.models.market_data import MarketData
+from benchmarks.timing import timed
+
+
+def run(projects: int, repeat: int) -> None:
+    # Render nothing, so the numbers compare classification work rather than terminal I/O
+    structlog.configure(logger_factory=structlog.ReturnLoggerFactory())
+
+    rng = np.random.default_rng(42)
+    ratios = rng.uniform(0.0, 1.0, projects)
+    tickers = np.array([f"T{i}" for i in range(projects)])
+    market_data = [
+        MarketData(ticker=t, price=1.0, market_cap=r, fdv=1.0, mcap_fdv_ratio=r)
+        for t, r in zip(tickers, ratios)
+    ]
+
+    per_item = min(
+        timed(lambda: [FDVAnalyzer.analyze_fdv_health(m) for m in market_data])
+        for _ in range(repeat)
+    )
+    batch = min(
+        timed(lambda: FDVAnalyzer.analyze_fdv_health_batch(ratios, tickers))
+        for _ in range(repeat)
+    )
+
+    print(f"projects:         {projects}")
+    print(f"per-item path:    {per_item * 1000:9.2f} ms")
+    print(f"batch path:       {batch * 1000:9.2f} ms")
+    print(f"speedup:          {per_item / batch:9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-item vs batch FDV health analysis")
+    parser.add_argument("--projects", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.projects, args.repeat)
@@ -0,0 +1,41 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+MODULES = (
+    "crypto_auto.main",
+    "crypto_auto.models.analysis",
+    "crypto_auto.config.settings",
+    "crypto_auto.commands.backtest",
+    "crypto_auto.commands.run",
+)
+
+_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)")
+
+
+def import_times(module: str) -> dict[str, int]:
+    env = {k: v for k, v in os.environ.items() if k != "GITHUB_TOKEN"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    # Cumulative microseconds per module, as reported by the interpreter
+    return {name: int(us) for us, name in _LINE.findall(result.stderr)}
+
+
+def run(repeat: int) -> None:
+    for module in MODULES:
+        best = min(import_times(module)[module] for _ in range(repeat))
+        print(f"{module + ':':<36}{best / 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold import time per entry module")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.repeat)
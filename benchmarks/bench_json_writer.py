@@ -0,0 +1,82 @@
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from crypto_auto.models.analysis import FDVHealthStatus, ProjectAnalysis
+from crypto_auto.models.crypto import CryptoProject
+from crypto_auto.models.market_data import MarketData
+from crypto_auto.outputs.json_writer import project_record, write_analysis_json
+
+
+def make_projects(count: int) -> list[ProjectAnalysis]:
+    return [
+        ProjectAnalysis(
+            project=CryptoProject(
+                ticker=f"T{i}",
+                name=f"Token {i}",
+                defillama_slug=f"token-{i}",
+                github_repos=[f"org/repo-{i}"],
+                category="core",
+                target_allocation=0.01,
+            ),
+            market_data=MarketData(
+                ticker=f"T{i}", price=1.5 + i, market_cap=1e9 + i, fdv=2e9, mcap_fdv_ratio=0.5
+            ),
+            dev_commits_30d=i % 200,
+            dev_activity_change=12.5,
+            health_status="OK",
+            fdv_health=FDVHealthStatus(
+                status="CAUTION", message="Moderate dilution: 50.0%", severity="MEDIUM", ratio=0.5
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+def write_dict_dump(projects, output_dir: Path) -> Path:
+    # The previous writer: the whole document as one dict, summary in five passes
+    path = output_dir / "analysis_dict.json"
+    data = {
+        "projects": [project_record(p) for p in projects],
+        "summary": {
+            "total_market_cap": sum(p.market_data.market_cap for p in projects),
+            "avg_fdv_ratio": sum(p.market_data.mcap_fdv_ratio for p in projects) / len(projects),
+            "total_commits": sum(p.dev_commits_30d for p in projects),
+            "fdv_warnings": len([p for p in projects if p.health_status == "FDV_WARNING"]),
+            "low_activity": len([p for p in projects if p.health_status == "LOW_ACTIVITY"]),
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def run(count: int) -> None:
+    projects = make_projects(count)
+    cases = {
+        "dict + json.dump": lambda d: write_dict_dump(projects, d),
+        "streamed, indented": lambda d: write_analysis_json(projects, [], d, False, False),
+        "streamed, compact": lambda d: write_analysis_json(projects, [], d, True, False),
+        "streamed, compact gzip": lambda d: write_analysis_json(projects, [], d, True, True),
+    }
+
+    print(f"{'writer':<26}{'seconds':>10}{'peak MiB':>10}{'size MiB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, write in cases.items():
+            tracemalloc.start()
+            start = time.perf_counter()
+            path = write(Path(tmp))
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            size = path.stat().st_size
+            print(f"{name:<26}{elapsed:>10.3f}{peak / 2**20:>10.1f}{size / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="write_analysis_json time, memory and size")
+    parser.add_argument("--projects", type=int, default=50_000)
+    args = parser.parse_args()
+    run(args.projects)
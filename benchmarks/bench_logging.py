@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import logging
+import os
+import time
+import structlog
+from crypto_auto.outputs.log_sink import BackgroundLogSink, BackgroundLoggerFactory
+
+_PROCESSORS = [
+    structlog.processors.add_log_level,
+    structlog.processors.TimeStamper(fmt="iso"),
+    structlog.processors.JSONRenderer(),
+]
+
+
+def configure(mode: str, stream) -> BackgroundLogSink | None:
+    structlog.reset_defaults()
+    if mode == "print":
+        # The previous setup: every call rendered and printed on the calling thread
+        structlog.configure(
+            processors=_PROCESSORS,
+            logger_factory=structlog.PrintLoggerFactory(stream),
+            cache_logger_on_first_use=True,
+        )
+        return None
+
+    sink = BackgroundLogSink(stream)
+    structlog.configure(
+        processors=_PROCESSORS,
+        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+        logger_factory=BackgroundLoggerFactory(sink),
+        cache_logger_on_first_use=True,
+    )
+    return sink
+
+
+async def simulate_requests(requests: int, concurrency: int) -> None:
+    logger = structlog.get_logger()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(i: int) -> None:
+        async with semaphore:
+            logger.info("api_request", method="GET", url=f"https://api.llama.fi/protocol/p{i}")
+            logger.debug("allocation_calculated", ticker=f"T{i}", allocation=0.1)
+            await asyncio.sleep(0)
+            logger.info("api_response", status=200, url=f"https://api.llama.fi/protocol/p{i}")
+
+    await asyncio.gather(*(request(i) for i in range(requests)))
+
+
+def measure(mode: str, calls: int, requests: int, concurrency: int, output: str) -> dict:
+    with open(output, "w", encoding="utf-8") as stream:
+        sink = configure(mode, stream)
+        logger = structlog.get_logger()
+
+        start = time.perf_counter()
+        for i in range(calls):
+            logger.debug("allocation_calculated", ticker="BTC", allocation=0.1, i=i)
+        debug_us = (time.perf_counter() - start) / calls * 1e6
+
+        start = time.perf_counter()
+        for i in range(calls):
+            logger.info("api_response", status=200, url="https://api.github.com/graphql", i=i)
+        info_us = (time.perf_counter() - start) / calls * 1e6
+
+        start = time.perf_counter()
+        asyncio.run(simulate_requests(requests, concurrency))
+        loop_seconds = time.perf_counter() - start
+
+        # Draining the queue is counted separately: it happens off the event loop
+        start = time.perf_counter()
+        if sink is not None:
+            sink.close()
+        drain_seconds = time.perf_counter() - start
+
+    return {
+        "debug_us": debug_us,
+        "info_us": info_us,
+        "requests_per_sec": requests / loop_seconds,
+        "drain_seconds": drain_seconds,
+    }
+
+
+def run(calls: int, requests: int, concurrency: int, output: str) -> None:
+    print(f"{'mode':<12}{'debug (us)':>12}{'info (us)':>12}{'req/s':>12}{'drain (s)':>12}")
+    for mode in ("print", "background"):
+        result = measure(mode, calls, requests, concurrency, output)
+        print(
+            f"{mode:<12}{result['debug_us']:>12.2f}{result['info_us']:>12.2f}"
+            f"{result['requests_per_sec']:>12.0f}{result['drain_seconds']:>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Logging overhead per call and per request")
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--output", default=os.devnull, help="Where log lines are written")
+    args = parser.parse_args()
+    run(args.calls, args.requests, args.concurrency, args.output)
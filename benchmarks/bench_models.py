@@ -0,0 +1,68 @@
+import argparse
+from dataclasses import fields
+from pydantic import create_model
+from crypto_auto.models.analysis import ProjectAnalysis
+from crypto_auto.models.crypto import CryptoProject
+from crypto_auto.models.history import SnapshotRecord
+from crypto_auto.models.market_data import MarketData
+from benchmarks.timing import timed
+
+# The pre-change pydantic SnapshotRecord, for comparison with the slotted record
+ValidatedSnapshot = create_model(
+    "ValidatedSnapshot", **{f.name: (f.type, ...) for f in fields(SnapshotRecord)}
+)
+
+
+def run(rows: int, repeat: int) -> None:
+    row = (
+        "2024-01-01T00:00:00+00:00", "BTC", 95000.0, 1.8e12, 1.85e12, 0.97, 150, 12.5, "OK",
+        "EXCELLENT",
+    )
+    names = [f.name for f in fields(SnapshotRecord)]
+    data = [row] * rows
+
+    project = CryptoProject(
+        ticker="BTC",
+        name="Bitcoin",
+        defillama_slug="bitcoin",
+        github_repos=["bitcoin/bitcoin"],
+        category="core",
+        target_allocation=0.6,
+    )
+    market_data = MarketData(
+        ticker="BTC", price=95000.0, market_cap=1.8e12, fdv=1.85e12, mcap_fdv_ratio=0.97
+    )
+    analysis_fields = {
+        "project": project,
+        "market_data": market_data,
+        "dev_commits_30d": 150,
+        "health_status": "OK",
+    }
+
+    # Nested models are passed through by reference, not re-validated or copied
+    assert ProjectAnalysis(**analysis_fields).project is project
+
+    cases = {
+        "snapshot, validated": lambda: [ValidatedSnapshot(**dict(zip(names, r))) for r in data],
+        "snapshot, model_construct": lambda: [
+            ValidatedSnapshot.model_construct(**dict(zip(names, r))) for r in data
+        ],
+        "snapshot, slotted record": lambda: [SnapshotRecord(*r) for r in data],
+        "analysis, validated": lambda: [ProjectAnalysis(**analysis_fields) for _ in data],
+        "analysis, model_construct": lambda: [
+            ProjectAnalysis.model_construct(**analysis_fields) for _ in data
+        ],
+    }
+
+    print(f"rows:                       {rows}")
+    for label, fn in cases.items():
+        elapsed = min(timed(fn) for _ in range(repeat))
+        print(f"{label + ':':<28}{elapsed * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validated vs trusted model construction")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
@@ -0,0 +1,201 @@
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_ALIAS = re.compile(r"(r\d+): repository\(owner: \"([^\"]+)\", name: \"([^\"]+)\"\)")
+
+
+@dataclass
+class FakeServerConfig:
+    latency_ms: float = 20.0
+    payload_kb: int = 64
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    index_coverage: float = 0.9
+    seed: int = 42
+
+
+class FakeUniverse:
+    def __init__(self, projects: list[dict], config: FakeServerConfig):
+        self.config = config
+        rng = random.Random(config.seed)
+        self.protocols = {}
+        for project in projects:
+            mcap = rng.uniform(1e6, 1e12)
+            self.protocols[project["defillama_slug"]] = {
+                "slug": project["defillama_slug"],
+                "gecko_id": project["defillama_slug"],
+                "mcap": mcap,
+                "fdv": mcap / rng.uniform(0.2, 1.0),
+                "price": rng.uniform(0.01, 100_000),
+                "indexed": rng.random() < config.index_coverage,
+            }
+        self.commits = {
+            repo: rng.randint(0, 400) for project in projects for repo in project["github_repos"]
+        }
+        # Padding that stands in for the large tvl/chain history arrays of real responses
+        point_count = max(0, config.payload_kb * 1024 // 48)
+        self.tvl_history = [
+            {"date": 1_600_000_000 + i * 86_400, "totalLiquidityUSD": 1_000_000.0 + i}
+            for i in range(point_count)
+        ]
+
+
+class FakeAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "FakeAPIServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method: str) -> None:
+        server = self.server
+        url = urlparse(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        if url.path == "/__stats":
+            self._send_json(200, server.snapshot_stats())
+            return
+
+        server.record_request(url.path)
+        time.sleep(server.config.latency_ms / 1000)
+
+        roll = server.rng_random()
+        if roll < server.config.rate_limit_rate:
+            server.record_status(429)
+            self._send_json(429, {"message": "rate limited"}, {"Retry-After": "0"})
+            return
+        if roll < server.config.rate_limit_rate + server.config.error_rate:
+            server.record_status(502)
+            self._send_json(502, {"message": "bad gateway"})
+            return
+
+        status, payload, headers = self._route(method, url, body)
+        server.record_status(status)
+        self._send_json(status, payload, headers)
+
+    def _route(self, method: str, url, body: bytes) -> tuple[int, object, dict]:
+        universe = self.server.universe
+
+        if method == "GET" and url.path == "/protocols":
+            return 200, [
+                {k: v for k, v in record.items() if k != "indexed"}
+                if record["indexed"]
+                else {"slug": record["slug"]}
+                for record in universe.protocols.values()
+            ], {}
+
+        if method == "GET" and url.path.startswith("/protocol/"):
+            record = universe.protocols.get(url.path.removeprefix("/protocol/"))
+            if record is None:
+                return 404, {"message": "not found"}, {}
+            # Market fields come after the bulky history, as in the real payloads
+            return 200, {
+                "tvl": universe.tvl_history,
+                "mcap": record["mcap"],
+                "fdv": record["fdv"],
+                "price": record["price"],
+            }, {}
+
+        if method == "POST" and url.path == "/graphql":
+            query = json.loads(body or b"{}").get("query", "")
+            data = {}
+            for alias, owner, name in _ALIAS.findall(query):
+                total = universe.commits.get(f"{owner}/{name}")
+                data[alias] = (
+                    {"defaultBranchRef": {"target": {"history": {"totalCount": total}}}}
+                    if total is not None
+                    else None
+                )
+            return 200, {"data": data}, {}
+
+        match = re.fullmatch(r"/repos/([^/]+/[^/]+)/commits", url.path)
+        if method == "GET" and match:
+            total = universe.commits.get(match.group(1))
+            if total is None:
+                return 404, {"message": "not found"}, {}
+            per_page = int(parse_qs(url.query).get("per_page", ["30"])[0])
+            items = [
+                {"sha": f"{i:040x}", "commit": {"committer": {"date": "2024-01-01T00:00:00Z"}}}
+                for i in range(min(per_page, total))
+            ]
+            last_page = max(1, -(-total // per_page))
+            last_url = f"{self.server.base_url}{url.path}?per_page={per_page}&page={last_page}"
+            link = f'<{last_url}>; rel="last"'
+            return 200, items, {"Link": link}
+
+        return 404, {"message": "not found"}, {}
+
+    def _send_json(self, status: int, payload, headers: dict | None = None) -> None:
+        encoded = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(encoded)
+
+
+class FakeAPIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, universe: FakeUniverse, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), FakeAPIHandler)
+        self.universe = universe
+        self.config = universe.config
+        self._lock = threading.Lock()
+        self._rng = random.Random(universe.config.seed)
+        self._requests: dict[str, int] = {}
+        self._statuses: dict[int, int] = {}
+        self._connections = 0
+
+    def process_request(self, request, client_address):
+        # Called once per accepted TCP connection, however many requests it carries
+        with self._lock:
+            self._connections += 1
+        super().process_request(request, client_address)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rng_random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def record_request(self, path: str) -> None:
+        endpoint = "/" + path.strip("/").split("/")[0]
+        with self._lock:
+            self._requests[endpoint] = self._requests.get(endpoint, 0) + 1
+
+    def record_status(self, status: int) -> None:
+        with self._lock:
+            self._statuses[status] = self._statuses.get(status, 0) + 1
+
+    def snapshot_stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": sum(self._requests.values()),
+                "connections": self._connections,
+                "by_endpoint": dict(self._requests),
+                "by_status": {str(k): v for k, v in self._statuses.items()},
+            }
+
+
+def serve(projects: list[dict], config: FakeServerConfig, ready) -> None:
+    server = FakeAPIServer(FakeUniverse(projects, config))
+    ready.send(server.base_url)
+    server.serve_forever()
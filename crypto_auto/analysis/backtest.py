@@ -0,0 +1,151 @@
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+
+class BacktestResult:
+    def __init__(
+        self,
+        final_value: np.ndarray,
+        invested: float,
+        cash: np.ndarray,
+        units: np.ndarray,
+        drift: np.ndarray,
+        purchases: np.ndarray,
+        portfolio_value: np.ndarray,
+    ):
+        self.final_value = final_value
+        self.invested = invested
+        self.cash = cash
+        self.units = units
+        self.drift = drift
+        self.purchases = purchases
+        self.portfolio_value = portfolio_value
+
+    @property
+    def total_return(self) -> np.ndarray:
+        if self.invested <= 0:
+            return np.zeros_like(self.final_value)
+        return self.final_value / self.invested - 1
+
+    @property
+    def mean_drift(self) -> np.ndarray:
+        return self.drift.mean(axis=0)
+
+    @property
+    def final_drift(self) -> np.ndarray:
+        return self.drift[-1]
+
+    @property
+    def turnover(self) -> np.ndarray:
+        mean_value = self.portfolio_value.mean(axis=0)
+        return np.divide(
+            self.purchases.sum(axis=0),
+            mean_value,
+            out=np.zeros_like(mean_value),
+            where=mean_value > 0,
+        )
+
+    def summary(self, scenario: int = 0) -> dict[str, float]:
+        return {
+            "final_value": float(self.final_value[scenario]),
+            "invested": float(self.invested),
+            "total_return": float(self.total_return[scenario]),
+            "mean_drift": float(self.mean_drift[scenario]),
+            "final_drift": float(self.final_drift[scenario]),
+            "turnover": float(self.turnover[scenario]),
+        }
+
+
+def forward_fill(prices: np.ndarray) -> np.ndarray:
+    # Sources report an unknown price as 0, so only positive prices count as quotes
+    valid = prices > 0
+    index = np.where(valid, np.arange(len(prices))[:, None], 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+    filled = prices[index, np.arange(prices.shape[1])]
+    # Before an asset's first price there is nothing to carry forward
+    filled[~np.maximum.accumulate(valid, axis=0)] = np.nan
+    return filled
+
+
+def run_dca_backtest(
+    prices: np.ndarray,
+    target_allocations: np.ndarray,
+    dca_amount: float,
+    initial_units: np.ndarray | None = None,
+    buy_mask: np.ndarray | None = None,
+) -> BacktestResult:
+    prices = forward_fill(np.asarray(prices, dtype=np.float64))
+    allocations = np.atleast_2d(np.asarray(target_allocations, dtype=np.float64))
+    weeks, assets = prices.shape
+    scenarios = allocations.shape[0]
+
+    if weeks == 0:
+        raise ValueError("Price history is empty")
+    if allocations.shape[1] != assets:
+        raise ValueError(
+            f"target_allocations has {allocations.shape[1]} assets, prices have {assets}"
+        )
+
+    available = ~np.isnan(prices)
+    # buy_mask is (weeks, assets) shared by all scenarios or (scenarios, weeks, assets)
+    eligible = np.broadcast_to(
+        available if buy_mask is None else available & np.asarray(buy_mask, dtype=bool),
+        (scenarios, weeks, assets),
+    )
+    safe_prices = np.where(available, prices, 0.0)
+    units = np.zeros((scenarios, assets))
+    if initial_units is not None:
+        units += np.asarray(initial_units, dtype=np.float64)
+    cash = np.zeros(scenarios)
+    initial_value = (units * safe_prices[0]).sum(axis=1)
+
+    drift = np.empty((weeks, scenarios))
+    purchases = np.empty((weeks, scenarios))
+    portfolio_value = np.empty((weeks, scenarios))
+
+    # Each week's purchase depends on the holdings bought before it, so weeks are
+    # stepped in order; every step is vectorized across scenarios and assets
+    for week in range(weeks):
+        week_prices = safe_prices[week]
+        values = units * week_prices
+        # Cash left over while some assets were not yet listed is deployed with the DCA
+        budget = cash + dca_amount
+        total_value = values.sum(axis=1) + budget
+
+        gap = np.maximum(0.0, allocations * total_value[:, None] - values) * eligible[:, week]
+        total_gap = gap.sum(axis=1)
+        scale = np.divide(budget, total_gap, out=np.zeros(scenarios), where=total_gap > 0)
+        buys = gap * scale[:, None]
+
+        units += np.divide(buys, week_prices, out=np.zeros_like(buys), where=available[week])
+        cash = budget - buys.sum(axis=1)
+
+        values = units * week_prices
+        holdings_value = values.sum(axis=1)
+        weights = np.divide(
+            values,
+            holdings_value[:, None],
+            out=np.zeros_like(values),
+            where=holdings_value[:, None] > 0,
+        )
+        drift[week] = 0.5 * np.abs(weights - allocations).sum(axis=1)
+        purchases[week] = buys.sum(axis=1)
+        portfolio_value[week] = holdings_value + cash
+
+    if not np.isfinite(portfolio_value[-1]).all():
+        raise ValueError("Backtest produced a non-finite portfolio value")
+
+    result = BacktestResult(
+        final_value=portfolio_value[-1],
+        invested=float(initial_value.mean() + dca_amount * weeks),
+        cash=cash,
+        units=units,
+        drift=drift,
+        purchases=purchases,
+        portfolio_value=portfolio_value,
+    )
+
+    logger.info("backtest_completed", weeks=weeks, assets=assets, scenarios=scenarios)
+    return result
@@ -0,0 +1,60 @@
+import asyncio
+from datetime import timedelta
+import structlog
+from crypto_auto.api.github_api import GitHubClient
+from crypto_auto.storage.snapshot_store import SnapshotStore
+
+logger = structlog.get_logger()
+
+
+class IncrementalCommitSync:
+    def __init__(self, github_client: GitHubClient, store: SnapshotStore):
+        self.github_client = github_client
+        self.store = store
+
+    async def sync(self, repo: str, days: int = 30) -> int:
+        window_start = self.github_client.window_end() - timedelta(days=days)
+        checkpoint = self.store.commit_checkpoint(repo)
+
+        since = window_start.isoformat()
+        if checkpoint is not None and checkpoint.committed_at > since:
+            since = checkpoint.committed_at
+
+        commits, complete = await self.github_client.get_commits_since(
+            repo, since, stop_at_sha=checkpoint.sha if checkpoint else None
+        )
+        if not complete:
+            # Storing a truncated page run would move the checkpoint past the commits that
+            # were never fetched, so the repo is counted exactly and nothing is stored
+            logger.warning("github_commit_sync_truncated", repo=repo, fetched=len(commits))
+            return await self.github_client.get_commit_activity(repo, days=days, exact=True)
+
+        self.store.append_commits(repo, commits)
+        self.store.prune_commits(repo, before=window_start - timedelta(days=days))
+
+        count = self.store.count_commits(repo, since=window_start)
+        logger.info(
+            "github_commits_synced",
+            repo=repo,
+            new_commits=len(commits),
+            commits=count,
+            days=days,
+        )
+        return count
+
+    async def sync_all(self, repos: list[str], days: int = 30) -> dict[str, int]:
+        unique_repos = list(dict.fromkeys(repos))
+        results = await asyncio.gather(
+            *(self.sync(repo, days) for repo in unique_repos), return_exceptions=True
+        )
+
+        counts = {}
+        for repo, result in zip(unique_repos, results):
+            if isinstance(result, Exception):
+                # The repo then falls back to a REST count during analysis
+                logger.error("github_commit_sync_failed", repo=repo, error=str(result))
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                counts[repo] = result
+        return counts
@@ -0,0 +1,18 @@
+import structlog
+
+logger = structlog.get_logger()
+
+
+class DevActivityAnalyzer:
+    @staticmethod
+    def calculate_change(current: dict[str, int], previous: dict[str, int]) -> float | None:
+        missing = [repo for repo in current if repo not in previous]
+        if not current or missing:
+            logger.debug("dev_activity_history_missing", repos=missing)
+            return None
+
+        previous_total = sum(previous[repo] for repo in current)
+        if previous_total == 0:
+            return None
+
+        return (sum(current.values()) - previous_total) / previous_total * 100
@@ -1,3 +1,5 @@
+from collections.abc import Sequence
+import numpy as np
 import structlog
 from crypto_auto.models.market_data import MarketData
 from crypto_auto.models.analysis import FDVHealthStatus
@@ -5,6 +7,72 @@ from crypto_auto.config.settings import settings
 
 logger = structlog.get_logger()
 
+FDV_STATUSES = ("WARNING", "CAUTION", "HEALTHY", "EXCELLENT", "UNKNOWN")
+_SEVERITIES = ("HIGH", "MEDIUM", "LOW", "LOW", "UNKNOWN")
+_UNKNOWN = FDV_STATUSES.index("UNKNOWN")
+
+
+def _build_status(code: int, ratio: float, target_min: float) -> FDVHealthStatus:
+    match code:
+        case 0:
+            message = f"High dilution risk: MCap is only {ratio:.1%} of FDV"
+        case 1:
+            message = f"Below target range: {ratio:.1%} < {target_min:.1%}"
+        case 2:
+            message = f"Within target range: {ratio:.1%}"
+        case 3:
+            message = f"Minimal dilution: {ratio:.1%}"
+        case _:
+            message = "MCap/FDV ratio unavailable"
+
+    return FDVHealthStatus(
+        status=FDV_STATUSES[code],
+        message=message,
+        severity=_SEVERITIES[code],
+        ratio=ratio,
+    )
+
+
+def fdv_status_codes(
+    ratios: np.ndarray, warning_threshold: float, target_min: float, target_max: float
+) -> np.ndarray:
+    # side="right" makes each edge exclusive below, matching the `<` checks in
+    # analyze_fdv_health; nudging target_max up one ulp keeps `ratio <= target_max` HEALTHY
+    edges = np.array([warning_threshold, target_min, np.nextafter(target_max, np.inf)])
+    codes = np.searchsorted(edges, ratios, side="right")
+    # searchsorted sorts NaN past every edge, which would read as EXCELLENT
+    return np.where(np.isnan(ratios), _UNKNOWN, codes).astype(np.int8)
+
+
+class FDVBatchResult:
+    def __init__(
+        self, tickers: np.ndarray, ratios: np.ndarray, codes: np.ndarray, target_min: float
+    ):
+        self.tickers = tickers
+        self.ratios = ratios
+        self.codes = codes
+        self.target_min = target_min
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def statuses(self) -> np.ndarray:
+        return np.asarray(FDV_STATUSES)[self.codes]
+
+    def counts(self) -> dict[str, int]:
+        totals = np.bincount(self.codes, minlength=len(FDV_STATUSES))
+        return dict(zip(FDV_STATUSES, totals.tolist()))
+
+    def mask(self, status: str) -> np.ndarray:
+        return self.codes == FDV_STATUSES.index(status)
+
+    def health_status(self, index: int) -> FDVHealthStatus:
+        return _build_status(int(self.codes[index]), float(self.ratios[index]), self.target_min)
+
+    def to_models(self) -> list[FDVHealthStatus]:
+        return [self.health_status(i) for i in range(len(self))]
+
 
 class FDVAnalyzer:
     @staticmethod
@@ -12,33 +80,50 @@ class FDVAnalyzer:
         ratio = market_data.mcap_fdv_ratio
 
         if ratio < settings.fdv_ratio_warning_threshold:
-            status = "WARNING"
-            message = f"High dilution risk: MCap is only {ratio:.1%} of FDV"
-            severity = "HIGH"
+            code = 0
         elif ratio < settings.fdv_ratio_target_min:
-            status = "CAUTION"
-            message = f"Below target range: {ratio:.1%} < {settings.fdv_ratio_target_min:.1%}"
-            severity = "MEDIUM"
+            code = 1
         elif ratio <= settings.fdv_ratio_target_max:
-            status = "HEALTHY"
-            message = f"Within target range: {ratio:.1%}"
-            severity = "LOW"
+            code = 2
         else:
-            status = "EXCELLENT"
-            message = f"Minimal dilution: {ratio:.1%}"
-            severity = "LOW"
+            code = 3
+
+        health = _build_status(code, ratio, settings.fdv_ratio_target_min)
 
         logger.info(
             "fdv_health_analyzed",
             ticker=market_data.ticker,
             ratio=ratio,
-            status=status,
-            severity=severity,
+            status=health.status,
+            severity=health.severity,
         )
 
-        return FDVHealthStatus(
-            status=status,
-            message=message,
-            severity=severity,
-            ratio=ratio,
+        return health
+
+    @staticmethod
+    def analyze_fdv_health_batch(
+        ratios: Sequence[float] | np.ndarray,
+        tickers: Sequence[str] | np.ndarray,
+        warning_threshold: float | None = None,
+        target_min: float | None = None,
+        target_max: float | None = None,
+    ) -> FDVBatchResult:
+        warning_threshold = (
+            settings.fdv_ratio_warning_threshold if warning_threshold is None else warning_threshold
         )
+        target_min = settings.fdv_ratio_target_min if target_min is None else target_min
+        target_max = settings.fdv_ratio_target_max if target_max is None else target_max
+
+        ratio_array = np.asarray(ratios, dtype=np.float64)
+        ticker_array = np.asarray(tickers)
+        if ratio_array.shape != ticker_array.shape:
+            raise ValueError(
+                f"ratios and tickers must have the same shape: "
+                f"{ratio_array.shape} != {ticker_array.shape}"
+            )
+
+        codes = fdv_status_codes(ratio_array, warning_threshold, target_min, target_max)
+
+        result = FDVBatchResult(ticker_array, ratio_array, codes, target_min)
+        logger.info("fdv_health_batch_analyzed", projects=len(result), **result.counts())
+        return result
@@ -0,0 +1,121 @@
+import asyncio
+import time
+import numpy as np
+import structlog
+from crypto_auto.api.defillama import DeFiLlamaCoinsClient
+from crypto_auto.models.analysis import ProjectAnalysis
+from crypto_auto.models.crypto import CryptoProject
+from crypto_auto.storage.timeseries import DAY_SECONDS, TimeSeriesStore, day_start
+
+logger = structlog.get_logger()
+
+# Days requested per /chart call
+CHART_SPAN_DAYS = 365
+
+
+class PriceHistorySync:
+    def __init__(
+        self,
+        coins_client: DeFiLlamaCoinsClient,
+        store: TimeSeriesStore,
+        backfill_days: int = 365,
+    ):
+        self.coins_client = coins_client
+        self.store = store
+        self.backfill_days = backfill_days
+
+    async def sync(self, ticker: str, coin: str, now: float | None = None) -> int:
+        today = int(day_start(int(now if now is not None else time.time())))
+        window_start = today - self.backfill_days * DAY_SECONDS
+        last = self.store.last_timestamp(ticker)
+        start = window_start if last is None else last + DAY_SECONDS
+
+        gaps = self.store.missing_days(ticker)
+        filled = await self._fill_gaps(ticker, coin, gaps[gaps >= window_start])
+
+        # Only completed days are backfilled; today's row comes from the live snapshot
+        appended = 0
+        while start < today:
+            span = min(CHART_SPAN_DAYS, (today - start) // DAY_SECONDS)
+            points = await self.coins_client.get_price_chart(coin, start, span)
+            appended += self._append_prices(ticker, points, before=today)
+            start += span * DAY_SECONDS
+
+        logger.info(
+            "price_history_synced", ticker=ticker, coin=coin, new_days=appended, filled_days=filled
+        )
+        return appended + filled
+
+    async def _fill_gaps(self, ticker: str, coin: str, gaps: np.ndarray) -> int:
+        # Each run of consecutive missing days is re-requested and written into its rows
+        if len(gaps) == 0:
+            return 0
+
+        filled = 0
+        runs = np.split(gaps, np.flatnonzero(np.diff(gaps) != DAY_SECONDS) + 1)
+        for run in runs:
+            for chunk_start in range(0, len(run), CHART_SPAN_DAYS):
+                chunk = run[chunk_start : chunk_start + CHART_SPAN_DAYS]
+                points = await self.coins_client.get_price_chart(coin, int(chunk[0]), len(chunk))
+                days, prices = _daily_prices(points)
+                missing = np.isin(days, chunk)
+                filled += self.store.update(ticker, days[missing], price=prices[missing])
+
+        return filled
+
+    async def sync_all(
+        self, projects: list[CryptoProject], protocol_index: dict[str, dict] | None = None
+    ) -> dict[str, int]:
+        coins = {p.ticker: coin_id(p.defillama_slug, protocol_index) for p in projects}
+        # Tickers write to separate column files, so they can sync concurrently
+        results = await asyncio.gather(
+            *(self.sync(ticker, coin) for ticker, coin in coins.items()), return_exceptions=True
+        )
+
+        synced = {}
+        for ticker, result in zip(coins, results):
+            # One failing ticker, whether from the API or its column files, skips only itself
+            if isinstance(result, Exception):
+                logger.error("price_history_sync_failed", ticker=ticker, error=str(result))
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                synced[ticker] = result
+        return synced
+
+    def record_snapshot(self, projects: list[ProjectAnalysis], now: float | None = None) -> None:
+        today = day_start(int(now if now is not None else time.time()))
+        for p in projects:
+            values = np.array([p.market_data.price, p.market_data.market_cap, p.market_data.fdv])
+            # A 0 from the API means "not reported"; store it as a gap like any missing day
+            price, market_cap, fdv = np.where(values > 0, values, np.nan)[:, None]
+            self.store.append(
+                p.project.ticker,
+                np.array([today]),
+                price=price,
+                market_cap=market_cap,
+                fdv=fdv,
+            )
+
+    def _append_prices(self, ticker: str, points: list[tuple[int, float]], before: int) -> int:
+        days, prices = _daily_prices(points)
+        keep = days < before
+        return self.store.append(ticker, days[keep], price=prices[keep])
+
+
+def _daily_prices(points: list[tuple[int, float]]) -> tuple[np.ndarray, np.ndarray]:
+    if not points:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+
+    timestamps, prices = np.array(points, dtype=np.float64).T
+    days = day_start(timestamps.astype(np.int64))
+    order = np.argsort(days, kind="stable")
+    days, prices = days[order], prices[order]
+    # Keep the last quote of each day
+    last_of_day = np.append(days[1:] != days[:-1], True)
+    return days[last_of_day], prices[last_of_day]
+
+
+def coin_id(slug: str, protocol_index: dict[str, dict] | None = None) -> str:
+    record = (protocol_index or {}).get(slug) or {}
+    return f"coingecko:{record.get('gecko_id') or slug}"
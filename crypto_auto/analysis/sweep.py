@@ -0,0 +1,173 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from pathlib import Path
+import numpy as np
+import structlog
+from crypto_auto.analysis.backtest import forward_fill, run_dca_backtest
+from crypto_auto.analysis.fdv_analyzer import FDV_STATUSES, fdv_status_codes
+from crypto_auto.config.settings import settings
+from crypto_auto.models.sweep import SweepGrid, SweepResult
+
+logger = structlog.get_logger()
+
+# Metric -> whether larger is better
+RANK_KEYS = {
+    "total_return": True,
+    "healthy_share": True,
+    "mean_drift": False,
+    "final_drift": False,
+    "turnover": False,
+}
+
+_METRICS = ("final_value", "total_return", "mean_drift", "final_drift", "turnover", "healthy_share")
+_HEALTHY = FDV_STATUSES.index("HEALTHY")
+_UNKNOWN = FDV_STATUSES.index("UNKNOWN")
+
+# Per-worker read-only views of the price/ratio matrices, opened once by _open_shared
+_shared: dict[str, np.ndarray] = {}
+
+
+def expand_grid(
+    grid: SweepGrid, tickers: list[str], default_allocation: dict[str, float]
+) -> tuple[np.ndarray, np.ndarray, list[dict[str, float]]]:
+    warnings = grid.fdv_ratio_warning_threshold or [settings.fdv_ratio_warning_threshold]
+    mins = grid.fdv_ratio_target_min or [settings.fdv_ratio_target_min]
+    maxes = grid.fdv_ratio_target_max or [settings.fdv_ratio_target_max]
+    allocations = grid.allocations or [default_allocation]
+
+    unknown = {t for allocation in allocations for t in allocation} - set(tickers)
+    if unknown:
+        raise ValueError(f"Allocations reference unknown tickers: {sorted(unknown)}")
+
+    thresholds = [
+        combo for combo in product(warnings, mins, maxes) if combo[0] <= combo[1] <= combo[2]
+    ]
+    if not thresholds:
+        raise ValueError("No threshold combination satisfies warning <= target_min <= target_max")
+
+    scenarios = list(product(thresholds, allocations))
+    threshold_matrix = np.array([t for t, _ in scenarios], dtype=np.float64)
+    allocation_matrix = np.array(
+        [[allocation.get(t, 0.0) for t in tickers] for _, allocation in scenarios]
+    )
+    return threshold_matrix, allocation_matrix, [allocation for _, allocation in scenarios]
+
+
+def simulate(
+    prices: np.ndarray,
+    ratios: np.ndarray,
+    thresholds: np.ndarray,
+    allocations: np.ndarray,
+    dca_amount: float,
+) -> np.ndarray:
+    codes = np.stack([fdv_status_codes(ratios, *combo) for combo in thresholds])
+    rated = codes != _UNKNOWN
+    # Assets in the WARNING band, or without a ratio, are not bought that week;
+    # their share goes to the rest
+    result = run_dca_backtest(prices, allocations, dca_amount, buy_mask=(codes > 0) & rated)
+
+    last_prices = np.nan_to_num(forward_fill(prices)[-1])
+    values = result.units * last_prices
+    # Holdings whose final ratio is unknown count neither for nor against the share
+    rated_holdings = (values * rated[:, -1]).sum(axis=1)
+    healthy_share = np.divide(
+        (values * (rated[:, -1] & (codes[:, -1] >= _HEALTHY))).sum(axis=1),
+        rated_holdings,
+        out=np.zeros_like(rated_holdings),
+        where=rated_holdings > 0,
+    )
+
+    return np.column_stack(
+        [
+            result.final_value,
+            result.total_return,
+            result.mean_drift,
+            result.final_drift,
+            result.turnover,
+            healthy_share,
+        ]
+    )
+
+
+def _open_shared(directory: str) -> None:
+    for name in ("prices", "ratios"):
+        _shared[name] = np.load(Path(directory) / f"{name}.npy", mmap_mode="r")
+
+
+def _run_chunk(thresholds: np.ndarray, allocations: np.ndarray, dca_amount: float) -> np.ndarray:
+    return simulate(_shared["prices"], _shared["ratios"], thresholds, allocations, dca_amount)
+
+
+def run_sweep(
+    prices: np.ndarray,
+    ratios: np.ndarray,
+    grid: SweepGrid,
+    tickers: list[str],
+    default_allocation: dict[str, float],
+    dca_amount: float,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    rank_by: str = "total_return",
+) -> list[SweepResult]:
+    if rank_by not in RANK_KEYS:
+        raise ValueError(f"Unknown rank metric: {rank_by}")
+
+    workers = workers or settings.sweep_workers or os.cpu_count() or 1
+    chunk_size = chunk_size or settings.sweep_chunk_size
+
+    thresholds, allocations, allocation_dicts = expand_grid(grid, tickers, default_allocation)
+    # Forward-filled ratios keep a ticker's last known status in weeks it wasn't snapshotted
+    ratios = forward_fill(np.asarray(ratios, dtype=np.float64))
+    prices = np.asarray(prices, dtype=np.float64)
+    chunks = [
+        (thresholds[i : i + chunk_size], allocations[i : i + chunk_size])
+        for i in range(0, len(thresholds), chunk_size)
+    ]
+    workers = min(workers, len(chunks))
+
+    logger.info(
+        "sweep_started",
+        scenarios=len(thresholds),
+        chunks=len(chunks),
+        workers=workers,
+        weeks=prices.shape[0],
+        assets=prices.shape[1],
+    )
+
+    if workers <= 1:
+        metrics = [simulate(prices, ratios, t, a, dca_amount) for t, a in chunks]
+    else:
+        # Workers memory-map the matrices from disk instead of receiving a pickled
+        # copy with every task; only the small per-chunk parameter arrays are sent
+        with tempfile.TemporaryDirectory(prefix="crypto_auto_sweep_") as directory:
+            np.save(Path(directory) / "prices.npy", prices)
+            np.save(Path(directory) / "ratios.npy", ratios)
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_open_shared, initargs=(directory,)
+            ) as pool:
+                metrics = list(
+                    pool.map(
+                        _run_chunk,
+                        [t for t, _ in chunks],
+                        [a for _, a in chunks],
+                        [dca_amount] * len(chunks),
+                    )
+                )
+
+    rows = np.concatenate(metrics)
+    results = [
+        SweepResult(
+            warning_threshold=combo[0],
+            target_min=combo[1],
+            target_max=combo[2],
+            allocation=allocation,
+            **dict(zip(_METRICS, row.tolist())),
+        )
+        for combo, allocation, row in zip(thresholds.tolist(), allocation_dicts, rows)
+    ]
+    results.sort(key=lambda r: getattr(r, rank_by), reverse=RANK_KEYS[rank_by])
+
+    logger.info("sweep_completed", scenarios=len(results), rank_by=rank_by)
+    return results
@@ -1,39 +1,294 @@
+import asyncio
+import time
+from contextlib import nullcontext
+from typing import Any, Collection
 import httpx
 import structlog
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from pydantic import BaseModel
+from tenacity import retry, retry_if_exception_type, stop_any, wait_exponential
+from crypto_auto.api.cache import CachedResponse, ResponseCache
+from crypto_auto.api.circuit_breaker import CircuitBreaker
+from crypto_auto.api.cassette import Cassette, RecordedResponse
+from crypto_auto.api.errors import APIError, RateLimitError
+from crypto_auto.api.json_stream import extract_fields
+from crypto_auto.api.metrics import RequestMetrics
+from crypto_auto.api.rate_limit import RateLimiter, is_rate_limited, rate_limit_delay
+from crypto_auto.api.scheduler import RequestScheduler
+from crypto_auto.api.transport import create_http_client
 from crypto_auto.config.settings import settings
 
 logger = structlog.get_logger()
 
+_backoff = wait_exponential(multiplier=1, min=2, max=10)
 
-class APIError(Exception):
-    pass
+
+def _retry_wait(retry_state) -> float:
+    error = retry_state.outcome.exception()
+    if isinstance(error, RateLimitError) and error.retry_after is not None:
+        return error.retry_after
+    return _backoff(retry_state)
+
+
+def _record_retry(retry_state) -> None:
+    client, _, url = retry_state.args[:3]
+    if client.metrics is None:
+        return
+    host = httpx.URL(url).host
+    client.metrics.record_retry(host)
+    if isinstance(retry_state.outcome.exception(), RateLimitError):
+        client.metrics.record_throttle_wait(host, retry_state.next_action.sleep)
+
+
+def _stop_after_max_retries(retry_state) -> bool:
+    # Read per call rather than when the decorator is built, so importing this module
+    # does not construct Settings
+    return retry_state.attempt_number >= settings.max_retries
+
+
+def _stop_on_open_circuit(retry_state) -> bool:
+    client, _, url = retry_state.args[:3]
+    return client.circuit_breaker is not None and client.circuit_breaker.is_open(
+        httpx.URL(url).host
+    )
+
+
+def _stop_on_long_rate_limit(retry_state) -> bool:
+    error = retry_state.outcome.exception()
+    return (
+        isinstance(error, RateLimitError)
+        and error.retry_after is not None
+        and error.retry_after > settings.rate_limit_max_wait
+    )
+
+
+def _give_up(retry_state):
+    # A timeout that outlasts every retry is reported like any other failed request, so
+    # callers that skip failed items do not have to know about httpx
+    error = retry_state.outcome.exception()
+    if isinstance(error, httpx.TimeoutException):
+        url = retry_state.args[2]
+        raise APIError(
+            f"Request timed out after {retry_state.attempt_number} attempts: {url}"
+        ) from error
+    raise error
+
+
+class APIResponse(BaseModel):
+    data: Any
+    headers: dict[str, str] = {}
+    status_code: int = 200
+    from_cache: bool = False
 
 
 class BaseAPIClient:
-    def __init__(self, base_url: str, headers: dict | None = None):
+    # Response headers kept alongside cached bodies (lowercase, as httpx exposes them)
+    cached_headers: tuple[str, ...] = ("link",)
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: dict | None = None,
+        cache: ResponseCache | None = None,
+        cache_ttl: float = 0,
+        scheduler: RequestScheduler | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cassette: Cassette | None = None,
+        metrics: RequestMetrics | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ):
         self.base_url = base_url
         self.headers = headers or {}
-        self.client = httpx.AsyncClient(
-            timeout=settings.http_timeout,
-            headers=self.headers,
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.scheduler = scheduler
+        self.rate_limiter = rate_limiter
+        self.cassette = cassette
+        self.metrics = metrics
+        self.circuit_breaker = circuit_breaker
+        # A client passed in is shared with other API clients and closed by its owner
+        self._owns_client = http_client is None
+        self.client = http_client or create_http_client()
+
+    async def get_response(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        fields: Collection[str] | None = None,
+    ) -> APIResponse:
+        url = f"{self.base_url}{endpoint}"
+
+        cache_key = None
+        cached = None
+        if self.cache is not None:
+            key_params = params if fields is None else {**(params or {}), "_fields": sorted(fields)}
+            cache_key = self.cache.make_key(url, key_params)
+            cached = self.cache.get(cache_key)
+            if cached is not None and cached.is_fresh(self.cache_ttl):
+                logger.info("api_cache_hit", url=url)
+                self._record_cache(url, "hit")
+                return APIResponse(data=cached.body, headers=cached.headers, from_cache=True)
+
+        request_headers = cached.conditional_headers() if cached is not None else {}
+        response, data = await self._send(
+            "GET",
+            url,
+            params=params,
+            headers=request_headers,
+            fields=fields,
+            allow_not_modified=cached is not None,
         )
 
+        if response.status_code == 304:
+            self.cache.set(cache_key, cached.model_copy(update={"stored_at": time.time()}))
+            logger.info("api_not_modified", url=url)
+            self._record_cache(url, "revalidated")
+            return APIResponse(
+                data=cached.body, headers=cached.headers, status_code=304, from_cache=True
+            )
+
+        headers = dict(response.headers)
+
+        if self.cache is not None:
+            self._record_cache(url, "miss")
+            self.cache.set(
+                cache_key,
+                CachedResponse(
+                    url=url,
+                    body=data,
+                    headers={k: headers[k] for k in self.cached_headers if k in headers},
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    stored_at=time.time(),
+                ),
+            )
+
+        return APIResponse(data=data, headers=headers, status_code=response.status_code)
+
+    async def get(
+        self,
+        endpoint: str,
+        params: dict | None = None,
+        fields: Collection[str] | None = None,
+    ) -> Any:
+        response = await self.get_response(endpoint, params=params, fields=fields)
+        return response.data
+
+    async def post(self, endpoint: str, json: dict) -> Any:
+        _, data = await self._send("POST", f"{self.base_url}{endpoint}", json=json)
+        return data
+
     @retry(
-        stop=stop_after_attempt(settings.max_retries),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((httpx.TimeoutException, httpx.NetworkError)),
+        stop=stop_any(_stop_after_max_retries, _stop_on_long_rate_limit, _stop_on_open_circuit),
+        wait=_retry_wait,
+        retry=retry_if_exception_type(
+            (httpx.TimeoutException, httpx.NetworkError, RateLimitError)
+        ),
+        before_sleep=_record_retry,
+        retry_error_callback=_give_up,
     )
-    async def get(self, endpoint: str, params: dict | None = None) -> dict:
-        url = f"{self.base_url}{endpoint}"
-        logger.info("api_request", method="GET", url=url, params=params)
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: dict | None = None,
+        json: dict | None = None,
+        headers: dict | None = None,
+        fields: Collection[str] | None = None,
+        allow_not_modified: bool = False,
+    ) -> tuple[httpx.Response, Any]:
+        host = httpx.URL(url).host
+        cassette_key = (
+            Cassette.make_key(method, url, params, json, fields)
+            if self.cassette is not None
+            else None
+        )
+        if self.cassette is not None and self.cassette.replaying:
+            return await self._replay(method, url, host, cassette_key)
+
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.check(host)
+
+        if self.rate_limiter is not None:
+            waited = await self.rate_limiter.acquire(host, self.rate_limit_resource(url))
+            if self.metrics is not None and waited > 0:
+                self.metrics.record_throttle_wait(host, waited)
+
+        logger.info("api_request", method=method, url=url, params=params)
 
         try:
-            response = await self.client.get(url, params=params)
+            slot = self.scheduler.slot(host) if self.scheduler is not None else nullcontext()
+            async with slot:
+                request = self.client.build_request(
+                    method,
+                    url,
+                    params=params,
+                    json=json,
+                    headers={**self.headers, **(headers or {})},
+                )
+                started = time.perf_counter()
+                response = await self.client.send(request, stream=True)
+                try:
+                    # Selected fields are parsed straight off the wire; the rest is skipped
+                    data = (
+                        await extract_fields(response.aiter_bytes(), fields)
+                        if fields is not None and response.is_success
+                        else None
+                    )
+                    if data is None:
+                        await response.aread()
+                finally:
+                    await response.aclose()
+                elapsed = time.perf_counter() - started
+
+            if self.metrics is not None:
+                self.metrics.observe_response(
+                    method,
+                    host,
+                    response.url.path,
+                    response.status_code,
+                    elapsed,
+                    response.num_bytes_downloaded,
+                )
+
+            if self.circuit_breaker is not None:
+                if response.status_code >= 500:
+                    self.circuit_breaker.record_failure(host)
+                else:
+                    self.circuit_breaker.record_success(host)
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.update(host, response, self.rate_limit_resource(url))
+
+            if is_rate_limited(response):
+                retry_after = rate_limit_delay(response)
+                logger.warning(
+                    "api_rate_limited",
+                    status=response.status_code,
+                    url=url,
+                    retry_after=retry_after,
+                )
+                raise RateLimitError(
+                    f"HTTP {response.status_code}: {url} (rate limited)", retry_after=retry_after
+                )
+
+            if allow_not_modified and response.status_code == 304:
+                logger.info("api_response", status=response.status_code, url=url)
+                return response, None
+
+            if fields is None and response.is_success:
+                data = response.json()
+            if self.cassette is not None:
+                self.cassette.record(
+                    cassette_key,
+                    method,
+                    url,
+                    RecordedResponse(response.status_code, dict(response.headers), data, elapsed),
+                )
+
             response.raise_for_status()
-            data = response.json()
             logger.info("api_response", status=response.status_code, url=url)
-            return data
+            return response, data
         except httpx.HTTPStatusError as e:
             logger.error(
                 "api_http_error",
@@ -44,16 +299,58 @@ class BaseAPIClient:
             raise APIError(f"HTTP {e.response.status_code}: {url}") from e
         except httpx.TimeoutException as e:
             logger.error("api_timeout", url=url)
+            if self.metrics is not None:
+                self.metrics.record_error(method, host, httpx.URL(url).path)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_failure(host)
             raise
         except httpx.RequestError as e:
             logger.error("api_request_error", error=str(e), url=url)
+            if self.metrics is not None:
+                self.metrics.record_error(method, host, httpx.URL(url).path)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_failure(host)
             raise APIError(f"Request failed: {url}") from e
         except ValueError as e:
             logger.error("api_json_decode_error", error=str(e), url=url)
             raise APIError(f"Invalid JSON response from {url}") from e
 
+    async def _replay(
+        self, method: str, url: str, host: str, key: str
+    ) -> tuple[httpx.Response, Any]:
+        recorded = self.cassette.get(key)
+        if recorded is None:
+            logger.error("api_replay_miss", method=method, url=url)
+            raise APIError(f"No recorded response: {method} {url}")
+
+        if self.cassette.simulate_latency:
+            # Held inside the scheduler slot so replayed runs keep the recorded concurrency
+            slot = self.scheduler.slot(host) if self.scheduler is not None else nullcontext()
+            async with slot:
+                await asyncio.sleep(recorded.elapsed)
+
+        response = httpx.Response(
+            recorded.status_code,
+            headers=recorded.headers,
+            request=httpx.Request(method, url),
+        )
+        logger.info("api_replayed", status=response.status_code, url=url)
+        if not response.is_success:
+            logger.error("api_http_error", status=response.status_code, url=url)
+            raise APIError(f"HTTP {response.status_code}: {url}")
+        return response, recorded.data
+
+    def rate_limit_resource(self, url: str) -> str | None:
+        # Which of the host's rate-limit budgets a request draws from
+        return None
+
+    def _record_cache(self, url: str, outcome: str) -> None:
+        if self.metrics is not None:
+            self.metrics.record_cache(httpx.URL(url).host, outcome)
+
     async def close(self):
-        await self.client.aclose()
+        if self._owns_client:
+            await self.client.aclose()
 
     async def __aenter__(self):
         return self
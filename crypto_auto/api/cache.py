@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+import structlog
+from pydantic import BaseModel
+
+logger = structlog.get_logger()
+
+
+class CachedResponse(BaseModel):
+    url: str
+    body: Any
+    headers: dict[str, str] = {}
+    etag: str | None = None
+    last_modified: str | None = None
+    stored_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return ttl > 0 and time.time() - self.stored_at < ttl
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    def __init__(self, directory: str | Path, max_bytes: int = 200_000_000):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._total_bytes = sum(p.stat().st_size for p in self.directory.glob("*.json"))
+
+    @staticmethod
+    def make_key(url: str, params: dict | None = None) -> str:
+        raw = json.dumps([url, params or {}], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> CachedResponse | None:
+        path = self._path(key)
+        try:
+            entry = CachedResponse.model_validate_json(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning("cache_entry_corrupt", key=key)
+            self._remove(path)
+            return None
+
+        # The mtime doubles as the LRU access time
+        os.utime(path)
+        return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        path = self._path(key)
+        payload = entry.model_dump_json().encode("utf-8")
+
+        previous_size = path.stat().st_size if path.exists() else 0
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+        self._total_bytes += len(payload) - previous_size
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            self._remove(path)
+
+    def _evict(self) -> None:
+        entries = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        evicted = 0
+        for path in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._remove(path)
+            evicted += 1
+
+        logger.info("cache_evicted", entries=evicted, total_bytes=self._total_bytes)
+
+    def _remove(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        self._total_bytes -= size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
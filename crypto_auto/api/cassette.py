@@ -0,0 +1,125 @@
+import hashlib
+import json
+import sqlite3
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Collection, Literal
+import structlog
+
+logger = structlog.get_logger()
+
+CassetteMode = Literal["record", "replay"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interactions (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    elapsed REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class RecordedResponse:
+    status_code: int
+    headers: dict[str, str]
+    data: Any
+    elapsed: float
+
+
+class Cassette:
+    def __init__(self, path: str | Path, mode: CassetteMode, simulate_latency: bool = False):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.simulate_latency = simulate_latency
+        if mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        elif not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+        self._recorded = 0
+
+        if mode == "record":
+            self.recorded_at = datetime.now(timezone.utc)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO metadata (name, value) VALUES ('recorded_at', ?)",
+                (self.recorded_at.isoformat(),),
+            )
+        else:
+            row = self.connection.execute(
+                "SELECT value FROM metadata WHERE name = 'recorded_at'"
+            ).fetchone()
+            self.recorded_at = datetime.fromisoformat(row[0]) if row else datetime.now(timezone.utc)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @staticmethod
+    def make_key(
+        method: str,
+        url: str,
+        params: dict | None = None,
+        json_body: dict | None = None,
+        fields: Collection[str] | None = None,
+    ) -> str:
+        raw = json.dumps(
+            [method, url, params or {}, json_body, sorted(fields) if fields is not None else None],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> RecordedResponse | None:
+        row = self.connection.execute(
+            "SELECT status_code, elapsed, payload FROM interactions WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        status_code, elapsed, payload = row
+        headers, data = json.loads(zlib.decompress(payload))
+        return RecordedResponse(status_code, headers, data, elapsed)
+
+    def record(self, key: str, method: str, url: str, response: RecordedResponse) -> None:
+        # Headers and body share one compressed blob; only the lookup columns stay plain
+        payload = zlib.compress(
+            json.dumps([response.headers, response.data], separators=(",", ":")).encode("utf-8")
+        )
+        self.connection.execute(
+            "INSERT OR REPLACE INTO interactions "
+            "(key, method, url, status_code, elapsed, payload) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, method, url, response.status_code, response.elapsed, payload),
+        )
+        self._recorded += 1
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM interactions").fetchone()[0]
+
+    def close(self) -> None:
+        if self.mode == "record":
+            self.connection.commit()
+            logger.info("cassette_saved", path=str(self.path), recorded=self._recorded)
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
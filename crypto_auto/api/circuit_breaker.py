@@ -0,0 +1,72 @@
+import time
+from dataclasses import dataclass
+import structlog
+from crypto_auto.api.errors import CircuitOpenError
+
+logger = structlog.get_logger()
+
+
+@dataclass(slots=True)
+class _HostCircuit:
+    failures: int = 0
+    opened_at: float | None = None
+    probe_started_at: float | None = None
+
+
+class CircuitBreaker:
+    # Per host: after `failure_threshold` consecutive failures, requests fail at once for
+    # `reset_timeout` seconds; then a single probe is let through and its outcome decides
+    # whether the circuit closes again or stays open for another period
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._hosts: dict[str, _HostCircuit] = {}
+
+    def check(self, host: str, now: float | None = None) -> None:
+        circuit = self._hosts.get(host)
+        if circuit is None or circuit.opened_at is None:
+            return
+
+        now = time.monotonic() if now is None else now
+        remaining = circuit.opened_at + self.reset_timeout - now
+        # A probe that never reported back (e.g. cancelled) stops blocking after one period
+        probe_pending = (
+            circuit.probe_started_at is not None
+            and now - circuit.probe_started_at < self.reset_timeout
+        )
+        if remaining > 0 or probe_pending:
+            raise CircuitOpenError(
+                f"Circuit open for {host} after {circuit.failures} consecutive failures",
+                retry_after=max(remaining, 0.0),
+            )
+
+        circuit.probe_started_at = now
+        logger.info("circuit_half_open", host=host)
+
+    def record_success(self, host: str) -> None:
+        circuit = self._hosts.get(host)
+        if circuit is None:
+            return
+        if circuit.opened_at is not None:
+            logger.info("circuit_closed", host=host)
+        self._hosts.pop(host)
+
+    def record_failure(self, host: str, now: float | None = None) -> None:
+        circuit = self._hosts.setdefault(host, _HostCircuit())
+        circuit.failures += 1
+
+        if circuit.probe_started_at is not None or (
+            circuit.opened_at is None and circuit.failures >= self.failure_threshold
+        ):
+            circuit.opened_at = time.monotonic() if now is None else now
+            circuit.probe_started_at = None
+            logger.warning(
+                "circuit_opened",
+                host=host,
+                failures=circuit.failures,
+                reset_timeout=self.reset_timeout,
+            )
+
+    def is_open(self, host: str) -> bool:
+        circuit = self._hosts.get(host)
+        return circuit is not None and circuit.opened_at is not None
@@ -1,17 +1,69 @@
+import httpx
 import structlog
 from crypto_auto.api.base import BaseAPIClient, APIError
+from crypto_auto.api.cache import ResponseCache
+from crypto_auto.api.cassette import Cassette
+from crypto_auto.api.circuit_breaker import CircuitBreaker
+from crypto_auto.api.metrics import RequestMetrics
+from crypto_auto.api.rate_limit import RateLimiter
+from crypto_auto.api.scheduler import RequestScheduler
+from crypto_auto.config.settings import settings
 from crypto_auto.models.market_data import MarketData
 
 logger = structlog.get_logger()
 
+MARKET_FIELDS = ("mcap", "fdv", "fdvTvl", "tvl", "price")
+INDEX_FIELDS = (*MARKET_FIELDS, "gecko_id")
+
 
 class DeFiLlamaClient(BaseAPIClient):
-    def __init__(self):
-        super().__init__(base_url="https://api.llama.fi")
+    def __init__(
+        self,
+        cache: ResponseCache | None = None,
+        scheduler: RequestScheduler | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cassette: Cassette | None = None,
+        metrics: RequestMetrics | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ):
+        super().__init__(
+            base_url=settings.defillama_base_url,
+            cache=cache,
+            cache_ttl=settings.defillama_cache_ttl,
+            scheduler=scheduler,
+            rate_limiter=rate_limiter,
+            cassette=cassette,
+            metrics=metrics,
+            http_client=http_client,
+            circuit_breaker=circuit_breaker,
+        )
+        self.protocol_index: dict[str, dict] | None = None
+
+    async def load_protocol_index(self) -> dict[str, dict]:
+        protocols = await self.get("/protocols")
+
+        if not isinstance(protocols, list):
+            raise APIError(f"Unexpected /protocols response type: {type(protocols).__name__}")
+
+        self.protocol_index = {
+            record["slug"]: {key: record[key] for key in INDEX_FIELDS if key in record}
+            for record in protocols
+            if isinstance(record, dict) and record.get("slug")
+        }
+
+        logger.info("protocol_index_loaded", protocols=len(self.protocol_index))
+        return self.protocol_index
 
     async def get_market_data(self, slug: str) -> MarketData:
-        endpoint = f"/protocol/{slug}"
-        data = await self.get(endpoint)
+        record = self.protocol_index.get(slug) if self.protocol_index is not None else None
+
+        if record and (record.get("mcap") or record.get("fdv")):
+            data = record
+        else:
+            if self.protocol_index is not None:
+                logger.info("protocol_index_miss", slug=slug)
+            data = await self.get(f"/protocol/{slug}", fields=MARKET_FIELDS)
 
         ticker = slug.upper()
 
@@ -46,3 +98,45 @@ class DeFiLlamaClient(BaseAPIClient):
             fdv=fdv,
             mcap_fdv_ratio=mcap / fdv if fdv > 0 else 0,
         )
+
+
+class DeFiLlamaCoinsClient(BaseAPIClient):
+    def __init__(
+        self,
+        cache: ResponseCache | None = None,
+        scheduler: RequestScheduler | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cassette: Cassette | None = None,
+        metrics: RequestMetrics | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ):
+        super().__init__(
+            base_url=settings.defillama_coins_base_url,
+            cache=cache,
+            cache_ttl=settings.defillama_cache_ttl,
+            scheduler=scheduler,
+            rate_limiter=rate_limiter,
+            cassette=cassette,
+            metrics=metrics,
+            http_client=http_client,
+            circuit_breaker=circuit_breaker,
+        )
+
+    async def get_price_chart(self, coin: str, start: int, span: int) -> list[tuple[int, float]]:
+        data = await self.get(
+            f"/chart/{coin}", params={"start": start, "span": span, "period": "1d"}
+        )
+
+        record = (data.get("coins") or {}).get(coin) if isinstance(data, dict) else None
+        if record is None:
+            raise APIError(f"No price chart available for {coin}")
+
+        points = [
+            (int(point["timestamp"]), float(point["price"]))
+            for point in record.get("prices", [])
+            if point.get("price") is not None
+        ]
+
+        logger.info("price_chart_fetched", coin=coin, start=start, points=len(points))
+        return points
@@ -0,0 +1,15 @@
+class APIError(Exception):
+    pass
+
+
+class RateLimitError(APIError):
+    # retry_after is None when the server did not say how long to wait
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(APIError):
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -1,46 +1,220 @@
+import json
+import re
 from datetime import datetime, timedelta, timezone
+import httpx
 import structlog
-from crypto_auto.api.base import BaseAPIClient
+from crypto_auto.api.base import APIError, BaseAPIClient, RateLimitError
+from crypto_auto.api.cache import ResponseCache
+from crypto_auto.api.cassette import Cassette
+from crypto_auto.api.circuit_breaker import CircuitBreaker
+from crypto_auto.api.metrics import RequestMetrics
+from crypto_auto.api.rate_limit import RateLimiter
+from crypto_auto.api.scheduler import RequestScheduler
 from crypto_auto.config.settings import settings
+from crypto_auto.models.history import CommitRecord
 
 logger = structlog.get_logger()
 
+_LINK_PAGE_PATTERNS = {
+    rel: re.compile(rf'<[^>]*[?&]page=(\d+)[^>]*>\s*;\s*rel="{rel}"') for rel in ("next", "last")
+}
+
+
+def parse_link_page(link_header: str | None, rel: str) -> int | None:
+    if not link_header:
+        return None
+
+    match = _LINK_PAGE_PATTERNS[rel].search(link_header)
+    return int(match.group(1)) if match else None
+
+
+def parse_last_page(link_header: str | None) -> int | None:
+    return parse_link_page(link_header, "last")
+
+
+def _commit_date(commit: dict) -> str:
+    details = commit.get("commit") or {}
+    raw = (details.get("committer") or {}).get("date") or (details.get("author") or {}).get("date")
+    if raw is None:
+        raise APIError(f"Commit {commit.get('sha')} has no date")
+    return datetime.fromisoformat(raw.replace("Z", "+00:00")).isoformat()
+
+
+def build_history_query(repos: list[str]) -> str:
+    fields = []
+    for i, repo in enumerate(repos):
+        owner, name = repo.split("/")
+        fields.append(
+            f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{ "
+            "defaultBranchRef { target { ... on Commit { history(since: $since) { totalCount } } } } }"
+        )
+
+    return "query($since: GitTimestamp!) {\n  " + "\n  ".join(fields) + "\n}"
+
+
+def activity_window_end(now: datetime | None = None) -> datetime:
+    # Truncated to the day so every run that day sends the same `since`, and a stored
+    # response can be revalidated with its ETag instead of fetched again
+    return (now or datetime.now(timezone.utc)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+def _since(window_end: datetime, days: int) -> str:
+    return (window_end - timedelta(days=days)).isoformat()
+
 
 class GitHubClient(BaseAPIClient):
-    def __init__(self):
+    def __init__(
+        self,
+        cache: ResponseCache | None = None,
+        scheduler: RequestScheduler | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cassette: Cassette | None = None,
+        metrics: RequestMetrics | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ):
+        headers = {"Accept": "application/vnd.github.v3+json"}
+        if settings.github_token:
+            headers["Authorization"] = f"token {settings.github_token}"
+
         super().__init__(
-            base_url="https://api.github.com",
-            headers={
-                "Authorization": f"token {settings.github_token}",
-                "Accept": "application/vnd.github.v3+json",
-            },
+            base_url=settings.github_base_url,
+            headers=headers,
+            cache=cache,
+            cache_ttl=settings.github_cache_ttl,
+            scheduler=scheduler,
+            rate_limiter=rate_limiter,
+            cassette=cassette,
+            metrics=metrics,
+            http_client=http_client,
+            circuit_breaker=circuit_breaker,
         )
 
-    async def get_commit_activity(self, repo: str, days: int = 30) -> int:
-        since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    def rate_limit_resource(self, url: str) -> str | None:
+        # The names GitHub reports in X-RateLimit-Resource
+        path = httpx.URL(url).path
+        if path == "/graphql":
+            return "graphql"
+        if path.startswith("/search/"):
+            return "search"
+        return "core"
+
+    def window_end(self) -> datetime:
+        # A replayed run keeps the recording's window so its requests match the cassette
+        return activity_window_end(self.cassette.recorded_at if self.cassette is not None else None)
+
+    async def get_commit_activity(self, repo: str, days: int = 30, exact: bool = False) -> int:
+        since = _since(self.window_end(), days)
         endpoint = f"/repos/{repo}/commits"
-        params = {"since": since, "per_page": 100}
+        per_page = 1 if exact else 100
+        params = {"since": since, "per_page": per_page}
 
-        try:
-            commits = await self.get(endpoint, params=params)
+        response = await self.get_response(endpoint, params=params)
+        commits = response.data
 
-            if not isinstance(commits, list):
-                logger.error("unexpected_response_type", repo=repo, response_type=type(commits))
-                return 0
+        # Failures are raised rather than counted as 0, so a throttled, broken or
+        # circuit-broken repo is never mistaken for an inactive one
+        if not isinstance(commits, list):
+            raise APIError(f"Unexpected commits response for {repo}: {type(commits).__name__}")
 
+        if exact:
+            # With one commit per page, the last page number is the commit count
+            last_page = parse_last_page(response.headers.get("link"))
+            commit_count = last_page if last_page is not None else len(commits)
+        else:
             commit_count = len(commits)
 
-            if commit_count >= 100:
+            if commit_count >= per_page:
                 logger.warning(
                     "max_commits_reached",
                     repo=repo,
                     commits=commit_count,
-                    message="May be more commits than returned (pagination not implemented)",
+                    message="May be more commits than returned (use exact counting)",
+                )
+
+        logger.info("github_activity_fetched", repo=repo, commits=commit_count, days=days)
+        return commit_count
+
+    async def get_commits_since(
+        self, repo: str, since: str, stop_at_sha: str | None = None
+    ) -> tuple[list[CommitRecord], bool]:
+        # Returns the commits and whether they reach back to `since` (or `stop_at_sha`);
+        # False means the page cap cut the history short
+        endpoint = f"/repos/{repo}/commits"
+        commits: list[CommitRecord] = []
+        page = 1
+
+        for _ in range(settings.github_sync_max_pages):
+            response = await self.get_response(
+                endpoint, params={"since": since, "per_page": 100, "page": page}
+            )
+            if not isinstance(response.data, list):
+                raise APIError(f"Unexpected commits response for {repo}")
+
+            for commit in response.data:
+                # Newest first: everything from the checkpoint on is already stored
+                if stop_at_sha is not None and commit.get("sha") == stop_at_sha:
+                    return commits, True
+                commits.append(CommitRecord(sha=commit["sha"], committed_at=_commit_date(commit)))
+
+            next_page = parse_link_page(response.headers.get("link"), "next")
+            if next_page is None:
+                return commits, True
+            page = next_page
+
+        logger.warning(
+            "github_sync_page_limit_reached",
+            repo=repo,
+            pages=settings.github_sync_max_pages,
+            commits=len(commits),
+        )
+        return commits, False
+
+    async def get_dev_activity_batch(self, repos: list[str], days: int = 30) -> dict[str, int]:
+        since = _since(self.window_end(), days)
+        unique_repos = list(dict.fromkeys(repos))
+        batch_size = settings.github_graphql_batch_size
+        counts: dict[str, int] = {}
+
+        for start in range(0, len(unique_repos), batch_size):
+            chunk = unique_repos[start : start + batch_size]
+            query = build_history_query(chunk)
+
+            try:
+                payload = await self.post(
+                    "/graphql", json={"query": query, "variables": {"since": since}}
                 )
+            except RateLimitError as e:
+                logger.error("github_graphql_rate_limited", error=str(e))
+                break
+            except APIError as e:
+                logger.error("github_graphql_failed", repos=len(chunk), error=str(e))
+                continue
 
-            logger.info("github_activity_fetched", repo=repo, commits=commit_count, days=days)
-            return commit_count
+            if not isinstance(payload, dict):
+                logger.error("unexpected_response_type", response_type=type(payload))
+                continue
 
-        except Exception as e:
-            logger.error("github_activity_fetch_failed", repo=repo, error=str(e))
-            return 0
+            if payload.get("errors"):
+                logger.warning(
+                    "github_graphql_partial_errors",
+                    errors=[e.get("message") for e in payload["errors"]][:5],
+                )
+
+            data = payload.get("data") or {}
+            for i, repo in enumerate(chunk):
+                node = data.get(f"r{i}") or {}
+                target = (node.get("defaultBranchRef") or {}).get("target") or {}
+                total = (target.get("history") or {}).get("totalCount")
+                if total is not None:
+                    counts[repo] = total
+
+        logger.info(
+            "github_graphql_activity_fetched",
+            requested=len(unique_repos),
+            resolved=len(counts),
+            days=days,
+        )
+        return counts
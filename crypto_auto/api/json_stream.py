@@ -0,0 +1,139 @@
+import json
+import re
+from typing import Any, AsyncIterator, Collection
+
+_WHITESPACE = b" \t\r\n"
+_SKIP = re.compile(rb'(?:[^"\[\]{},]+|"(?:[^"\\]|\\.)*")*', re.DOTALL)
+_SKIP_NESTED = re.compile(rb'(?:[^"\[\]{}]+|"(?:[^"\\]|\\.)*")*', re.DOTALL)
+_STRING = re.compile(rb'"((?:[^"\\]|\\.)*)"', re.DOTALL)
+
+_START, _KEY, _COLON, _VALUE, _DONE = range(5)
+
+
+class TopLevelFieldExtractor:
+    def __init__(self, fields: Collection[str]):
+        self.fields = set(fields)
+        self.result: dict[str, Any] = {}
+        self._buffer = bytearray()
+        self._pos = 0
+        self._state = _START
+        self._key: str | None = None
+        self._nest = 0
+        self._value_start = 0
+
+    @property
+    def complete(self) -> bool:
+        return self._state == _DONE or self.fields.issubset(self.result)
+
+    def feed(self, chunk: bytes) -> None:
+        self._buffer.extend(chunk)
+        self._scan()
+        self._compact()
+
+    def close(self) -> dict[str, Any]:
+        if not self.complete:
+            raise ValueError("Truncated JSON document")
+        return self.result
+
+    def _scan(self) -> None:
+        buf = self._buffer
+        while self._state != _DONE:
+            if self._state == _START:
+                pos = self._skip_whitespace(self._pos)
+                if pos >= len(buf):
+                    return
+                if buf[pos] != ord("{"):
+                    raise ValueError("Expected a JSON object")
+                self._pos = pos + 1
+                self._state = _KEY
+
+            elif self._state == _KEY:
+                pos = self._skip_whitespace(self._pos)
+                while pos < len(buf) and buf[pos] == ord(","):
+                    pos = self._skip_whitespace(pos + 1)
+                if pos >= len(buf):
+                    self._pos = pos
+                    return
+                if buf[pos] == ord("}"):
+                    self._state = _DONE
+                    return
+                match = _STRING.match(buf, pos)
+                if match is None:
+                    if buf[pos] != ord('"'):
+                        raise ValueError("Expected an object key")
+                    self._pos = pos
+                    return
+                self._key = json.loads(b'"' + match.group(1) + b'"')
+                self._pos = match.end()
+                self._state = _COLON
+
+            elif self._state == _COLON:
+                pos = self._skip_whitespace(self._pos)
+                if pos >= len(buf):
+                    self._pos = pos
+                    return
+                if buf[pos] != ord(":"):
+                    raise ValueError("Expected ':' after object key")
+                self._pos = pos + 1
+                self._value_start = self._pos
+                self._nest = 0
+                self._state = _VALUE
+
+            elif self._state == _VALUE:
+                if not self._scan_value():
+                    return
+
+    def _scan_value(self) -> bool:
+        # Runs of scalars and complete strings are skipped in one regex match, so
+        # only brackets and top-level commas reach Python; skipped values are never decoded
+        buf = self._buffer
+        while True:
+            pattern = _SKIP_NESTED if self._nest else _SKIP
+            pos = pattern.match(buf, self._pos).end()
+            self._pos = pos
+            if pos >= len(buf) or buf[pos] == ord('"'):
+                return False
+
+            char = buf[pos]
+            if char in b"[{":
+                self._nest += 1
+            elif self._nest > 0:
+                self._nest -= 1
+            elif char == ord("]"):
+                raise ValueError("Unbalanced ']' in JSON document")
+            else:
+                # ',' or the closing '}' of the top-level object ends the value
+                self._finish_value(pos)
+                self._state = _DONE if char == ord("}") else _KEY
+                self._pos = pos + 1
+                return True
+            self._pos = pos + 1
+
+    def _finish_value(self, end: int) -> None:
+        if self._key in self.fields:
+            raw = bytes(self._buffer[self._value_start : end]).strip()
+            self.result[self._key] = json.loads(raw)
+
+    def _skip_whitespace(self, pos: int) -> int:
+        buf = self._buffer
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        return pos
+
+    def _compact(self) -> None:
+        keep_from = self._pos
+        if self._state == _VALUE and self._key in self.fields:
+            keep_from = self._value_start
+        if keep_from:
+            del self._buffer[:keep_from]
+            self._pos -= keep_from
+            self._value_start = max(0, self._value_start - keep_from)
+
+
+async def extract_fields(chunks: AsyncIterator[bytes], fields: Collection[str]) -> dict[str, Any]:
+    extractor = TopLevelFieldExtractor(fields)
+    async for chunk in chunks:
+        extractor.feed(chunk)
+        if extractor.complete:
+            break
+    return extractor.close()
@@ -0,0 +1,224 @@
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+# Upper bounds in seconds, as in the Prometheus client defaults
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Path segments that identify a resource are folded so labels stay low-cardinality
+_ENDPOINT_TEMPLATES = (
+    (re.compile(r"^/repos/[^/]+/[^/]+"), "/repos/{repo}"),
+    (re.compile(r"^/(protocol|chart)/[^/]+"), r"/\1/{id}"),
+)
+
+
+def endpoint_template(path: str) -> str:
+    for pattern, template in _ENDPOINT_TEMPLATES:
+        path = pattern.sub(template, path, count=1)
+    return path
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    bucket_counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    count: int = 0
+    total: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.bucket_counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float | None:
+        # Upper bound of the bucket holding the q-th observation
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip((*LATENCY_BUCKETS, float("inf")), self.bucket_counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip([*map(str, LATENCY_BUCKETS), "+Inf"], self.bucket_counts)),
+        }
+
+
+@dataclass(slots=True)
+class EndpointStats:
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    statuses: dict[str, int] = field(default_factory=dict)
+    response_bytes: int = 0
+    errors: int = 0
+
+
+@dataclass(slots=True)
+class HostStats:
+    retries: int = 0
+    throttle_waits: int = 0
+    throttle_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_revalidated: int = 0
+    cache_misses: int = 0
+
+    @property
+    def cache_hit_ratio(self) -> float | None:
+        lookups = self.cache_hits + self.cache_revalidated + self.cache_misses
+        return (self.cache_hits + self.cache_revalidated) / lookups if lookups else None
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.endpoints: dict[tuple[str, str, str], EndpointStats] = {}
+        self.hosts: dict[str, HostStats] = {}
+        self.phases: dict[str, float] = {}
+
+    def observe_response(
+        self,
+        method: str,
+        host: str,
+        path: str,
+        status: int,
+        seconds: float,
+        response_bytes: int,
+    ) -> None:
+        stats = self._endpoint(method, host, path)
+        stats.latency.observe(seconds)
+        stats.statuses[str(status)] = stats.statuses.get(str(status), 0) + 1
+        stats.response_bytes += response_bytes
+
+    def record_error(self, method: str, host: str, path: str) -> None:
+        self._endpoint(method, host, path).errors += 1
+
+    def record_retry(self, host: str) -> None:
+        self._host(host).retries += 1
+
+    def record_throttle_wait(self, host: str, seconds: float) -> None:
+        stats = self._host(host)
+        stats.throttle_waits += 1
+        stats.throttle_seconds += seconds
+
+    def record_cache(self, host: str, outcome: str) -> None:
+        stats = self._host(host)
+        match outcome:
+            case "hit":
+                stats.cache_hits += 1
+            case "revalidated":
+                stats.cache_revalidated += 1
+            case _:
+                stats.cache_misses += 1
+
+    def record_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": [
+                {
+                    "method": method,
+                    "host": host,
+                    "endpoint": endpoint,
+                    "latency": stats.latency.to_dict(),
+                    "statuses": stats.statuses,
+                    "response_bytes": stats.response_bytes,
+                    "errors": stats.errors,
+                }
+                for (method, host, endpoint), stats in sorted(self.endpoints.items())
+            ],
+            "hosts": {
+                host: {
+                    "retries": stats.retries,
+                    "throttle_waits": stats.throttle_waits,
+                    "throttle_seconds": round(stats.throttle_seconds, 6),
+                    "cache_hits": stats.cache_hits,
+                    "cache_revalidated": stats.cache_revalidated,
+                    "cache_misses": stats.cache_misses,
+                    "cache_hit_ratio": stats.cache_hit_ratio,
+                }
+                for host, stats in sorted(self.hosts.items())
+            },
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+        }
+
+    def to_prometheus(self) -> str:
+        lines = [
+            "# HELP crypto_auto_request_duration_seconds API request latency.",
+            "# TYPE crypto_auto_request_duration_seconds histogram",
+        ]
+        for (method, host, endpoint), stats in sorted(self.endpoints.items()):
+            labels = f'method="{method}",host="{host}",endpoint="{endpoint}"'
+            cumulative = 0
+            bounds = [*map(str, LATENCY_BUCKETS), "+Inf"]
+            for bound, count in zip(bounds, stats.latency.bucket_counts):
+                cumulative += count
+                lines.append(
+                    f'crypto_auto_request_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(
+                f"crypto_auto_request_duration_seconds_sum{{{labels}}} {stats.latency.total}"
+            )
+            lines.append(
+                f"crypto_auto_request_duration_seconds_count{{{labels}}} {stats.latency.count}"
+            )
+
+        lines += [
+            "# HELP crypto_auto_requests_total API responses by status code.",
+            "# TYPE crypto_auto_requests_total counter",
+        ]
+        for (method, host, endpoint), stats in sorted(self.endpoints.items()):
+            labels = f'method="{method}",host="{host}",endpoint="{endpoint}"'
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f'crypto_auto_requests_total{{{labels},status="{status}"}} {count}')
+            if stats.errors:
+                lines.append(f'crypto_auto_requests_total{{{labels},status="error"}} {stats.errors}')
+
+        lines += [
+            "# HELP crypto_auto_response_bytes_total Response bytes downloaded.",
+            "# TYPE crypto_auto_response_bytes_total counter",
+        ]
+        for (method, host, endpoint), stats in sorted(self.endpoints.items()):
+            labels = f'method="{method}",host="{host}",endpoint="{endpoint}"'
+            lines.append(f"crypto_auto_response_bytes_total{{{labels}}} {stats.response_bytes}")
+
+        host_counters = (
+            ("retries_total", "Requests retried after a failure.", "retries"),
+            ("throttle_waits_total", "Waits imposed by rate limiting.", "throttle_waits"),
+            ("throttle_seconds_total", "Seconds spent waiting on rate limits.", "throttle_seconds"),
+            ("cache_hits_total", "Responses served fresh from the cache.", "cache_hits"),
+            ("cache_revalidated_total", "Cached responses revalidated with 304.", "cache_revalidated"),
+            ("cache_misses_total", "Cache lookups that required a full fetch.", "cache_misses"),
+        )
+        for name, help_text, attribute in host_counters:
+            lines += [f"# HELP crypto_auto_{name} {help_text}", f"# TYPE crypto_auto_{name} counter"]
+            for host, stats in sorted(self.hosts.items()):
+                lines.append(f'crypto_auto_{name}{{host="{host}"}} {getattr(stats, attribute)}')
+
+        lines += [
+            "# HELP crypto_auto_phase_seconds Wall time per pipeline phase.",
+            "# TYPE crypto_auto_phase_seconds gauge",
+        ]
+        for name, seconds in self.phases.items():
+            lines.append(f'crypto_auto_phase_seconds{{phase="{name}"}} {seconds}')
+
+        return "\n".join(lines) + "\n"
+
+    def _endpoint(self, method: str, host: str, path: str) -> EndpointStats:
+        key = (method, host, endpoint_template(path))
+        stats = self.endpoints.get(key)
+        if stats is None:
+            stats = self.endpoints[key] = EndpointStats()
+        return stats
+
+    def _host(self, host: str) -> HostStats:
+        stats = self.hosts.get(host)
+        if stats is None:
+            stats = self.hosts[host] = HostStats()
+        return stats
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+import httpx
+import structlog
+from crypto_auto.api.errors import RateLimitError
+
+logger = structlog.get_logger()
+
+
+def retry_after_seconds(headers: httpx.Headers, now: float | None = None) -> float | None:
+    now = time.time() if now is None else now
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - now)
+            except (TypeError, ValueError):
+                pass
+
+    if headers.get("x-ratelimit-remaining") == "0" and headers.get("x-ratelimit-reset"):
+        try:
+            return max(0.0, float(headers["x-ratelimit-reset"]) - now)
+        except ValueError:
+            return None
+
+    return None
+
+
+# GitHub asks for at least a minute's pause after a secondary limit that has no Retry-After
+SECONDARY_LIMIT_WAIT = 60.0
+
+
+def is_secondary_rate_limit(response: httpx.Response) -> bool:
+    if response.status_code != 403:
+        return False
+    try:
+        return "secondary rate limit" in response.text.lower()
+    except httpx.ResponseNotRead:
+        return False
+
+
+def is_rate_limited(response: httpx.Response) -> bool:
+    if response.status_code == 429:
+        return True
+    if response.status_code == 403:
+        return (
+            response.headers.get("x-ratelimit-remaining") == "0"
+            or "retry-after" in response.headers
+            or is_secondary_rate_limit(response)
+        )
+    return False
+
+
+def rate_limit_delay(response: httpx.Response) -> float | None:
+    delay = retry_after_seconds(response.headers)
+    if delay is None and is_secondary_rate_limit(response):
+        return SECONDARY_LIMIT_WAIT
+    return delay
+
+
+class _HostBudget:
+    def __init__(self):
+        self.remaining: int | None = None
+        self.reset_at: float | None = None
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+
+class RateLimiter:
+    # Budgets are kept per host and rate-limit resource: GitHub's REST, search and GraphQL
+    # budgets (reported in X-RateLimit-Resource) all arrive from api.github.com
+    def __init__(self, reserve: int = 10, max_wait: float = 60.0):
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self._budgets: dict[tuple[str, str | None], _HostBudget] = {}
+
+    async def acquire(self, host: str, resource: str | None = None) -> float:
+        budget = self._budget(host, resource)
+        waited = 0.0
+
+        async with budget.lock:
+            while True:
+                wait = self._required_wait(budget, time.time())
+                if wait <= 0:
+                    break
+                if wait > self.max_wait:
+                    raise RateLimitError(
+                        f"Rate limit for {host} resets in {wait:.0f}s", retry_after=wait
+                    )
+
+                logger.warning(
+                    "rate_limit_wait", host=host, resource=resource, seconds=round(wait, 2)
+                )
+                await asyncio.sleep(wait)
+                waited += wait
+
+            if budget.remaining is not None:
+                budget.remaining -= 1
+
+        return waited
+
+    def update(self, host: str, response: httpx.Response, resource: str | None = None) -> None:
+        budget = self._budget(host, resource or response.headers.get("x-ratelimit-resource"))
+        headers = response.headers
+
+        try:
+            if "x-ratelimit-remaining" in headers:
+                budget.remaining = int(headers["x-ratelimit-remaining"])
+            if "x-ratelimit-reset" in headers:
+                budget.reset_at = float(headers["x-ratelimit-reset"])
+        except ValueError:
+            logger.warning("rate_limit_headers_invalid", host=host)
+
+        if is_rate_limited(response):
+            delay = rate_limit_delay(response)
+            if delay is not None:
+                budget.blocked_until = max(budget.blocked_until, time.time() + delay)
+
+    def _required_wait(self, budget: _HostBudget, now: float) -> float:
+        if budget.blocked_until > now:
+            return budget.blocked_until - now
+
+        if budget.reset_at is not None and now >= budget.reset_at:
+            budget.remaining = None
+            budget.reset_at = None
+
+        if (
+            budget.remaining is not None
+            and budget.remaining <= self.reserve
+            and budget.reset_at is not None
+        ):
+            return budget.reset_at - now
+
+        return 0.0
+
+    def _budget(self, host: str, resource: str | None) -> _HostBudget:
+        budget = self._budgets.get((host, resource))
+        if budget is None:
+            budget = self._budgets[(host, resource)] = _HostBudget()
+        return budget
@@ -0,0 +1,39 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+import structlog
+
+logger = structlog.get_logger()
+
+
+class RequestScheduler:
+    def __init__(
+        self,
+        max_concurrency: int,
+        per_host_limit: int,
+        host_limits: dict[str, int] | None = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.host_limits = host_limits or {}
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        self.in_flight = 0
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[None]:
+        async with self._host_semaphore(host), self._global:
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._hosts.get(host)
+        if semaphore is None:
+            limit = self.host_limits.get(host, self.per_host_limit)
+            semaphore = asyncio.Semaphore(limit)
+            self._hosts[host] = semaphore
+            logger.debug("host_scheduler_created", host=host, limit=limit)
+        return semaphore
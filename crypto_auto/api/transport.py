@@ -0,0 +1,31 @@
+import httpx
+import structlog
+from crypto_auto.config.settings import settings
+
+logger = structlog.get_logger()
+
+
+def _h2_installed() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client() -> httpx.AsyncClient:
+    # One pool shared by every API client, so concurrent requests to a host multiplex over
+    # a few HTTP/2 connections instead of opening a TCP/TLS connection each
+    http2 = settings.http2_enabled and _h2_installed()
+    if settings.http2_enabled and not http2:
+        logger.warning("http2_unavailable", hint="install httpx[http2] to enable HTTP/2")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=settings.http_timeout,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+    )
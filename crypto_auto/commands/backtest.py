@@ -0,0 +1,58 @@
+from pathlib import Path
+import numpy as np
+import structlog
+from crypto_auto.analysis.backtest import run_dca_backtest
+from crypto_auto.config.loader import ConfigurationError, load_crypto_projects
+from crypto_auto.config.settings import settings
+from crypto_auto.outputs.console import print_backtest_result
+from crypto_auto.storage.snapshot_store import SnapshotStore
+from crypto_auto.storage.timeseries import TimeSeriesStore
+
+logger = structlog.get_logger()
+
+
+def load_weekly_series(
+    tickers: list[str], columns: tuple[str, ...], db_path: str | None = None
+) -> tuple[list[str], dict[str, np.ndarray]]:
+    # The daily price history reaches back past the first snapshot, so it is used whenever
+    # it has been collected; an explicit snapshot database always wins
+    if db_path is None and Path(settings.price_history_dir).is_dir():
+        weeks, series = TimeSeriesStore(settings.price_history_dir).weekly_series(
+            tickers, columns
+        )
+        if weeks:
+            logger.info("weekly_series_loaded", source="price_history", weeks=len(weeks))
+            return weeks, series
+
+    with SnapshotStore(db_path or settings.snapshot_db_path) as store:
+        weeks, series = store.weekly_series(tickers, columns)
+    logger.info("weekly_series_loaded", source="snapshots", weeks=len(weeks))
+    return weeks, series
+
+
+def backtest(config_path: str, dca_amount: float, db_path: str | None = None) -> int:
+    try:
+        projects = load_crypto_projects(config_path)
+    except ConfigurationError as e:
+        logger.error("configuration_error", error=str(e))
+        print(f"❌ Configuration error: {e}")
+        return 1
+
+    tickers = [p.ticker for p in projects]
+    weeks, series = load_weekly_series(tickers, ("price",), db_path)
+    prices = series["price"]
+
+    if not weeks:
+        print("❌ No price history available - run the analysis first to collect snapshots")
+        return 1
+
+    allocations = np.array([p.target_allocation for p in projects])
+    try:
+        result = run_dca_backtest(prices, allocations, dca_amount)
+    except ValueError as e:
+        logger.error("backtest_invalid", error=str(e))
+        print(f"❌ Invalid backtest: {e}")
+        return 1
+
+    print_backtest_result(tickers, weeks, result)
+    return 0
@@ -0,0 +1,486 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Callable, Iterator
+import httpx
+import structlog
+from crypto_auto.config.loader import load_crypto_projects, ConfigurationError
+from crypto_auto.config.settings import settings
+from crypto_auto.api.base import APIError
+from crypto_auto.api.cache import ResponseCache
+from crypto_auto.api.cassette import Cassette
+from crypto_auto.api.circuit_breaker import CircuitBreaker
+from crypto_auto.api.defillama import DeFiLlamaClient, DeFiLlamaCoinsClient
+from crypto_auto.api.github_api import GitHubClient, activity_window_end
+from crypto_auto.api.metrics import RequestMetrics
+from crypto_auto.api.rate_limit import RateLimiter
+from crypto_auto.api.scheduler import RequestScheduler
+from crypto_auto.api.transport import create_http_client
+from crypto_auto.models.analysis import ProjectAnalysis
+from crypto_auto.models.market_data import MarketData
+from crypto_auto.analysis.commit_sync import IncrementalCommitSync
+from crypto_auto.analysis.dev_activity import DevActivityAnalyzer
+from crypto_auto.analysis.fdv_analyzer import FDVAnalyzer
+from crypto_auto.analysis.history_sync import PriceHistorySync
+from crypto_auto.analysis.rebalancer import PortfolioRebalancer
+from crypto_auto.outputs.console import (
+    LiveAnalysisTable,
+    print_portfolio_analysis,
+    print_rebalance_recommendations,
+    print_summary_stats,
+)
+from crypto_auto.outputs.json_writer import AnalysisStreamWriter, write_analysis_json
+from crypto_auto.outputs.metrics_writer import write_metrics
+from crypto_auto.storage.snapshot_store import SnapshotStore
+from crypto_auto.storage.timeseries import TimeSeriesStore
+
+logger = structlog.get_logger()
+
+
+def build_analysis(
+    project_config,
+    market_data: MarketData,
+    repo_commits: dict[str, int],
+    previous_activity: dict[str, int] | None = None,
+) -> ProjectAnalysis:
+    total_commits = sum(repo_commits.values())
+
+    analysis = ProjectAnalysis(
+        project=project_config,
+        market_data=market_data,
+        dev_commits_30d=total_commits,
+        dev_activity_change=DevActivityAnalyzer.calculate_change(
+            repo_commits, previous_activity or {}
+        ),
+        repo_commits=repo_commits,
+        health_status="OK",
+    )
+
+    fdv_health = FDVAnalyzer.analyze_fdv_health(market_data)
+    analysis.fdv_health = fdv_health
+
+    analysis.calculate_health(settings.fdv_ratio_warning_threshold)
+
+    logger.info(
+        "project_analyzed",
+        ticker=project_config.ticker,
+        health_status=analysis.health_status,
+        fdv_ratio=market_data.mcap_fdv_ratio,
+        commits=total_commits,
+    )
+
+    return analysis
+
+
+async def analyze_project(
+    project_config,
+    defillama_client: DeFiLlamaClient,
+    github_client: GitHubClient,
+    dev_activity: dict[str, int] | None = None,
+    previous_activity: dict[str, int] | None = None,
+) -> ProjectAnalysis | None:
+    logger.info("analyzing_project", ticker=project_config.ticker)
+
+    try:
+        dev_activity = dev_activity or {}
+        repos_to_fetch = [repo for repo in project_config.github_repos if repo not in dev_activity]
+
+        market_data, *fetched_commits = await asyncio.gather(
+            defillama_client.get_market_data(project_config.defillama_slug),
+            *(
+                github_client.get_commit_activity(
+                    repo,
+                    days=settings.dev_activity_lookback_days,
+                    exact=settings.github_exact_commit_count,
+                )
+                for repo in repos_to_fetch
+            ),
+        )
+
+        repo_commits = {
+            repo: dev_activity[repo] for repo in project_config.github_repos if repo in dev_activity
+        }
+        repo_commits.update(zip(repos_to_fetch, fetched_commits))
+
+        return build_analysis(project_config, market_data, repo_commits, previous_activity)
+
+    except Exception as e:
+        logger.error(
+            "project_analysis_failed",
+            ticker=project_config.ticker,
+            error=str(e),
+            exc_info=True,
+        )
+        return None
+
+
+async def load_protocol_index(defillama_client: DeFiLlamaClient) -> bool:
+    if not settings.defillama_bulk_enabled:
+        return False
+
+    try:
+        await defillama_client.load_protocol_index()
+    except APIError as e:
+        logger.warning("protocol_index_unavailable", error=str(e))
+        return False
+    return True
+
+
+async def fetch_dev_activity(github_client: GitHubClient, projects) -> dict[str, int] | None:
+    # A failed prefetch only costs speed: each project then counts its repos over REST
+    try:
+        return await _prefetch_dev_activity(github_client, projects)
+    except APIError as e:
+        logger.warning("dev_activity_prefetch_failed", error=str(e))
+        return None
+
+
+async def _prefetch_dev_activity(github_client: GitHubClient, projects) -> dict[str, int] | None:
+    repos = [repo for project in projects for repo in project.github_repos]
+
+    if settings.github_incremental_sync:
+        if settings.snapshot_store_enabled:
+            with SnapshotStore(settings.snapshot_db_path) as store:
+                return await IncrementalCommitSync(github_client, store).sync_all(
+                    repos, days=settings.dev_activity_lookback_days
+                )
+        logger.warning("incremental_sync_requires_snapshot_store")
+
+    if not settings.github_graphql_enabled:
+        return None
+
+    return await github_client.get_dev_activity_batch(
+        repos, days=settings.dev_activity_lookback_days
+    )
+
+
+async def update_price_history(
+    client_options: dict, protocol_index: dict[str, dict] | None, projects, analyzed_projects
+) -> None:
+    async with DeFiLlamaCoinsClient(**client_options) as coins_client:
+        history = PriceHistorySync(
+            coins_client,
+            TimeSeriesStore(settings.price_history_dir),
+            backfill_days=settings.price_history_backfill_days,
+        )
+        synced = await history.sync_all(projects, protocol_index)
+
+    # Today's row is only written once the backfill is done, since appends never go backwards
+    history.record_snapshot([p for p in analyzed_projects if p.project.ticker in synced])
+
+
+def load_stale_analyses(projects) -> list[ProjectAnalysis]:
+    if not projects or not settings.snapshot_store_enabled:
+        return []
+
+    stale = []
+    with SnapshotStore(settings.snapshot_db_path) as store:
+        for project in projects:
+            record = store.latest(project.ticker)
+            if record is None:
+                logger.warning("stale_snapshot_missing", ticker=project.ticker)
+                continue
+
+            market_data = MarketData(
+                ticker=record.ticker,
+                price=record.price,
+                market_cap=record.market_cap,
+                fdv=record.fdv,
+                mcap_fdv_ratio=record.mcap_fdv_ratio,
+            )
+            stale.append(
+                ProjectAnalysis(
+                    project=project,
+                    market_data=market_data,
+                    dev_commits_30d=record.dev_commits_30d,
+                    dev_activity_change=record.dev_activity_change,
+                    health_status=record.health_status,
+                    fdv_health=FDVAnalyzer.analyze_fdv_health(market_data),
+                    stale=True,
+                )
+            )
+            logger.info("stale_analysis_used", ticker=project.ticker, as_of=record.timestamp)
+
+    return stale
+
+
+def load_previous_activity(projects, window_end: datetime) -> dict[str, int]:
+    if not settings.snapshot_store_enabled:
+        return {}
+
+    with SnapshotStore(settings.snapshot_db_path) as store:
+        return store.previous_dev_activity(
+            [repo for project in projects for repo in project.github_repos],
+            window_end=window_end,
+            window_days=settings.dev_activity_lookback_days,
+            tolerance=timedelta(days=settings.dev_activity_change_tolerance_days),
+        )
+
+
+@contextmanager
+def timed_phase(name: str, metrics: RequestMetrics | None = None) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        if metrics is not None:
+            metrics.record_phase(name, seconds)
+        logger.info("phase_completed", phase=name, seconds=round(seconds, 4))
+
+
+async def run() -> int:
+    logger.info("crypto_auto_started", timestamp=datetime.now(timezone.utc).isoformat())
+
+    try:
+        projects = load_crypto_projects()
+        logger.info("projects_loaded", count=len(projects))
+        # A replayed run never reaches GitHub, so it needs no token
+        if not settings.github_token and settings.http_cassette_mode != "replay":
+            raise ConfigurationError("GITHUB_TOKEN is not set")
+        cassette = open_cassette()
+    except ConfigurationError as e:
+        logger.error("configuration_error", error=str(e))
+        print(f"❌ Configuration error: {e}")
+        return 1
+
+    try:
+        # One connection pool for every API client in the run
+        async with create_http_client() as http_client:
+            return await analyze_all(projects, cassette, http_client)
+    finally:
+        if cassette is not None:
+            cassette.close()
+
+
+def open_cassette() -> Cassette | None:
+    if settings.http_cassette_mode == "off":
+        return None
+
+    try:
+        cassette = Cassette(
+            settings.http_cassette_path,
+            settings.http_cassette_mode,
+            simulate_latency=settings.http_cassette_simulate_latency,
+        )
+    except FileNotFoundError as e:
+        raise ConfigurationError(str(e)) from e
+
+    logger.info("cassette_opened", mode=cassette.mode, path=str(cassette.path))
+    return cassette
+
+
+def build_client_options(
+    cassette: Cassette | None = None,
+    metrics: RequestMetrics | None = None,
+    http_client: httpx.AsyncClient | None = None,
+) -> dict:
+    cache = (
+        ResponseCache(settings.http_cache_dir, max_bytes=settings.http_cache_max_bytes)
+        # Cache hits would hide requests from a recording and shadow a replay
+        if settings.http_cache_enabled and cassette is None
+        else None
+    )
+
+    scheduler = RequestScheduler(
+        settings.max_concurrent_requests,
+        settings.max_concurrent_requests_per_host,
+        settings.host_concurrency_limits,
+    )
+
+    rate_limiter = (
+        RateLimiter(reserve=settings.rate_limit_reserve, max_wait=settings.rate_limit_max_wait)
+        if settings.rate_limit_enabled
+        else None
+    )
+    circuit_breaker = (
+        CircuitBreaker(
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            reset_timeout=settings.circuit_breaker_reset_timeout,
+        )
+        if settings.circuit_breaker_enabled
+        else None
+    )
+    return {
+        "cache": cache,
+        "scheduler": scheduler,
+        "rate_limiter": rate_limiter,
+        "cassette": cassette,
+        "metrics": metrics,
+        "http_client": http_client,
+        "circuit_breaker": circuit_breaker,
+    }
+
+
+@contextmanager
+def stream_results(total: int) -> Iterator[Callable[[ProjectAnalysis], None] | None]:
+    # Each project is shown and appended to the NDJSON file the moment it is analyzed,
+    # instead of after the whole universe has finished
+    if not settings.stream_output_enabled:
+        yield None
+        return
+
+    with (
+        LiveAnalysisTable(total, max_rows=settings.stream_output_max_rows) as table,
+        AnalysisStreamWriter() as writer,
+    ):
+
+        def emit(analysis: ProjectAnalysis) -> None:
+            table.add(analysis)
+            writer.write(analysis)
+
+        yield emit
+
+
+def _emit_when_done(task: asyncio.Task, emit: Callable[[ProjectAnalysis], None]) -> None:
+    if task.cancelled() or task.exception() is not None:
+        return
+    if (analysis := task.result()) is not None:
+        emit(analysis)
+
+
+async def analyze_all(
+    projects, cassette: Cassette | None, http_client: httpx.AsyncClient | None = None
+) -> int:
+    metrics = RequestMetrics() if settings.metrics_enabled else None
+    try:
+        return await _analyze_all(projects, cassette, http_client, metrics)
+    finally:
+        # Failed and partial runs are the ones whose request metrics matter most
+        if metrics is not None:
+            try:
+                write_metrics(metrics, settings.metrics_dir)
+            except OSError as e:
+                logger.error("metrics_write_failed", error=str(e))
+
+
+async def _analyze_all(
+    projects,
+    cassette: Cassette | None,
+    http_client: httpx.AsyncClient | None,
+    metrics: RequestMetrics | None,
+) -> int:
+    window_end = activity_window_end(cassette.recorded_at if cassette is not None else None)
+    # Past the deadline, unfinished work is cancelled and reported from the last snapshot
+    deadline = (
+        asyncio.get_running_loop().time() + settings.run_deadline
+        if settings.run_deadline > 0
+        else None
+    )
+    with timed_phase("load_history", metrics):
+        previous_activity = load_previous_activity(projects, window_end)
+
+    client_options = build_client_options(cassette, metrics, http_client)
+
+    with stream_results(len(projects)) as emit:
+        async with (
+            DeFiLlamaClient(**client_options) as defillama_client,
+            GitHubClient(**client_options) as github_client,
+        ):
+            tasks: list[asyncio.Task] = []
+            try:
+                async with asyncio.timeout_at(deadline):
+                    with timed_phase("prefetch", metrics):
+                        _, dev_activity = await asyncio.gather(
+                            load_protocol_index(defillama_client),
+                            fetch_dev_activity(github_client, projects),
+                        )
+
+                    with timed_phase("analyze", metrics):
+                        tasks = [
+                            asyncio.create_task(
+                                analyze_project(
+                                    project,
+                                    defillama_client,
+                                    github_client,
+                                    dev_activity,
+                                    previous_activity,
+                                )
+                            )
+                            for project in projects
+                        ]
+                        if emit is not None:
+                            for task in tasks:
+                                task.add_done_callback(partial(_emit_when_done, emit=emit))
+                        await asyncio.gather(*tasks)
+            except TimeoutError:
+                logger.warning(
+                    "run_deadline_reached",
+                    deadline=settings.run_deadline,
+                    finished=sum(task.done() and not task.cancelled() for task in tasks),
+                    total=len(projects),
+                )
+
+        results = [
+            task.result() if task.done() and not task.cancelled() else None for task in tasks
+        ] or [None] * len(projects)
+        # Projects cut off by the deadline and projects whose fetch failed are both
+        # reported from their last snapshot
+        missing = [project for project, result in zip(projects, results) if result is None]
+        fresh_projects = [r for r in results if r is not None]
+        stale_projects = load_stale_analyses(missing)
+        if emit is not None:
+            for analysis in stale_projects:
+                emit(analysis)
+        analyzed_projects = fresh_projects + stale_projects
+
+    if not analyzed_projects:
+        logger.error("no_projects_analyzed")
+        print("❌ Failed to analyze any projects")
+        return 1
+
+    if len(analyzed_projects) < len(projects):
+        logger.warning(
+            "partial_analysis",
+            analyzed=len(analyzed_projects),
+            total=len(projects),
+        )
+
+    with timed_phase("report", metrics):
+        if emit is None:
+            print_portfolio_analysis(analyzed_projects)
+        print_summary_stats(analyzed_projects)
+
+        current_holdings = {p.project.ticker: 0.0 for p in analyzed_projects}
+        dca_amount = 1000.0
+
+        rebalancer = PortfolioRebalancer(current_holdings, dca_amount)
+        recommendations_raw = rebalancer.calculate_purchase_recommendations(analyzed_projects)
+        recommendations = PortfolioRebalancer.format_recommendations(
+            recommendations_raw, analyzed_projects
+        )
+
+        print_rebalance_recommendations(recommendations)
+
+        output_path = write_analysis_json(analyzed_projects, recommendations)
+        print(f"📊 Analysis saved to: {output_path}")
+
+    # Stale rows are never written back, so history only holds values that were fetched
+    with timed_phase("persist", metrics):
+        # The snapshot is written first so a failing history sync can never cost it
+        if settings.snapshot_store_enabled and fresh_projects:
+            with SnapshotStore(settings.snapshot_db_path) as store:
+                store.write_snapshot(fresh_projects)
+                # A failed commit fetch raises and leaves its project stale, so these are all
+                # fetched counts; a 0 here is a quiet repo, never an outage
+                store.record_dev_activity(
+                    {repo: n for p in fresh_projects for repo, n in p.repo_commits.items()},
+                    window_end=window_end,
+                    window_days=settings.dev_activity_lookback_days,
+                )
+
+        if settings.price_history_enabled:
+            try:
+                async with asyncio.timeout_at(deadline):
+                    await update_price_history(
+                        client_options, defillama_client.protocol_index, projects, fresh_projects
+                    )
+            except TimeoutError:
+                logger.warning("price_history_skipped", reason="run_deadline_reached")
+            except Exception as e:
+                logger.error("price_history_failed", error=str(e), exc_info=True)
+
+    logger.info("crypto_auto_completed", projects_analyzed=len(analyzed_projects))
+    return 0
@@ -0,0 +1,228 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+import structlog
+from crypto_auto.api.defillama import DeFiLlamaClient
+from crypto_auto.api.github_api import GitHubClient, activity_window_end
+from crypto_auto.api.transport import create_http_client
+from crypto_auto.commands.run import (
+    build_analysis,
+    build_client_options,
+    fetch_dev_activity,
+    load_previous_activity,
+    load_protocol_index,
+)
+from crypto_auto.config.loader import ConfigurationError, load_crypto_projects
+from crypto_auto.config.settings import settings
+from crypto_auto.models.analysis import ProjectAnalysis
+from crypto_auto.models.crypto import CryptoProject
+from crypto_auto.models.market_data import MarketData
+
+logger = structlog.get_logger()
+
+
+class PortfolioDaemon:
+    # Keeps the parsed config, both API clients and the latest results in memory; market data
+    # and dev activity are refreshed on their own schedules and reads never touch the network
+    def __init__(
+        self,
+        projects: list[CryptoProject],
+        defillama_client: DeFiLlamaClient,
+        github_client: GitHubClient,
+    ):
+        self.projects = projects
+        self.defillama_client = defillama_client
+        self.github_client = github_client
+        self.market_data: dict[str, MarketData] = {}
+        self.repo_commits: dict[str, int] = {}
+        self.previous_activity: dict[str, int] = {}
+        self.analyses: dict[str, ProjectAnalysis] = {}
+        self.refreshed_at: dict[str, str] = {}
+        self._analysis_json = b"[]"
+
+    async def refresh_market_data(self) -> None:
+        if not await load_protocol_index(self.defillama_client):
+            # The previous cycle's index would be served as fresh prices; ask per protocol
+            self.defillama_client.protocol_index = None
+        results = await asyncio.gather(
+            *(self.defillama_client.get_market_data(p.defillama_slug) for p in self.projects),
+            return_exceptions=True,
+        )
+
+        failed = False
+        for project, result in zip(self.projects, results):
+            if isinstance(result, Exception):
+                # The last good value is kept until a refresh succeeds
+                logger.error("market_refresh_failed", ticker=project.ticker, error=str(result))
+                failed = True
+            else:
+                self.market_data[project.ticker] = result
+
+        if not failed:
+            self._mark_refreshed("market_data")
+
+    async def refresh_dev_activity(self) -> None:
+        repos = [repo for project in self.projects for repo in project.github_repos]
+        self.previous_activity = load_previous_activity(self.projects, activity_window_end())
+
+        commits = await fetch_dev_activity(self.github_client, self.projects) or {}
+        missing = [repo for repo in dict.fromkeys(repos) if repo not in commits]
+        fetched = await asyncio.gather(
+            *(
+                self.github_client.get_commit_activity(
+                    repo,
+                    days=settings.dev_activity_lookback_days,
+                    exact=settings.github_exact_commit_count,
+                )
+                for repo in missing
+            ),
+            return_exceptions=True,
+        )
+        for repo, result in zip(missing, fetched):
+            if isinstance(result, Exception):
+                logger.error("dev_activity_refresh_failed", repo=repo, error=str(result))
+            else:
+                commits[repo] = result
+
+        self.repo_commits.update(commits)
+        self._mark_refreshed("dev_activity")
+
+    def rebuild(self) -> None:
+        analyses = {}
+        for project in self.projects:
+            market_data = self.market_data.get(project.ticker)
+            if market_data is None:
+                continue
+            repo_commits = {
+                repo: self.repo_commits[repo]
+                for repo in project.github_repos
+                if repo in self.repo_commits
+            }
+            analyses[project.ticker] = build_analysis(
+                project, market_data, repo_commits, self.previous_activity
+            )
+
+        self.analyses = analyses
+        # Serialized once per refresh, so every read is a plain copy of ready bytes
+        self._analysis_json = json.dumps(
+            [analysis.model_dump(mode="json") for analysis in analyses.values()]
+        ).encode("utf-8")
+
+    async def run(self, market_interval: float, dev_activity_interval: float) -> None:
+        # Both sources load once before the first rebuild, so no project is ever served
+        # with market data but no commit counts
+        await asyncio.gather(
+            self._refresh(self.refresh_market_data), self._refresh(self.refresh_dev_activity)
+        )
+        self.rebuild()
+
+        await asyncio.gather(
+            self._every(market_interval, self.refresh_market_data),
+            self._every(dev_activity_interval, self.refresh_dev_activity),
+        )
+
+    async def _every(self, interval: float, refresh) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            if await self._refresh(refresh):
+                self.rebuild()
+
+    async def _refresh(self, refresh) -> bool:
+        try:
+            await refresh()
+        except Exception as e:
+            logger.error("refresh_failed", refresh=refresh.__name__, error=str(e))
+            return False
+        return True
+
+    def _mark_refreshed(self, name: str) -> None:
+        self.refreshed_at[name] = datetime.now(timezone.utc).isoformat()
+        logger.info("daemon_refreshed", data=name, projects=len(self.market_data))
+
+    async def handle_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+
+            parts = request_line.decode("latin-1").split()
+            path = parts[1] if len(parts) >= 2 and parts[0] == "GET" else None
+            if path == "/analysis":
+                status, body = "200 OK", self._analysis_json
+            elif path == "/health":
+                status = "200 OK"
+                body = json.dumps(
+                    {"projects": len(self.analyses), "refreshed_at": self.refreshed_at}
+                ).encode("utf-8")
+            else:
+                status, body = "404 Not Found", b'{"error": "not found"}'
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+                + body
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(
+    config_path: str,
+    host: str | None = None,
+    port: int | None = None,
+    market_interval: float | None = None,
+    dev_activity_interval: float | None = None,
+) -> int:
+    if market_interval is None:
+        market_interval = settings.serve_market_interval
+    if dev_activity_interval is None:
+        dev_activity_interval = settings.serve_dev_activity_interval
+
+    try:
+        projects = load_crypto_projects(config_path)
+        if not settings.github_token:
+            raise ConfigurationError("GITHUB_TOKEN is not set")
+        for name, interval in (
+            ("market", market_interval),
+            ("dev activity", dev_activity_interval),
+        ):
+            if not interval > 0:
+                raise ConfigurationError(f"The {name} refresh interval must be positive")
+    except ConfigurationError as e:
+        logger.error("configuration_error", error=str(e))
+        print(f"❌ Configuration error: {e}")
+        return 1
+
+    async with create_http_client() as http_client:
+        client_options = build_client_options(http_client=http_client)
+        async with (
+            DeFiLlamaClient(**client_options) as defillama_client,
+            GitHubClient(**client_options) as github_client,
+        ):
+            # Cached responses must not outlive a refresh, or the refresh would change nothing
+            defillama_client.cache_ttl = min(defillama_client.cache_ttl, market_interval)
+            github_client.cache_ttl = min(github_client.cache_ttl, dev_activity_interval)
+
+            daemon = PortfolioDaemon(projects, defillama_client, github_client)
+            server = await asyncio.start_server(
+                daemon.handle_request,
+                host or settings.serve_host,
+                port if port is not None else settings.serve_port,
+            )
+            address = server.sockets[0].getsockname()
+            logger.info(
+                "daemon_started",
+                address=f"http://{address[0]}:{address[1]}",
+                projects=len(projects),
+                market_interval=market_interval,
+                dev_activity_interval=dev_activity_interval,
+            )
+            print(f"📡 Serving analysis at http://{address[0]}:{address[1]}/analysis")
+
+            async with server:
+                await daemon.run(market_interval, dev_activity_interval)
+
+    return 0
@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+import structlog
+from crypto_auto.analysis.sweep import run_sweep
+from crypto_auto.commands.backtest import load_weekly_series
+from crypto_auto.config.loader import ConfigurationError, load_crypto_projects, load_sweep_grid
+from crypto_auto.outputs.console import print_sweep_results
+
+logger = structlog.get_logger()
+
+
+def sweep(
+    grid_path: str,
+    config_path: str,
+    dca_amount: float,
+    db_path: str | None = None,
+    workers: int | None = None,
+    rank_by: str = "total_return",
+    top: int = 10,
+    output_path: str | None = None,
+) -> int:
+    try:
+        projects = load_crypto_projects(config_path)
+        grid = load_sweep_grid(grid_path)
+    except ConfigurationError as e:
+        logger.error("configuration_error", error=str(e))
+        print(f"❌ Configuration error: {e}")
+        return 1
+
+    tickers = [p.ticker for p in projects]
+    weeks, series = load_weekly_series(tickers, ("price", "mcap_fdv_ratio"), db_path)
+
+    if not weeks:
+        print("❌ No price history available - run the analysis first to collect snapshots")
+        return 1
+
+    try:
+        results = run_sweep(
+            series["price"],
+            series["mcap_fdv_ratio"],
+            grid,
+            tickers,
+            {p.ticker: p.target_allocation for p in projects},
+            dca_amount,
+            workers=workers,
+            rank_by=rank_by,
+        )
+    except ValueError as e:
+        logger.error("sweep_invalid", error=str(e))
+        print(f"❌ Invalid sweep: {e}")
+        return 1
+
+    print_sweep_results(results, rank_by, top)
+
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump([r.model_dump() for r in results], f, indent=2)
+        logger.info("sweep_results_written", path=output_path, scenarios=len(results))
+        print(f"📊 Sweep results saved to: {Path(output_path)}")
+
+    return 0
@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 from crypto_auto.models.crypto import CryptoProject
+from crypto_auto.models.sweep import SweepGrid
 
 
 class ConfigurationError(Exception):
@@ -38,6 +39,24 @@ def load_crypto_projects(config_path: str | Path = "cryptos.json") -> list[Crypt
     return projects
 
 
+def load_sweep_grid(grid_path: str | Path) -> SweepGrid:
+    grid_file = Path(grid_path)
+
+    if not grid_file.exists():
+        raise ConfigurationError(f"Sweep grid file not found: {grid_path}")
+
+    try:
+        with open(grid_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ConfigurationError(f"Invalid JSON in {grid_path}: {e}")
+
+    try:
+        return SweepGrid(**data)
+    except Exception as e:
+        raise ConfigurationError(f"Failed to parse sweep grid from {grid_path}: {e}")
+
+
 def _validate_allocations(projects: list[CryptoProject]) -> None:
     total_allocation = sum(p.target_allocation for p in projects)
 
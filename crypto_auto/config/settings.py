@@ -1,15 +1,66 @@
+from functools import lru_cache
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
-    github_token: str
+    github_token: str | None = None
     fdv_ratio_warning_threshold: float = 0.4
     fdv_ratio_target_min: float = 0.45
     fdv_ratio_target_max: float = 0.50
     dev_activity_lookback_days: int = 30
+    dev_activity_change_tolerance_days: float = 3.5
+    github_exact_commit_count: bool = True
+    defillama_bulk_enabled: bool = True
+    github_graphql_enabled: bool = True
+    github_graphql_batch_size: int = 50
+    github_incremental_sync: bool = False
+    github_sync_max_pages: int = 20
+    snapshot_store_enabled: bool = True
+    snapshot_db_path: str = "data/snapshots.db"
+    price_history_enabled: bool = False
+    price_history_dir: str = "data/history"
+    price_history_backfill_days: int = 365
+    serve_host: str = "127.0.0.1"
+    serve_port: int = 8787
+    serve_market_interval: float = 900
+    serve_dev_activity_interval: float = 3600
+    sweep_workers: int = 0
+    sweep_chunk_size: int = 32
     log_level: str = "INFO"
+    analysis_json_compact: bool = False
+    analysis_json_gzip: bool = False
+    stream_output_enabled: bool = True
+    stream_output_max_rows: int = 50
+    metrics_enabled: bool = True
+    metrics_dir: str = "data/metrics"
     http_timeout: int = 30
+    http2_enabled: bool = True
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
     max_retries: int = 3
+    max_concurrent_requests: int = 32
+    max_concurrent_requests_per_host: int = 8
+    host_concurrency_limits: dict[str, int] = {}
+    circuit_breaker_enabled: bool = True
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_reset_timeout: float = 30.0
+    run_deadline: float = 0
+    rate_limit_enabled: bool = True
+    rate_limit_reserve: int = 10
+    rate_limit_max_wait: float = 60.0
+    http_cache_enabled: bool = True
+    http_cache_dir: str = ".cache/http"
+    http_cache_max_bytes: int = 200_000_000
+    http_cassette_mode: Literal["off", "record", "replay"] = "off"
+    http_cassette_path: str = "data/cassette.db"
+    http_cassette_simulate_latency: bool = False
+    defillama_base_url: str = "https://api.llama.fi"
+    defillama_coins_base_url: str = "https://coins.llama.fi"
+    github_base_url: str = "https://api.github.com"
+    defillama_cache_ttl: int = 3600
+    github_cache_ttl: int = 3600
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -19,4 +70,22 @@ class Settings(BaseSettings):
     )
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
+
+
+class _LazySettings:
+    # Reading .env and the environment is deferred until a setting is first used,
+    # so importing a module that depends on settings has no I/O side effects
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(get_settings(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(get_settings(), name)
+
+
+settings: Settings = _LazySettings()  # type: ignore[assignment]
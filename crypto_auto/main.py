@@ -1,136 +1,137 @@
-import asyncio
+import argparse
 import sys
-from datetime import datetime, timezone
-import structlog
-from crypto_auto.config.loader import load_crypto_projects, ConfigurationError
-from crypto_auto.config.settings import settings
-from crypto_auto.api.defillama import DeFiLlamaClient
-from crypto_auto.api.github_api import GitHubClient
-from crypto_auto.models.analysis import ProjectAnalysis
-from crypto_auto.analysis.fdv_analyzer import FDVAnalyzer
-from crypto_auto.analysis.rebalancer import PortfolioRebalancer
-from crypto_auto.outputs.console import (
-    print_portfolio_analysis,
-    print_rebalance_recommendations,
-    print_summary_stats,
-)
-from crypto_auto.outputs.json_writer import write_analysis_json
-
-structlog.configure(
-    processors=[
-        structlog.processors.add_log_level,
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.JSONRenderer(),
-    ],
-    logger_factory=structlog.PrintLoggerFactory(),
-    cache_logger_on_first_use=True,
-)
-
-logger = structlog.get_logger()
-
-
-async def analyze_project(
-    project_config, defillama_client: DeFiLlamaClient, github_client: GitHubClient
-) -> ProjectAnalysis | None:
-    logger.info("analyzing_project", ticker=project_config.ticker)
 
-    try:
-        market_data = await defillama_client.get_market_data(project_config.defillama_slug)
+# Only argparse is imported eagerly; each command pulls in its own dependencies
+# (httpx, numpy, rich, pydantic-settings) when it runs, so `--help` stays instant
+
+
+def configure_logging(level: str | None = None):
+    import atexit
+    import logging
+    import structlog
+    from crypto_auto.config.settings import settings
+    from crypto_auto.outputs.log_sink import BackgroundLogSink, BackgroundLoggerFactory
+
+    level_name = (level or settings.log_level).upper()
+    level_number = logging.getLevelNamesMapping().get(level_name, logging.INFO)
+
+    sink = BackgroundLogSink()
+    atexit.register(sink.close)
+
+    structlog.configure(
+        processors=[
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.JSONRenderer(),
+        ],
+        # Calls below the level return before any processor runs, so they cost one lookup
+        wrapper_class=structlog.make_filtering_bound_logger(level_number),
+        logger_factory=BackgroundLoggerFactory(sink),
+        cache_logger_on_first_use=True,
+    )
+    logger = structlog.get_logger()
+    if level_name not in logging.getLevelNamesMapping():
+        logger.warning("unknown_log_level", log_level=level_name, using="INFO")
+    return logger
 
-        total_commits = 0
-        for repo in project_config.github_repos:
-            commits = await github_client.get_commit_activity(
-                repo, days=settings.dev_activity_lookback_days
-            )
-            total_commits += commits
 
-        analysis = ProjectAnalysis(
-            project=project_config,
-            market_data=market_data,
-            dev_commits_30d=total_commits,
-            health_status="OK",
-        )
+async def main() -> int:
+    from crypto_auto.commands.run import run
 
-        fdv_health = FDVAnalyzer.analyze_fdv_health(market_data)
-        analysis.fdv_health = fdv_health
+    return await run()
 
-        analysis.calculate_health(settings.fdv_ratio_warning_threshold)
 
-        logger.info(
-            "project_analyzed",
-            ticker=project_config.ticker,
-            health_status=analysis.health_status,
-            fdv_ratio=market_data.mcap_fdv_ratio,
-            commits=total_commits,
-        )
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="crypto_auto", description="Crypto portfolio analysis and DCA rebalancing"
+    )
+    subparsers = parser.add_subparsers(dest="command")
 
-        return analysis
-
-    except Exception as e:
-        logger.error(
-            "project_analysis_failed",
-            ticker=project_config.ticker,
-            error=str(e),
-            exc_info=True,
-        )
-        return None
+    subparsers.add_parser("run", help="Fetch data, analyze projects and write results (default)")
 
+    backtest_parser = subparsers.add_parser(
+        "backtest", help="Replay the DCA rebalancer over stored weekly price history"
+    )
+    backtest_parser.add_argument("--config", default="cryptos.json")
+    backtest_parser.add_argument("--dca-amount", type=float, default=1000.0)
+    backtest_parser.add_argument("--db", default=None, help="Snapshot database path")
 
-async def main():
-    logger.info("crypto_auto_started", timestamp=datetime.now(timezone.utc).isoformat())
+    sweep_parser = subparsers.add_parser(
+        "sweep", help="Backtest a grid of FDV thresholds and allocations in parallel"
+    )
+    sweep_parser.add_argument("--grid", required=True, help="JSON file with parameter lists")
+    sweep_parser.add_argument("--config", default="cryptos.json")
+    sweep_parser.add_argument("--dca-amount", type=float, default=1000.0)
+    sweep_parser.add_argument("--db", default=None, help="Snapshot database path")
+    sweep_parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    sweep_parser.add_argument(
+        "--rank-by",
+        default="total_return",
+        choices=("total_return", "healthy_share", "mean_drift", "final_drift", "turnover"),
+    )
+    sweep_parser.add_argument("--top", type=int, default=10)
+    sweep_parser.add_argument("--output", default=None, help="Write all results as JSON")
 
-    try:
-        projects = load_crypto_projects()
-        logger.info("projects_loaded", count=len(projects))
-    except ConfigurationError as e:
-        logger.error("configuration_error", error=str(e))
-        print(f"❌ Configuration error: {e}")
-        return 1
-
-    async with DeFiLlamaClient() as defillama_client, GitHubClient() as github_client:
-        tasks = [
-            analyze_project(project, defillama_client, github_client) for project in projects
-        ]
-        results = await asyncio.gather(*tasks)
-
-    analyzed_projects = [r for r in results if r is not None]
-
-    if not analyzed_projects:
-        logger.error("no_projects_analyzed")
-        print("❌ Failed to analyze any projects")
-        return 1
-
-    if len(analyzed_projects) < len(projects):
-        logger.warning(
-            "partial_analysis",
-            analyzed=len(analyzed_projects),
-            total=len(projects),
-        )
-
-    print_portfolio_analysis(analyzed_projects)
-    print_summary_stats(analyzed_projects)
-
-    current_holdings = {p.project.ticker: 0.0 for p in analyzed_projects}
-    dca_amount = 1000.0
-
-    rebalancer = PortfolioRebalancer(current_holdings, dca_amount)
-    recommendations_raw = rebalancer.calculate_purchase_recommendations(analyzed_projects)
-    recommendations = PortfolioRebalancer.format_recommendations(
-        recommendations_raw, analyzed_projects
+    serve_parser = subparsers.add_parser(
+        "serve", help="Keep clients warm, refresh on a schedule and serve the latest analysis"
+    )
+    serve_parser.add_argument("--config", default="cryptos.json")
+    serve_parser.add_argument("--host", default=None)
+    serve_parser.add_argument("--port", type=int, default=None)
+    serve_parser.add_argument(
+        "--market-interval", type=float, default=None, help="Seconds between market refreshes"
+    )
+    serve_parser.add_argument(
+        "--dev-interval", type=float, default=None, help="Seconds between dev activity refreshes"
     )
 
-    print_rebalance_recommendations(recommendations)
+    return parser
+
+
+def run_command(args: argparse.Namespace) -> int:
+    match args.command:
+        case "backtest":
+            from crypto_auto.commands.backtest import backtest
+
+            return backtest(args.config, args.dca_amount, args.db)
+        case "sweep":
+            from crypto_auto.commands.sweep import sweep
+
+            return sweep(
+                args.grid,
+                args.config,
+                args.dca_amount,
+                db_path=args.db,
+                workers=args.workers,
+                rank_by=args.rank_by,
+                top=args.top,
+                output_path=args.output,
+            )
+        case "serve":
+            import asyncio
+            from crypto_auto.commands.serve import serve
+
+            return asyncio.run(
+                serve(
+                    args.config,
+                    host=args.host,
+                    port=args.port,
+                    market_interval=args.market_interval,
+                    dev_activity_interval=args.dev_interval,
+                )
+            )
+        case _:
+            import asyncio
 
-    output_path = write_analysis_json(analyzed_projects, recommendations)
-    print(f"📊 Analysis saved to: {output_path}")
+            return asyncio.run(main())
 
-    logger.info("crypto_auto_completed", projects_analyzed=len(analyzed_projects))
-    return 0
 
+def cli(argv: list[str] | None = None):
+    args = build_parser().parse_args(argv)
+    logger = configure_logging()
 
-def cli():
     try:
-        exit_code = asyncio.run(main())
+        exit_code = run_command(args)
         sys.exit(exit_code)
     except KeyboardInterrupt:
         logger.info("interrupted_by_user")
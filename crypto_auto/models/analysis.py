@@ -5,9 +5,9 @@ from crypto_auto.models.market_data import MarketData
 
 
 class FDVHealthStatus(BaseModel):
-    status: Literal["WARNING", "CAUTION", "HEALTHY", "EXCELLENT"]
+    status: Literal["WARNING", "CAUTION", "HEALTHY", "EXCELLENT", "UNKNOWN"]
     message: str
-    severity: Literal["HIGH", "MEDIUM", "LOW"]
+    severity: Literal["HIGH", "MEDIUM", "LOW", "UNKNOWN"]
     ratio: float
 
 
@@ -18,8 +18,14 @@ class ProjectAnalysis(BaseModel):
     dev_activity_change: float | None = Field(
         None, description="Percentage change in dev activity from previous period"
     )
+    repo_commits: dict[str, int] = Field(
+        default_factory=dict, description="Commits per GitHub repo in the lookback window"
+    )
     health_status: Literal["OK", "FDV_WARNING", "LOW_ACTIVITY"]
     fdv_health: FDVHealthStatus | None = None
+    stale: bool = Field(
+        False, description="Carried over from the last stored snapshot instead of fetched"
+    )
 
     def calculate_health(self, fdv_warning_threshold: float, min_commits: int = 10) -> None:
         if self.market_data.mcap_fdv_ratio < fdv_warning_threshold:
@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+
+
+# Rows read back from our own SQLite store are already validated, so these are plain
+# slotted records rather than pydantic models; history replays build them by the thousand
+@dataclass(slots=True, frozen=True)
+class SnapshotRecord:
+    timestamp: str
+    ticker: str
+    price: float
+    market_cap: float
+    fdv: float
+    mcap_fdv_ratio: float
+    dev_commits_30d: int
+    dev_activity_change: float | None
+    health_status: str
+    fdv_status: str | None
+
+
+@dataclass(slots=True, frozen=True)
+class CommitRecord:
+    sha: str
+    committed_at: str
@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field, field_validator
+
+
+class SweepGrid(BaseModel):
+    fdv_ratio_warning_threshold: list[float] = Field(
+        default_factory=list, description="Warning thresholds to try (defaults to settings)"
+    )
+    fdv_ratio_target_min: list[float] = Field(
+        default_factory=list, description="Target range lower bounds (defaults to settings)"
+    )
+    fdv_ratio_target_max: list[float] = Field(
+        default_factory=list, description="Target range upper bounds (defaults to settings)"
+    )
+    allocations: list[dict[str, float]] = Field(
+        default_factory=list,
+        description="Allocation variants by ticker (defaults to cryptos.json targets)",
+    )
+
+    @field_validator("allocations")
+    @classmethod
+    def validate_allocations(cls, v: list[dict[str, float]]) -> list[dict[str, float]]:
+        normalized = []
+        for allocation in v:
+            if any(weight < 0 for weight in allocation.values()):
+                raise ValueError(f"Negative weight in allocation: {allocation}")
+            total = sum(allocation.values())
+            if not (0.99 <= total <= 1.01):
+                raise ValueError(f"Allocation sums to {total:.2f}, expected 1.0: {allocation}")
+            normalized.append({ticker.upper(): w for ticker, w in allocation.items()})
+        return normalized
+
+
+class SweepResult(BaseModel):
+    warning_threshold: float
+    target_min: float
+    target_max: float
+    allocation: dict[str, float]
+    final_value: float
+    total_return: float
+    mean_drift: float
+    final_drift: float
+    turnover: float
+    healthy_share: float = Field(
+        ..., description="Share of final holdings whose MCap/FDV is at or above target_min"
+    )
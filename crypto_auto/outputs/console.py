@@ -1,4 +1,7 @@
+import time
+from collections import deque
 from rich.console import Console
+from rich.live import Live
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
@@ -8,37 +11,104 @@ console = Console()
 
 
 def print_portfolio_analysis(projects: list[ProjectAnalysis]) -> None:
+    _print_analysis_header()
+
+    table = _analysis_table()
+    for project in projects:
+        _add_analysis_row(table, project)
+
+    console.print(table)
+    if any(project.stale for project in projects):
+        console.print(_STALE_NOTE)
+    console.print()
+
+
+class LiveAnalysisTable:
+    # Shows each project as soon as its analysis finishes. Only the most recent rows are
+    # kept on screen, so rendering cost and memory stay flat however large the universe is
+    def __init__(self, total: int, max_rows: int = 50, min_refresh_interval: float = 0.1):
+        self.total = total
+        self.min_refresh_interval = min_refresh_interval
+        self.completed = 0
+        self.stale = False
+        self._rows: deque[ProjectAnalysis] = deque(maxlen=max_rows)
+        self._live = Live(self._render(), console=console, auto_refresh=False)
+        self._last_refresh = 0.0
+
+    def add(self, project: ProjectAnalysis) -> None:
+        self._rows.append(project)
+        self.completed += 1
+        self.stale |= project.stale
+
+        now = time.monotonic()
+        if now - self._last_refresh >= self.min_refresh_interval:
+            self._live.update(self._render(), refresh=True)
+            self._last_refresh = now
+
+    def _render(self) -> Table:
+        table = _analysis_table()
+        table.caption = f"{self.completed}/{self.total} projects analyzed"
+        if self.completed > len(self._rows):
+            table.caption += f" (latest {len(self._rows)} shown)"
+        for project in self._rows:
+            _add_analysis_row(table, project)
+        return table
+
+    def __enter__(self):
+        _print_analysis_header()
+        self._live.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._live.update(self._render(), refresh=True)
+        self._live.stop()
+        if self.stale:
+            console.print(_STALE_NOTE)
+        console.print()
+
+
+_STALE_NOTE = "[dim]* stale: last stored snapshot, not refreshed in this run[/dim]"
+
+
+def _print_analysis_header() -> None:
     console.print()
     console.print(Panel.fit("[bold cyan]Crypto Portfolio Analysis[/bold cyan]", border_style="cyan"))
     console.print()
 
+
+def _analysis_table() -> Table:
     table = Table(show_header=True, header_style="bold magenta")
     table.add_column("Ticker", style="cyan", width=8)
     table.add_column("Price ($)", justify="right", style="white")
     table.add_column("MCap/FDV", justify="right")
     table.add_column("Dev Activity", justify="right")
     table.add_column("Health", justify="center")
+    return table
 
-    for project in projects:
-        price_str = f"${project.market_data.price:,.2f}"
-        ratio_str = f"{project.market_data.mcap_fdv_ratio:.1%}"
 
-        ratio_color = _get_ratio_color(project.market_data.mcap_fdv_ratio)
-        ratio_text = f"[{ratio_color}]{ratio_str}[/{ratio_color}]"
+def _add_analysis_row(table: Table, project: ProjectAnalysis) -> None:
+    price_str = f"${project.market_data.price:,.2f}"
+    ratio_str = f"{project.market_data.mcap_fdv_ratio:.1%}"
 
-        commits_str = str(project.dev_commits_30d)
-        health_emoji = _get_health_emoji(project.health_status)
+    ratio_color = _get_ratio_color(project.market_data.mcap_fdv_ratio)
+    ratio_text = f"[{ratio_color}]{ratio_str}[/{ratio_color}]"
 
-        table.add_row(
-            project.project.ticker,
-            price_str,
-            ratio_text,
-            commits_str,
-            health_emoji,
-        )
+    commits_str = str(project.dev_commits_30d)
+    if project.dev_activity_change is not None:
+        commits_str += f" ({project.dev_activity_change:+.0f}%)"
+    health_emoji = _get_health_emoji(project.health_status)
 
-    console.print(table)
-    console.print()
+    ticker_str = (
+        f"[dim]{project.project.ticker}*[/dim]" if project.stale else project.project.ticker
+    )
+
+    table.add_row(
+        ticker_str,
+        price_str,
+        ratio_text,
+        commits_str,
+        health_emoji,
+    )
 
 
 def print_rebalance_recommendations(recommendations: list[dict]) -> None:
@@ -115,3 +185,68 @@ def _get_health_emoji(status: str) -> str:
             return "[yellow]⚠️  DEV[/yellow]"
         case _:
             return "[white]?[/white]"
+
+
+def print_backtest_result(tickers: list[str], weeks: list[str], result) -> None:
+    summary = result.summary()
+
+    console.print()
+    console.print(Panel.fit("[bold cyan]DCA Backtest[/bold cyan]", border_style="cyan"))
+    console.print()
+
+    stats = Text()
+    stats.append(f"  Period: {weeks[0]} → {weeks[-1]} ({len(weeks)} weeks)\n", style="white")
+    stats.append(f"  Invested: ${summary['invested']:,.2f}\n", style="white")
+    stats.append(f"  Final Value: ${summary['final_value']:,.2f}\n", style="white")
+    return_style = "green" if summary["total_return"] >= 0 else "red"
+    stats.append(f"  Total Return: {summary['total_return']:+.1%}\n", style=return_style)
+    stats.append(f"  Mean Drift: {summary['mean_drift']:.2%}\n", style="white")
+    stats.append(f"  Final Drift: {summary['final_drift']:.2%}\n", style="white")
+    stats.append(f"  Turnover: {summary['turnover']:.2f}x\n", style="white")
+    console.print(Panel(stats, border_style="blue", title="Backtest Summary"))
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Ticker", style="cyan", width=8)
+    table.add_column("Units", justify="right", style="yellow")
+
+    for ticker, units in zip(tickers, result.units[0]):
+        table.add_row(ticker, f"{units:.8f}")
+
+    console.print(table)
+    console.print()
+
+
+def print_sweep_results(results, rank_by: str, top: int = 10) -> None:
+    console.print()
+    console.print(Panel.fit("[bold cyan]Parameter Sweep[/bold cyan]", border_style="cyan"))
+    console.print()
+
+    table = Table(
+        show_header=True,
+        header_style="bold magenta",
+        title=f"Top {min(top, len(results))} of {len(results)} by {rank_by}",
+    )
+    table.add_column("#", justify="right", style="dim")
+    table.add_column("Warn", justify="right")
+    table.add_column("Target", justify="right")
+    table.add_column("Allocation", style="cyan")
+    table.add_column("Return", justify="right")
+    table.add_column("Mean Drift", justify="right")
+    table.add_column("Turnover", justify="right")
+    table.add_column("Healthy", justify="right")
+
+    for rank, r in enumerate(results[:top], start=1):
+        return_style = "green" if r.total_return >= 0 else "red"
+        table.add_row(
+            str(rank),
+            f"{r.warning_threshold:.2f}",
+            f"{r.target_min:.2f}-{r.target_max:.2f}",
+            " ".join(f"{t}:{w:.0%}" for t, w in r.allocation.items()),
+            f"[{return_style}]{r.total_return:+.1%}[/{return_style}]",
+            f"{r.mean_drift:.2%}",
+            f"{r.turnover:.2f}x",
+            f"{r.healthy_share:.0%}",
+        )
+
+    console.print(table)
+    console.print()
@@ -1,62 +1,154 @@
-import json
+import gzip
+import os
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
 import structlog
+from pydantic_core import to_json
+from crypto_auto.config.settings import settings
 from crypto_auto.models.analysis import ProjectAnalysis
 
+try:
+    import orjson
+except ImportError:  # pydantic_core's serializer is used instead
+    orjson = None
+
 logger = structlog.get_logger()
 
 
+def project_record(p: ProjectAnalysis) -> dict:
+    return {
+        "ticker": p.project.ticker,
+        "name": p.project.name,
+        "category": p.project.category,
+        "market_data": p.market_data.model_dump(exclude={"ticker"}),
+        "dev_commits_30d": p.dev_commits_30d,
+        "dev_activity_change": p.dev_activity_change,
+        "health_status": p.health_status,
+        "fdv_health": p.fdv_health.model_dump() if p.fdv_health else None,
+        "stale": p.stale,
+    }
+
+
+class AnalysisStreamWriter:
+    # Appends one JSON line per project as soon as it is analyzed, flushed each time, so
+    # partial results are on disk while the run is still going
+    def __init__(self, output_dir: str | Path = "."):
+        timestamp = datetime.now(timezone.utc)
+        self.path = Path(output_dir) / f"analysis_{timestamp.strftime('%Y-%m-%d')}.ndjson"
+        self.count = 0
+        self._file = None
+
+    def write(self, project: ProjectAnalysis) -> None:
+        self._file.write(_dumps(project_record(project)) + b"\n")
+        self._file.flush()
+        self.count += 1
+
+    def __enter__(self):
+        self._file = open(self.path, "wb")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._file.close()
+        logger.info("analysis_stream_written", path=str(self.path), projects=self.count)
+
+
 def write_analysis_json(
-    projects: list[ProjectAnalysis],
+    projects: Iterable[ProjectAnalysis],
     recommendations: list[dict],
     output_dir: str | Path = ".",
+    compact: bool | None = None,
+    compress: bool | None = None,
 ) -> Path:
+    # Records are serialized and written one at a time and the summary is accumulated on
+    # the way, so the document is never held in memory; a crash leaves the previous file
+    compact = settings.analysis_json_compact if compact is None else compact
+    compress = settings.analysis_json_gzip if compress is None else compress
+
     timestamp = datetime.now(timezone.utc)
-    filename = f"analysis_{timestamp.strftime('%Y-%m-%d')}.json"
+    filename = f"analysis_{timestamp.strftime('%Y-%m-%d')}.json{'.gz' if compress else ''}"
     output_path = Path(output_dir) / filename
 
-    data = {
-        "timestamp": timestamp.isoformat(),
-        "projects": [
-            {
-                "ticker": p.project.ticker,
-                "name": p.project.name,
-                "category": p.project.category,
-                "market_data": {
-                    "price": p.market_data.price,
-                    "market_cap": p.market_data.market_cap,
-                    "fdv": p.market_data.fdv,
-                    "mcap_fdv_ratio": p.market_data.mcap_fdv_ratio,
-                },
-                "dev_commits_30d": p.dev_commits_30d,
-                "health_status": p.health_status,
-                "fdv_health": {
-                    "status": p.fdv_health.status,
-                    "message": p.fdv_health.message,
-                    "severity": p.fdv_health.severity,
-                    "ratio": p.fdv_health.ratio,
-                }
-                if p.fdv_health
-                else None,
-            }
-            for p in projects
-        ],
-        "rebalance_recommendations": recommendations,
-        "summary": {
-            "total_market_cap": sum(p.market_data.market_cap for p in projects),
-            "avg_fdv_ratio": sum(p.market_data.mcap_fdv_ratio for p in projects) / len(projects)
-            if projects
-            else 0,
-            "total_commits": sum(p.dev_commits_30d for p in projects),
-            "fdv_warnings": len([p for p in projects if p.health_status == "FDV_WARNING"]),
-            "low_activity": len([p for p in projects if p.health_status == "LOW_ACTIVITY"]),
-        },
-    }
+    newline, indent = (b"", b"") if compact else (b"\n", b"  ")
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    def encode(obj, depth: int) -> bytes:
+        # Nested values are indented to their depth in the enclosing document
+        return _dumps(obj, indent=not compact).replace(b"\n", b"\n" + indent * depth)
+
+    def key(name: str) -> bytes:
+        return newline + indent + _dumps(name) + (b":" if compact else b": ")
+
+    summary = _Summary()
+    with _atomic_writer(output_path, compress) as f:
+        f.write(b"{" + key("timestamp") + _dumps(timestamp.isoformat()) + b",")
+        f.write(key("projects") + b"[")
+        for p in projects:
+            if summary.count:
+                f.write(b",")
+            f.write(newline + indent * 2 + encode(project_record(p), 2))
+            summary.add(p)
+        if summary.count:
+            f.write(newline + indent)
+        f.write(b"],")
+        f.write(key("rebalance_recommendations") + encode(recommendations, 1) + b",")
+        f.write(key("summary") + encode(summary.to_dict(), 1) + newline + b"}")
 
     logger.info("analysis_json_written", path=str(output_path), size=output_path.stat().st_size)
 
     return output_path
+
+
+class _Summary:
+    __slots__ = ("count", "total_market_cap", "fdv_ratio_sum", "total_commits", "statuses")
+
+    def __init__(self):
+        self.count = 0
+        self.total_market_cap = 0
+        self.fdv_ratio_sum = 0
+        self.total_commits = 0
+        self.statuses: Counter[str] = Counter()
+
+    def add(self, p: ProjectAnalysis) -> None:
+        self.count += 1
+        self.total_market_cap += p.market_data.market_cap
+        self.fdv_ratio_sum += p.market_data.mcap_fdv_ratio
+        self.total_commits += p.dev_commits_30d
+        self.statuses[p.health_status] += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "total_market_cap": self.total_market_cap,
+            "avg_fdv_ratio": self.fdv_ratio_sum / self.count if self.count else 0,
+            "total_commits": self.total_commits,
+            "fdv_warnings": self.statuses["FDV_WARNING"],
+            "low_activity": self.statuses["LOW_ACTIVITY"],
+        }
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return to_json(obj, indent=2 if indent else None)
+
+
+@contextmanager
+def _atomic_writer(path: Path, compress: bool) -> Iterator[BinaryIO]:
+    # Written next to the target and renamed over it only once complete
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb", buffering=1 << 20) as raw:
+            if compress:
+                with gzip.GzipFile(
+                    filename=path.name, mode="wb", fileobj=raw, compresslevel=6, mtime=0
+                ) as f:
+                    yield f
+            else:
+                yield raw
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,80 @@
+import os
+import queue
+import sys
+import threading
+from typing import Any, TextIO
+
+_STOP = object()
+
+
+class BackgroundLogSink:
+    # Log lines are handed to a writer thread, so a slow terminal or pipe never stalls
+    # the event loop; the thread writes whatever has queued up in one call
+    def __init__(self, stream: TextIO | None = None, max_batch: int = 1024):
+        self._stream = stream
+        self.max_batch = max_batch
+        self._closed = False
+        self._start()
+        # A forked worker process inherits the sink but not its thread
+        os.register_at_fork(after_in_child=self._start)
+
+    @property
+    def stream(self) -> TextIO:
+        # Without an explicit stream, sys.stdout is looked up per write: while a rich Live
+        # display is up it is rich's proxy, which prints the lines above the live area
+        return self._stream if self._stream is not None else sys.stdout
+
+    def _start(self) -> None:
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+        self._thread.start()
+
+    def write(self, line: str) -> None:
+        self._queue.put(line)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = _STOP in batch
+            lines = [line for line in batch if line is not _STOP]
+            if lines:
+                stream = self.stream
+                try:
+                    stream.write("\n".join(lines) + "\n")
+                    stream.flush()
+                except (OSError, ValueError):
+                    # Closed or broken stream (e.g. output piped into `head`): drop the lines
+                    pass
+            if stop:
+                return
+
+
+class BackgroundLogger:
+    def __init__(self, sink: BackgroundLogSink):
+        self._write = sink.write
+
+    def msg(self, message: Any) -> None:
+        self._write(str(message))
+
+    log = debug = info = warn = warning = error = critical = exception = fatal = msg
+
+
+class BackgroundLoggerFactory:
+    def __init__(self, sink: BackgroundLogSink):
+        self.sink = sink
+
+    def __call__(self, *args: Any) -> BackgroundLogger:
+        return BackgroundLogger(self.sink)
@@ -0,0 +1,25 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+import structlog
+from crypto_auto.api.metrics import RequestMetrics
+
+logger = structlog.get_logger()
+
+
+def write_metrics(metrics: RequestMetrics, output_dir: str | Path) -> tuple[Path, Path]:
+    timestamp = datetime.now(timezone.utc)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # One pair of files per run, so runs can be compared week over week
+    stem = f"metrics_{timestamp.strftime('%Y-%m-%dT%H%M%SZ')}"
+
+    json_path = output_dir / f"{stem}.json"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"timestamp": timestamp.isoformat(), **metrics.to_dict()}, f, indent=2)
+
+    prometheus_path = output_dir / f"{stem}.prom"
+    prometheus_path.write_text(metrics.to_prometheus(), encoding="utf-8")
+
+    logger.info("metrics_written", json_path=str(json_path), prometheus_path=str(prometheus_path))
+    return json_path, prometheus_path
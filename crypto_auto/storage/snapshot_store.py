@@ -0,0 +1,247 @@
+import sqlite3
+from dataclasses import fields
+from itertools import starmap
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import structlog
+from crypto_auto.models.analysis import ProjectAnalysis
+from crypto_auto.models.history import CommitRecord, SnapshotRecord
+
+logger = structlog.get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS project_snapshots (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    timestamp TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    price REAL NOT NULL,
+    market_cap REAL NOT NULL,
+    fdv REAL NOT NULL,
+    mcap_fdv_ratio REAL NOT NULL,
+    dev_commits_30d INTEGER NOT NULL,
+    dev_activity_change REAL,
+    health_status TEXT NOT NULL,
+    fdv_status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_project_snapshots_ticker_timestamp
+    ON project_snapshots (ticker, timestamp);
+CREATE TABLE IF NOT EXISTS dev_activity_windows (
+    repo TEXT NOT NULL,
+    window_days INTEGER NOT NULL,
+    window_end TEXT NOT NULL,
+    commits INTEGER NOT NULL,
+    PRIMARY KEY (repo, window_days, window_end)
+);
+CREATE TABLE IF NOT EXISTS commit_log (
+    repo TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    committed_at TEXT NOT NULL,
+    PRIMARY KEY (repo, sha)
+);
+CREATE INDEX IF NOT EXISTS idx_commit_log_repo_committed_at
+    ON commit_log (repo, committed_at);
+CREATE TABLE IF NOT EXISTS commit_checkpoints (
+    repo TEXT PRIMARY KEY,
+    sha TEXT NOT NULL,
+    committed_at TEXT NOT NULL
+);
+"""
+
+_WEEKLY_COLUMNS = ("price", "market_cap", "fdv", "mcap_fdv_ratio")
+
+# Selected in record field order so rows map positionally onto SnapshotRecord
+_COLUMNS = tuple(field.name for field in fields(SnapshotRecord))
+
+
+class SnapshotStore:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+
+    def write_snapshot(
+        self, projects: list[ProjectAnalysis], timestamp: datetime | None = None
+    ) -> int:
+        timestamp_str = (timestamp or datetime.now(timezone.utc)).isoformat()
+
+        with self.connection:
+            run_id = self.connection.execute(
+                "INSERT INTO runs (timestamp) VALUES (?)", (timestamp_str,)
+            ).lastrowid
+            self.connection.executemany(
+                f"INSERT INTO project_snapshots (run_id, {', '.join(_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' for _ in _COLUMNS)})",
+                (
+                    (
+                        run_id,
+                        timestamp_str,
+                        p.project.ticker,
+                        p.market_data.price,
+                        p.market_data.market_cap,
+                        p.market_data.fdv,
+                        p.market_data.mcap_fdv_ratio,
+                        p.dev_commits_30d,
+                        p.dev_activity_change,
+                        p.health_status,
+                        p.fdv_health.status if p.fdv_health else None,
+                    )
+                    for p in projects
+                ),
+            )
+
+        logger.info("snapshot_written", run_id=run_id, projects=len(projects), path=str(self.path))
+        return run_id
+
+    def history(
+        self, ticker: str, start: str | None = None, end: str | None = None
+    ) -> list[SnapshotRecord]:
+        query = f"SELECT {', '.join(_COLUMNS)} FROM project_snapshots WHERE ticker = ?"
+        params: list = [ticker.upper()]
+        if start is not None:
+            query += " AND timestamp >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND timestamp <= ?"
+            params.append(end)
+        query += " ORDER BY timestamp"
+
+        return list(starmap(SnapshotRecord, self.connection.execute(query, params)))
+
+    def latest(self, ticker: str) -> SnapshotRecord | None:
+        row = self.connection.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM project_snapshots "
+            "WHERE ticker = ? ORDER BY timestamp DESC LIMIT 1",
+            (ticker.upper(),),
+        ).fetchone()
+        return SnapshotRecord(*row) if row else None
+
+    def record_dev_activity(
+        self, counts: dict[str, int], window_end: datetime, window_days: int
+    ) -> None:
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO dev_activity_windows "
+                "(repo, window_days, window_end, commits) VALUES (?, ?, ?, ?)",
+                (
+                    (repo, window_days, window_end.isoformat(), commits)
+                    for repo, commits in counts.items()
+                ),
+            )
+
+    def previous_dev_activity(
+        self,
+        repos: list[str],
+        window_end: datetime,
+        window_days: int,
+        tolerance: timedelta,
+    ) -> dict[str, int]:
+        target = window_end - timedelta(days=window_days)
+        previous = {}
+
+        for repo in dict.fromkeys(repos):
+            row = self.connection.execute(
+                "SELECT commits FROM dev_activity_windows "
+                "WHERE repo = ? AND window_days = ? AND window_end BETWEEN ? AND ? "
+                "ORDER BY abs(julianday(window_end) - julianday(?)) LIMIT 1",
+                (
+                    repo,
+                    window_days,
+                    (target - tolerance).isoformat(),
+                    (target + tolerance).isoformat(),
+                    target.isoformat(),
+                ),
+            ).fetchone()
+            if row is not None:
+                previous[repo] = row[0]
+
+        return previous
+
+    def commit_checkpoint(self, repo: str) -> CommitRecord | None:
+        row = self.connection.execute(
+            "SELECT sha, committed_at FROM commit_checkpoints WHERE repo = ?", (repo,)
+        ).fetchone()
+        return CommitRecord(*row) if row else None
+
+    def append_commits(self, repo: str, commits: list[CommitRecord]) -> None:
+        if not commits:
+            return
+
+        newest = max(commits, key=lambda c: c.committed_at)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO commit_log (repo, sha, committed_at) VALUES (?, ?, ?)",
+                ((repo, c.sha, c.committed_at) for c in commits),
+            )
+            self.connection.execute(
+                "INSERT INTO commit_checkpoints (repo, sha, committed_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (repo) DO UPDATE SET sha = excluded.sha, "
+                "committed_at = excluded.committed_at "
+                "WHERE excluded.committed_at >= commit_checkpoints.committed_at",
+                (repo, newest.sha, newest.committed_at),
+            )
+
+    def count_commits(self, repo: str, since: datetime) -> int:
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM commit_log WHERE repo = ? AND committed_at >= ?",
+            (repo, since.isoformat()),
+        ).fetchone()[0]
+
+    def prune_commits(self, repo: str, before: datetime) -> None:
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM commit_log WHERE repo = ? AND committed_at < ?",
+                (repo, before.isoformat()),
+            )
+
+    def weekly_series(
+        self, tickers: list[str], columns: tuple[str, ...]
+    ) -> tuple[list[str], dict[str, np.ndarray]]:
+        unknown = set(columns) - set(_WEEKLY_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unsupported weekly columns: {sorted(unknown)}")
+
+        tickers = [t.upper() for t in tickers]
+        column = {ticker: i for i, ticker in enumerate(tickers)}
+        # ISO weeks, keyed by their Monday ('weekday 0' moves on to Sunday, then back six
+        # days); later snapshots in the same week overwrite earlier ones
+        rows = self.connection.execute(
+            f"SELECT date(timestamp, 'weekday 0', '-6 days') AS week, ticker, "
+            f"{', '.join(columns)} "
+            "FROM project_snapshots "
+            f"WHERE ticker IN ({', '.join('?' for _ in tickers)}) ORDER BY timestamp",
+            tickers,
+        ).fetchall()
+
+        weeks = sorted({row[0] for row in rows})
+        row_index = {week: i for i, week in enumerate(weeks)}
+        series = {name: np.full((len(weeks), len(tickers)), np.nan) for name in columns}
+        for week, ticker, *values in rows:
+            for name, value in zip(columns, values):
+                series[name][row_index[week], column[ticker]] = value
+
+        return weeks, series
+
+    def tickers(self) -> list[str]:
+        return [
+            row[0]
+            for row in self.connection.execute(
+                "SELECT DISTINCT ticker FROM project_snapshots ORDER BY ticker"
+            )
+        ]
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,197 @@
+import os
+import re
+from pathlib import Path
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+DAY_SECONDS = 86_400
+
+# One raw little-endian file per column; row i of every file is the same day, and every
+# day from the first row on has a row (NaN where no value was available)
+COLUMNS: dict[str, np.dtype] = {
+    "timestamp": np.dtype("<i8"),
+    "price": np.dtype("<f8"),
+    "market_cap": np.dtype("<f8"),
+    "fdv": np.dtype("<f8"),
+}
+
+# Derived from the stored columns when a weekly series is built
+_DERIVED_COLUMNS = ("mcap_fdv_ratio",)
+
+_TICKER = re.compile(r"^[A-Z0-9._-]+$")
+
+
+def day_start(timestamps: np.ndarray) -> np.ndarray:
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    return timestamps - timestamps % DAY_SECONDS
+
+
+def week_start(timestamps: np.ndarray) -> np.ndarray:
+    # Monday of the ISO week; the epoch fell on a Thursday
+    days = np.asarray(timestamps, dtype=np.int64) // DAY_SECONDS
+    return (days - (days + 3) % 7) * DAY_SECONDS
+
+
+class TimeSeriesStore:
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def tickers(self) -> list[str]:
+        return sorted(p.name for p in self.directory.iterdir() if p.is_dir())
+
+    def length(self, ticker: str) -> int:
+        return self._repair(self._ticker_dir(ticker))
+
+    def last_timestamp(self, ticker: str) -> int | None:
+        timestamps = self.column(ticker, "timestamp")
+        return int(timestamps[-1]) if len(timestamps) else None
+
+    def column(self, ticker: str, name: str) -> np.ndarray:
+        directory = self._ticker_dir(ticker)
+        rows = self._repair(directory)
+        if rows == 0:
+            return np.empty(0, dtype=COLUMNS[name])
+        return np.memmap(directory / f"{name}.bin", dtype=COLUMNS[name], mode="r", shape=(rows,))
+
+    def read(
+        self, ticker: str, start: int | None = None, end: int | None = None
+    ) -> dict[str, np.ndarray]:
+        columns = {name: self.column(ticker, name) for name in COLUMNS}
+        timestamps = columns["timestamp"]
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side="right"))
+        # Slices of a memmap are views, so nothing is read until the caller touches it
+        return {name: values[lo:hi] for name, values in columns.items()}
+
+    def append(self, ticker: str, timestamps: np.ndarray, **columns: np.ndarray) -> int:
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown time-series columns: {sorted(unknown)}")
+
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if np.any(np.diff(timestamps) <= 0):
+            raise ValueError("Timestamps must be strictly increasing")
+
+        if np.any(timestamps % DAY_SECONDS):
+            raise ValueError("Timestamps must be day starts")
+
+        last = self.last_timestamp(ticker)
+        keep = slice(None) if last is None else timestamps > last
+        timestamps = timestamps[keep]
+        if len(timestamps) == 0:
+            return 0
+
+        # Days without a value get a NaN row, so gaps can be filled in place later
+        first = timestamps[0] if last is None else last + DAY_SECONDS
+        days = np.arange(first, timestamps[-1] + DAY_SECONDS, DAY_SECONDS, dtype=np.int64)
+        rows = (timestamps - first) // DAY_SECONDS
+
+        directory = self._ticker_dir(ticker)
+        directory.mkdir(exist_ok=True)
+        for name, dtype in COLUMNS.items():
+            if name == "timestamp":
+                values = days
+            else:
+                values = np.full(len(days), np.nan, dtype=dtype)
+                if name in columns:
+                    values[rows] = np.asarray(columns[name], dtype=dtype)[keep]
+            with open(directory / f"{name}.bin", "ab") as f:
+                f.write(values.astype(dtype, copy=False).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+        logger.debug("timeseries_appended", ticker=ticker, rows=len(timestamps))
+        return len(timestamps)
+
+    def update(self, ticker: str, timestamps: np.ndarray, **columns: np.ndarray) -> int:
+        # Overwrites values of days already stored; days outside the stored range are ignored
+        unknown = set(columns) - (set(COLUMNS) - {"timestamp"})
+        if unknown:
+            raise ValueError(f"Unknown time-series columns: {sorted(unknown)}")
+
+        stored = self.column(ticker, "timestamp")
+        if len(stored) == 0:
+            return 0
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        rows = (timestamps - stored[0]) // DAY_SECONDS
+        inside = (rows >= 0) & (rows < len(stored))
+
+        directory = self._ticker_dir(ticker)
+        for name, values in columns.items():
+            column = np.memmap(
+                directory / f"{name}.bin", dtype=COLUMNS[name], mode="r+", shape=(len(stored),)
+            )
+            column[rows[inside]] = np.asarray(values, dtype=COLUMNS[name])[inside]
+            column.flush()
+            del column
+
+        return int(inside.sum())
+
+    def missing_days(self, ticker: str, name: str = "price") -> np.ndarray:
+        # Days after the first value that have none, e.g. where a backfill returned no quote
+        values = self.column(ticker, name)
+        valid = np.flatnonzero(~np.isnan(values))
+        if len(valid) == 0:
+            return np.empty(0, dtype=np.int64)
+        timestamps = self.column(ticker, "timestamp")
+        return np.asarray(timestamps[valid[0] :][np.isnan(values[valid[0] :])])
+
+    def weekly_series(
+        self, tickers: list[str], columns: tuple[str, ...]
+    ) -> tuple[list[str], dict[str, np.ndarray]]:
+        # Same shape as SnapshotStore.weekly_series: ISO weeks keyed by their Monday, each
+        # holding the week's last available value
+        unknown = set(columns) - (set(COLUMNS) - {"timestamp"}) - set(_DERIVED_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unsupported weekly columns: {sorted(unknown)}")
+
+        per_ticker = []
+        for ticker in tickers:
+            data = self.read(ticker)
+            if "mcap_fdv_ratio" in columns:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    ratio = np.where(data["fdv"] == 0, 0.0, data["market_cap"] / data["fdv"])
+                data["mcap_fdv_ratio"] = np.minimum(ratio, 1.0)
+            per_ticker.append((week_start(data["timestamp"]), data))
+
+        weeks = np.unique(np.concatenate([w for w, _ in per_ticker] or [np.empty(0, np.int64)]))
+        series = {name: np.full((len(weeks), len(tickers)), np.nan) for name in columns}
+        for i, (ticker_weeks, data) in enumerate(per_ticker):
+            for name in columns:
+                valid = ~np.isnan(data[name])
+                valid_weeks = ticker_weeks[valid]
+                if len(valid_weeks) == 0:
+                    continue
+                last_of_week = np.append(valid_weeks[1:] != valid_weeks[:-1], True)
+                rows = np.searchsorted(weeks, valid_weeks[last_of_week])
+                series[name][rows, i] = np.asarray(data[name])[valid][last_of_week]
+
+        labels = np.datetime_as_string(weeks.astype("datetime64[s]"), unit="D").tolist()
+        return labels, series
+
+    def _ticker_dir(self, ticker: str) -> Path:
+        ticker = ticker.upper()
+        if not _TICKER.match(ticker):
+            raise ValueError(f"Invalid ticker for time-series store: {ticker}")
+        return self.directory / ticker
+
+    def _repair(self, directory: Path) -> int:
+        if not directory.exists():
+            return 0
+
+        sizes = {
+            name: (directory / f"{name}.bin").stat().st_size // dtype.itemsize
+            if (directory / f"{name}.bin").exists()
+            else 0
+            for name, dtype in COLUMNS.items()
+        }
+        rows = min(sizes.values())
+        # An interrupted append can leave some columns one batch longer than the others
+        for name, size in sizes.items():
+            if size > rows:
+                os.truncate(directory / f"{name}.bin", rows * COLUMNS[name].itemsize)
+                logger.warning("timeseries_truncated", ticker=directory.name, column=name)
+        return rows
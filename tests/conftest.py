@@ -48,6 +48,55 @@ def sample_project_analysis(sample_crypto_project, sample_market_data, sample_fd
     )
 
 
+@pytest.fixture
+def sample_projects():
+    btc_project = CryptoProject(
+        ticker="BTC",
+        name="Bitcoin",
+        defillama_slug="bitcoin",
+        github_repos=["bitcoin/bitcoin"],
+        category="core",
+        target_allocation=0.60,
+    )
+
+    eth_project = CryptoProject(
+        ticker="ETH",
+        name="Ethereum",
+        defillama_slug="ethereum",
+        github_repos=["ethereum/go-ethereum"],
+        category="core",
+        target_allocation=0.40,
+    )
+
+    btc_analysis = ProjectAnalysis(
+        project=btc_project,
+        market_data=MarketData(
+            ticker="BTC",
+            price=95000.0,
+            market_cap=1_800_000_000_000,
+            fdv=1_850_000_000_000,
+            mcap_fdv_ratio=0.973,
+        ),
+        dev_commits_30d=150,
+        health_status="OK",
+    )
+
+    eth_analysis = ProjectAnalysis(
+        project=eth_project,
+        market_data=MarketData(
+            ticker="ETH",
+            price=4200.0,
+            market_cap=500_000_000_000,
+            fdv=550_000_000_000,
+            mcap_fdv_ratio=0.909,
+        ),
+        dev_commits_30d=200,
+        health_status="OK",
+    )
+
+    return [btc_analysis, eth_analysis]
+
+
 @pytest.fixture
 def temp_cryptos_json(tmp_path):
     import json
@@ -0,0 +1,24 @@
+from benchmarks.bench_end_to_end import generate_universe, run_scenario
+from benchmarks.fake_server import FakeServerConfig
+
+
+def test_generated_universe_is_a_valid_config():
+    from crypto_auto.config.loader import _validate_allocations
+    from crypto_auto.models.crypto import CryptoProject
+
+    projects = [CryptoProject(**p) for p in generate_universe(7)]
+
+    _validate_allocations(projects)
+    assert len({p.ticker for p in projects}) == 7
+
+
+def test_run_scenario_against_fake_server():
+    result = run_scenario(5, FakeServerConfig(latency_ms=0, payload_kb=1, index_coverage=0.6))
+
+    assert result["exit_code"] == 0
+    assert result["by_endpoint"]["/protocols"] == 1
+    assert result["by_endpoint"]["/graphql"] == 1
+    assert result["requests"] == sum(result["by_endpoint"].values())
+    assert 1 <= result["connections"] <= result["requests"]
+    assert result["p95_latency_ms"] is not None
+    assert {"prefetch", "analyze", "report", "persist"} <= set(result["phases"])
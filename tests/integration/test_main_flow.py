@@ -5,45 +5,52 @@ import json
 from pathlib import Path
 from crypto_auto.main import main
 from crypto_auto.config.loader import load_crypto_projects
+from crypto_auto.storage.snapshot_store import SnapshotStore
 
 
 @pytest.mark.asyncio
 async def test_main_flow_success(temp_cryptos_json, tmp_path, monkeypatch, respx_mock):
     monkeypatch.chdir(temp_cryptos_json.parent)
 
-    respx_mock.get("https://api.llama.fi/protocol/bitcoin").mock(
+    protocols_route = respx_mock.get("https://api.llama.fi/protocols").mock(
         return_value=httpx.Response(
             200,
-            json={
-                "mcap": 1_800_000_000_000,
-                "fdv": 1_850_000_000_000,
-                "price": 95000.0,
-            },
+            json=[
+                {
+                    "slug": "bitcoin",
+                    "mcap": 1_800_000_000_000,
+                    "fdv": 1_850_000_000_000,
+                    "price": 95000.0,
+                    "chainTvls": {"Bitcoin": 1},
+                },
+                {
+                    "slug": "ethereum",
+                    "mcap": 500_000_000_000,
+                    "fdv": 550_000_000_000,
+                    "price": 4200.0,
+                },
+                {"slug": "uniswap", "mcap": 4_000_000_000},
+            ],
         )
     )
 
-    respx_mock.get("https://api.llama.fi/protocol/ethereum").mock(
+    graphql_route = respx_mock.post("https://api.github.com/graphql").mock(
         return_value=httpx.Response(
             200,
             json={
-                "mcap": 500_000_000_000,
-                "fdv": 550_000_000_000,
-                "price": 4200.0,
+                "data": {
+                    "r0": {"defaultBranchRef": {"target": {"history": {"totalCount": 50}}}},
+                    "r1": {"defaultBranchRef": {"target": {"history": {"totalCount": 75}}}},
+                }
             },
         )
     )
 
-    respx_mock.get("https://api.github.com/repos/bitcoin/bitcoin/commits").mock(
-        return_value=httpx.Response(200, json=[{"sha": f"sha{i}"} for i in range(50)])
-    )
-
-    respx_mock.get("https://api.github.com/repos/ethereum/go-ethereum/commits").mock(
-        return_value=httpx.Response(200, json=[{"sha": f"sha{i}"} for i in range(75)])
-    )
-
     exit_code = await main()
 
     assert exit_code == 0
+    assert graphql_route.call_count == 1
+    assert protocols_route.call_count == 1
 
     analysis_files = list(Path.cwd().glob("analysis_*.json"))
     assert len(analysis_files) == 1
@@ -63,19 +70,35 @@ async def test_main_flow_success(temp_cryptos_json, tmp_path, monkeypatch, respx
     eth_project = next(p for p in data["projects"] if p["ticker"] == "ETH")
     assert eth_project["dev_commits_30d"] == 75
 
+    [stream_file] = Path.cwd().glob("analysis_*.ndjson")
+    streamed = [json.loads(line) for line in stream_file.read_text().splitlines()]
+    assert sorted(streamed, key=lambda p: p["ticker"]) == data["projects"]
+
+    with SnapshotStore(Path.cwd() / "data" / "snapshots.db") as store:
+        assert store.tickers() == ["BTC", "ETH"]
+        assert store.latest("ETH").dev_commits_30d == 75
+
+    [metrics_file] = (Path.cwd() / "data" / "metrics").glob("metrics_*.json")
+    metrics = json.loads(metrics_file.read_text())
+    assert {r["endpoint"] for r in metrics["requests"]} == {"/protocols", "/graphql"}
+    assert {"prefetch", "analyze"} <= set(metrics["phases"])
+
 
 @pytest.mark.asyncio
 async def test_main_flow_partial_failure(temp_cryptos_json, monkeypatch, respx_mock):
     monkeypatch.chdir(temp_cryptos_json.parent)
 
-    respx_mock.get("https://api.llama.fi/protocol/bitcoin").mock(
+    respx_mock.get("https://api.llama.fi/protocols").mock(
         return_value=httpx.Response(
             200,
-            json={
-                "mcap": 1_800_000_000_000,
-                "fdv": 1_850_000_000_000,
-                "price": 95000.0,
-            },
+            json=[
+                {
+                    "slug": "bitcoin",
+                    "mcap": 1_800_000_000_000,
+                    "fdv": 1_850_000_000_000,
+                    "price": 95000.0,
+                }
+            ],
         )
     )
 
@@ -83,10 +106,18 @@ async def test_main_flow_partial_failure(temp_cryptos_json, monkeypatch, respx_m
         return_value=httpx.Response(404, json={"error": "Not found"})
     )
 
+    respx_mock.post("https://api.github.com/graphql").mock(
+        return_value=httpx.Response(502, json={"message": "Bad Gateway"})
+    )
+
     respx_mock.get("https://api.github.com/repos/bitcoin/bitcoin/commits").mock(
         return_value=httpx.Response(200, json=[{"sha": f"sha{i}"} for i in range(50)])
     )
 
+    respx_mock.get("https://api.github.com/repos/ethereum/go-ethereum/commits").mock(
+        return_value=httpx.Response(200, json=[{"sha": f"sha{i}"} for i in range(75)])
+    )
+
     exit_code = await main()
 
     assert exit_code == 0
@@ -101,6 +132,67 @@ async def test_main_flow_partial_failure(temp_cryptos_json, monkeypatch, respx_m
     assert data["projects"][0]["ticker"] == "BTC"
 
 
+@pytest.mark.asyncio
+async def test_main_flow_failed_run_still_writes_metrics(
+    temp_cryptos_json, monkeypatch, respx_mock
+):
+    monkeypatch.chdir(temp_cryptos_json.parent)
+    respx_mock.get(url__startswith="https://api.llama.fi/").mock(return_value=httpx.Response(500))
+    respx_mock.post("https://api.github.com/graphql").mock(return_value=httpx.Response(500))
+    respx_mock.get(url__startswith="https://api.github.com/repos/").mock(
+        return_value=httpx.Response(500)
+    )
+
+    assert await main() == 1
+
+    [metrics_file] = (Path.cwd() / "data" / "metrics").glob("metrics_*.json")
+    metrics = json.loads(metrics_file.read_text())
+    assert metrics["requests"]
+    assert all(set(r["statuses"]) == {"500"} for r in metrics["requests"])
+    assert list((Path.cwd() / "data" / "metrics").glob("metrics_*.prom"))
+
+
+@pytest.mark.asyncio
+async def test_main_flow_history_failure_keeps_snapshot(
+    temp_cryptos_json, monkeypatch, respx_mock
+):
+    from crypto_auto.commands import run as run_module
+    from crypto_auto.config.settings import settings
+
+    monkeypatch.chdir(temp_cryptos_json.parent)
+    monkeypatch.setattr(settings, "price_history_enabled", True)
+
+    async def broken_history(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(run_module, "update_price_history", broken_history)
+    respx_mock.get("https://api.llama.fi/protocols").mock(
+        return_value=httpx.Response(
+            200,
+            json=[
+                {"slug": "bitcoin", "mcap": 1_800_000_000_000, "fdv": 1_850_000_000_000},
+                {"slug": "ethereum", "mcap": 500_000_000_000, "fdv": 550_000_000_000},
+            ],
+        )
+    )
+    respx_mock.post("https://api.github.com/graphql").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "data": {
+                    "r0": {"defaultBranchRef": {"target": {"history": {"totalCount": 50}}}},
+                    "r1": {"defaultBranchRef": {"target": {"history": {"totalCount": 75}}}},
+                }
+            },
+        )
+    )
+
+    assert await main() == 0
+
+    with SnapshotStore(Path.cwd() / "data" / "snapshots.db") as store:
+        assert store.tickers() == ["BTC", "ETH"]
+
+
 @pytest.mark.asyncio
 async def test_main_flow_missing_config(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
@@ -178,3 +270,135 @@ def test_load_crypto_projects_invalid_allocation(tmp_path):
 
     with pytest.raises(ConfigurationError, match="Total target allocation"):
         load_crypto_projects(invalid_file)
+
+
+@pytest.mark.asyncio
+async def test_main_flow_requires_github_token(temp_cryptos_json, monkeypatch, capsys):
+    from crypto_auto.config.settings import settings
+
+    monkeypatch.chdir(temp_cryptos_json.parent)
+    monkeypatch.setattr(settings, "github_token", None)
+
+    assert await main() == 1
+    assert "GITHUB_TOKEN is not set" in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+async def test_main_flow_deadline_reports_unfinished_projects_as_stale(
+    temp_cryptos_json, monkeypatch, respx_mock
+):
+    import asyncio
+    from crypto_auto.config.settings import settings
+
+    monkeypatch.chdir(temp_cryptos_json.parent)
+    monkeypatch.setattr(settings, "http_cache_enabled", False)
+
+    graphql = {
+        "data": {
+            "r0": {"defaultBranchRef": {"target": {"history": {"totalCount": 50}}}},
+            "r1": {"defaultBranchRef": {"target": {"history": {"totalCount": 75}}}},
+        }
+    }
+    respx_mock.post("https://api.github.com/graphql").mock(
+        return_value=httpx.Response(200, json=graphql)
+    )
+    protocols_route = respx_mock.get("https://api.llama.fi/protocols").mock(
+        return_value=httpx.Response(
+            200,
+            json=[
+                {"slug": "bitcoin", "mcap": 1_800, "fdv": 1_850, "price": 95_000.0},
+                {"slug": "ethereum", "mcap": 500, "fdv": 550, "price": 4_200.0},
+            ],
+        )
+    )
+    assert await main() == 0
+
+    async def slow_protocol(request):
+        await asyncio.sleep(10)
+        return httpx.Response(200, json={"mcap": 1, "fdv": 1})
+
+    protocols_route.mock(
+        return_value=httpx.Response(
+            200, json=[{"slug": "bitcoin", "mcap": 1_900, "fdv": 1_950, "price": 96_000.0}]
+        )
+    )
+    respx_mock.get("https://api.llama.fi/protocol/ethereum").mock(side_effect=slow_protocol)
+    monkeypatch.setattr(settings, "run_deadline", 0.5)
+
+    assert await main() == 0
+
+    with open(Path.cwd() / next(Path.cwd().glob("analysis_*.json")).name) as f:
+        projects = {p["ticker"]: p for p in json.load(f)["projects"]}
+
+    assert projects["BTC"]["stale"] is False
+    assert projects["BTC"]["market_data"]["price"] == 96_000.0
+    assert projects["ETH"]["stale"] is True
+    assert projects["ETH"]["market_data"]["price"] == 4_200.0
+    assert projects["ETH"]["dev_commits_30d"] == 75
+
+    # The finished project is streamed first; the stale one only once the deadline hits
+    [stream_file] = Path.cwd().glob("analysis_*.ndjson")
+    streamed = [json.loads(line) for line in stream_file.read_text().splitlines()]
+    assert [(p["ticker"], p["stale"]) for p in streamed] == [("BTC", False), ("ETH", True)]
+
+    with SnapshotStore(Path.cwd() / "data" / "snapshots.db") as store:
+        assert [r.price for r in store.history("ETH")] == [4_200.0]
+        assert [r.price for r in store.history("BTC")] == [95_000.0, 96_000.0]
+
+
+@pytest.mark.asyncio
+async def test_main_flow_failed_commit_fetch_reports_project_as_stale(
+    temp_cryptos_json, monkeypatch, respx_mock
+):
+    from crypto_auto.config.settings import settings
+
+    monkeypatch.chdir(temp_cryptos_json.parent)
+    monkeypatch.setattr(settings, "http_cache_enabled", False)
+
+    respx_mock.get("https://api.llama.fi/protocols").mock(
+        return_value=httpx.Response(
+            200,
+            json=[
+                {"slug": "bitcoin", "mcap": 1_800, "fdv": 1_850, "price": 95_000.0},
+                {"slug": "ethereum", "mcap": 500, "fdv": 550, "price": 4_200.0},
+            ],
+        )
+    )
+    graphql_route = respx_mock.post("https://api.github.com/graphql").mock(
+        return_value=httpx.Response(
+            200,
+            json={
+                "data": {
+                    "r0": {"defaultBranchRef": {"target": {"history": {"totalCount": 50}}}},
+                    "r1": {"defaultBranchRef": {"target": {"history": {"totalCount": 75}}}},
+                }
+            },
+        )
+    )
+    assert await main() == 0
+
+    graphql_route.mock(return_value=httpx.Response(500))
+    respx_mock.get("https://api.github.com/repos/bitcoin/bitcoin/commits").mock(
+        return_value=httpx.Response(200, json=[{"sha": "a"}, {"sha": "b"}])
+    )
+    respx_mock.get("https://api.github.com/repos/ethereum/go-ethereum/commits").mock(
+        return_value=httpx.Response(500)
+    )
+
+    assert await main() == 0
+
+    latest = max(Path.cwd().glob("analysis_*.json"))
+    projects = {p["ticker"]: p for p in json.loads(latest.read_text())["projects"]}
+    assert projects["BTC"]["stale"] is False
+    assert projects["BTC"]["dev_commits_30d"] == 2
+    # A failed fetch is not an inactive repo: ETH keeps its last known count
+    assert projects["ETH"]["stale"] is True
+    assert projects["ETH"]["dev_commits_30d"] == 75
+
+    with SnapshotStore(Path.cwd() / "data" / "snapshots.db") as store:
+        assert [r.dev_commits_30d for r in store.history("ETH")] == [75]
+        windows = store.connection.execute(
+            "SELECT repo, commits FROM dev_activity_windows ORDER BY repo"
+        ).fetchall()
+    # The failed repo keeps the window recorded by the first run instead of a 0
+    assert windows == [("bitcoin/bitcoin", 2), ("ethereum/go-ethereum", 75)]
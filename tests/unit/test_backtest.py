@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+from crypto_auto.analysis.backtest import forward_fill, run_dca_backtest
+from crypto_auto.analysis.rebalancer import PortfolioRebalancer
+from crypto_auto.main import cli
+from crypto_auto.storage.snapshot_store import SnapshotStore
+
+
+def test_forward_fill_keeps_leading_gaps():
+    prices = np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, np.nan], [3.0, 4.0]])
+
+    filled = forward_fill(prices)
+
+    np.testing.assert_array_equal(
+        filled, np.array([[np.nan, 1.0], [2.0, 1.0], [2.0, 1.0], [3.0, 4.0]])
+    )
+
+
+def test_forward_fill_treats_zero_prices_as_missing():
+    prices = np.array([[0.0, 1.0], [2.0, 0.0], [0.0, 3.0]])
+
+    filled = forward_fill(prices)
+
+    np.testing.assert_array_equal(filled, np.array([[np.nan, 1.0], [2.0, 1.0], [2.0, 3.0]]))
+
+
+def test_backtest_first_week_matches_rebalancer(sample_projects):
+    prices = np.array([[95000.0, 4200.0]])
+    allocations = np.array([p.project.target_allocation for p in sample_projects])
+
+    result = run_dca_backtest(prices, allocations, dca_amount=1000.0)
+
+    expected = PortfolioRebalancer({}, 1000.0).calculate_purchase_recommendations(
+        sample_projects
+    )
+    np.testing.assert_allclose(result.units[0] * prices[0], list(expected.values()))
+
+
+def test_backtest_replays_rebalancer_week_by_week(sample_projects):
+    rng = np.random.default_rng(7)
+    prices = np.cumprod(1 + rng.normal(0, 0.05, (30, 2)), axis=0) * [95000.0, 4200.0]
+    allocations = np.array([p.project.target_allocation for p in sample_projects])
+
+    result = run_dca_backtest(prices, allocations, dca_amount=500.0)
+
+    units = {"BTC": 0.0, "ETH": 0.0}
+    for week_prices in prices:
+        holdings = {t: units[t] * p for t, p in zip(units, week_prices)}
+        buys = PortfolioRebalancer(holdings, 500.0).calculate_purchase_recommendations(
+            sample_projects
+        )
+        for ticker, price in zip(units, week_prices):
+            units[ticker] += buys[ticker] / price
+
+    np.testing.assert_allclose(result.units[0], list(units.values()))
+    assert result.invested == 500.0 * 30
+    assert result.purchases.sum() == pytest.approx(500.0 * 30)
+
+
+def test_backtest_constant_prices_have_no_drift():
+    result = run_dca_backtest(np.ones((10, 3)), np.array([0.5, 0.3, 0.2]), dca_amount=100.0)
+
+    assert result.final_value[0] == pytest.approx(1000.0)
+    assert result.final_drift[0] == pytest.approx(0.0)
+    assert result.total_return[0] == pytest.approx(0.0)
+
+
+def test_backtest_skips_assets_before_listing():
+    prices = np.array([[1.0, np.nan], [1.0, np.nan], [1.0, 1.0]])
+
+    result = run_dca_backtest(prices, np.array([0.5, 0.5]), dca_amount=100.0)
+
+    assert result.purchases[:, 0].tolist() == [100.0, 0.0, 200.0]
+    assert result.units[0].tolist() == [150.0, 150.0]
+    assert result.cash[0] == 0.0
+
+
+def test_backtest_carries_price_over_zero_week():
+    prices = np.array([[1.0, 1.0], [1.0, 0.0], [1.0, 1.0]])
+
+    result = run_dca_backtest(prices, np.array([0.5, 0.5]), dca_amount=100.0)
+
+    assert np.isfinite(result.final_value).all()
+    assert result.final_value[0] == pytest.approx(300.0)
+    assert result.units[0].sum() == pytest.approx(300.0)
+
+
+def test_backtest_rejects_non_finite_result():
+    prices = np.array([[1.0, 1.0], [1.0, np.inf]])
+
+    with pytest.raises(ValueError, match="non-finite"):
+        run_dca_backtest(prices, np.array([0.5, 0.5]), dca_amount=100.0)
+
+
+def test_backtest_runs_allocation_scenarios_together():
+    prices = np.tile([1.0, 2.0], (5, 1))
+    allocations = np.array([[0.5, 0.5], [0.9, 0.1]])
+
+    result = run_dca_backtest(prices, allocations, dca_amount=100.0)
+
+    assert result.final_value.shape == (2,)
+    np.testing.assert_allclose(result.units[1] * [1.0, 2.0], [450.0, 50.0])
+
+
+def test_backtest_rejects_mismatched_allocations():
+    with pytest.raises(ValueError, match="assets"):
+        run_dca_backtest(np.ones((3, 2)), np.array([1.0]), dca_amount=100.0)
+
+
+def test_backtest_command(temp_cryptos_json, sample_project_analysis, capsys):
+    db_path = temp_cryptos_json.parent / "snapshots.db"
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with SnapshotStore(db_path) as store:
+        for week in range(4):
+            store.write_snapshot([sample_project_analysis], start + timedelta(weeks=week))
+
+    with pytest.raises(SystemExit) as exc_info:
+        cli(["backtest", "--config", str(temp_cryptos_json), "--db", str(db_path)])
+
+    assert exc_info.value.code == 0
+    assert "DCA Backtest" in capsys.readouterr().out
+
+
+def test_backtest_command_prefers_price_history(temp_cryptos_json, monkeypatch, capsys):
+    from crypto_auto.config.settings import settings
+    from crypto_auto.storage.timeseries import DAY_SECONDS, TimeSeriesStore
+
+    history_dir = temp_cryptos_json.parent / "history"
+    monkeypatch.setattr(settings, "price_history_dir", str(history_dir))
+    days = 1_704_067_200 + np.arange(28) * DAY_SECONDS
+    store = TimeSeriesStore(history_dir)
+    store.append("BTC", days, price=np.linspace(90_000, 100_000, 28))
+    store.append("ETH", days, price=np.linspace(4_000, 4_200, 28))
+
+    with pytest.raises(SystemExit) as exc_info:
+        cli(["backtest", "--config", str(temp_cryptos_json)])
+
+    assert exc_info.value.code == 0
+    assert "(4 weeks)" in capsys.readouterr().out
+
+
+def test_backtest_command_survives_zero_price_week(temp_cryptos_json, monkeypatch, capsys):
+    from crypto_auto.config.settings import settings
+    from crypto_auto.storage.timeseries import DAY_SECONDS, TimeSeriesStore
+
+    history_dir = temp_cryptos_json.parent / "history"
+    monkeypatch.setattr(settings, "price_history_dir", str(history_dir))
+    days = 1_704_067_200 + np.arange(28) * DAY_SECONDS
+    eth = np.linspace(4_000, 4_200, 28)
+    eth[7:14] = 0.0
+    store = TimeSeriesStore(history_dir)
+    store.append("BTC", days, price=np.linspace(90_000, 100_000, 28))
+    store.append("ETH", days, price=eth)
+
+    with pytest.raises(SystemExit) as exc_info:
+        cli(["backtest", "--config", str(temp_cryptos_json)])
+
+    assert exc_info.value.code == 0
+    assert "nan" not in capsys.readouterr().out
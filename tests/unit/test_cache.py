@@ -0,0 +1,86 @@
+import os
+import time
+import pytest
+import httpx
+from crypto_auto.api.cache import CachedResponse, ResponseCache
+from crypto_auto.api.defillama import DeFiLlamaClient
+from crypto_auto.api.github_api import GitHubClient
+
+
+def test_cache_key_ignores_param_order():
+    key_a = ResponseCache.make_key("https://api.github.com/x", {"a": 1, "b": 2})
+    key_b = ResponseCache.make_key("https://api.github.com/x", {"b": 2, "a": 1})
+
+    assert key_a == key_b
+    assert key_a != ResponseCache.make_key("https://api.github.com/x", {"a": 2, "b": 2})
+
+
+def test_cache_roundtrip(tmp_path):
+    cache = ResponseCache(tmp_path)
+    entry = CachedResponse(url="u", body={"mcap": 1}, etag='"abc"', stored_at=time.time())
+
+    cache.set("key", entry)
+    loaded = cache.get("key")
+
+    assert loaded.body == {"mcap": 1}
+    assert loaded.conditional_headers() == {"If-None-Match": '"abc"'}
+    assert cache.get("missing") is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=400)
+    body = "x" * 100
+
+    cache.set("old", CachedResponse(url="old", body=body, stored_at=time.time()))
+    os.utime(tmp_path / "old.json", (1, 1))
+    cache.set("mid", CachedResponse(url="mid", body=body, stored_at=time.time()))
+    os.utime(tmp_path / "mid.json", (2, 2))
+    cache.get("old")
+    cache.set("new", CachedResponse(url="new", body=body, stored_at=time.time()))
+
+    assert cache.get("mid") is None
+    assert cache.get("old") is not None
+    assert cache.get("new") is not None
+
+
+def test_cache_corrupt_entry_is_dropped(tmp_path):
+    cache = ResponseCache(tmp_path)
+    (tmp_path / "bad.json").write_text("{not json")
+
+    assert cache.get("bad") is None
+    assert not (tmp_path / "bad.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_fresh_cache_entry_skips_request(tmp_path, respx_mock):
+    route = respx_mock.get("https://api.llama.fi/protocol/bitcoin").mock(
+        return_value=httpx.Response(200, json={"mcap": 100, "fdv": 200, "price": 1.0})
+    )
+    cache = ResponseCache(tmp_path)
+
+    async with DeFiLlamaClient(cache=cache) as client:
+        first = await client.get_market_data("bitcoin")
+        second = await client.get_market_data("bitcoin")
+
+    assert route.call_count == 1
+    assert first == second
+
+
+@pytest.mark.asyncio
+async def test_stale_cache_entry_revalidates_with_etag(tmp_path, respx_mock):
+    route = respx_mock.get("https://api.github.com/repos/test/repo/commits").mock(
+        side_effect=[
+            httpx.Response(200, json=[{"sha": "a"}, {"sha": "b"}], headers={"ETag": '"v1"'}),
+            httpx.Response(304),
+        ]
+    )
+    cache = ResponseCache(tmp_path)
+
+    async with GitHubClient(cache=cache) as client:
+        client.cache_ttl = 0
+        first = await client.get_commit_activity("test/repo")
+        second = await client.get_commit_activity("test/repo")
+
+    assert first == second == 2
+    assert route.call_count == 2
+    assert route.calls.last.request.headers["If-None-Match"] == '"v1"'
@@ -0,0 +1,81 @@
+import pytest
+import httpx
+from crypto_auto.api.base import APIError
+from crypto_auto.api.cassette import Cassette
+from crypto_auto.api.defillama import DeFiLlamaClient
+from crypto_auto.api.github_api import GitHubClient
+
+PROTOCOL_URL = "https://api.llama.fi/protocol/bitcoin"
+
+
+def test_cassette_key_depends_on_request_shape():
+    key = Cassette.make_key("GET", "https://x/a", {"a": 1, "b": 2})
+
+    assert key == Cassette.make_key("GET", "https://x/a", {"b": 2, "a": 1})
+    assert key != Cassette.make_key("POST", "https://x/a", {"a": 1, "b": 2})
+    assert key != Cassette.make_key("GET", "https://x/a", {"a": 1, "b": 2}, fields=["mcap"])
+
+
+def test_replay_requires_existing_cassette(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        Cassette(tmp_path / "missing.db", "replay")
+
+
+@pytest.mark.asyncio
+async def test_recorded_responses_replay_without_network(tmp_path, respx_mock):
+    path = tmp_path / "cassette.db"
+    respx_mock.get(PROTOCOL_URL).mock(
+        return_value=httpx.Response(200, json={"tvl": [1, 2, 3], "mcap": 100, "fdv": 200})
+    )
+    respx_mock.get("https://api.llama.fi/protocol/missing").mock(
+        return_value=httpx.Response(404, json={"message": "not found"})
+    )
+
+    with Cassette(path, "record") as cassette:
+        async with DeFiLlamaClient(cassette=cassette) as client:
+            assert await client.get("/protocol/bitcoin", fields=["mcap", "fdv"]) == {
+                "mcap": 100,
+                "fdv": 200,
+            }
+            with pytest.raises(APIError):
+                await client.get("/protocol/missing")
+        assert len(cassette) == 2
+
+    respx_mock.reset()
+    with Cassette(path, "replay") as cassette:
+        async with DeFiLlamaClient(cassette=cassette) as client:
+            assert await client.get("/protocol/bitcoin", fields=["mcap", "fdv"]) == {
+                "mcap": 100,
+                "fdv": 200,
+            }
+            with pytest.raises(APIError, match="HTTP 404"):
+                await client.get("/protocol/missing")
+            with pytest.raises(APIError, match="No recorded response"):
+                await client.get("/protocol/bitcoin")
+
+    assert not respx_mock.calls
+
+
+@pytest.mark.asyncio
+async def test_replay_keeps_headers_and_recorded_window(tmp_path, respx_mock):
+    path = tmp_path / "cassette.db"
+    respx_mock.get("https://api.github.com/repos/test/repo/commits").mock(
+        return_value=httpx.Response(
+            200,
+            json=[{"sha": "a"}],
+            headers={"Link": '<https://api.github.com/x?per_page=1&page=42>; rel="last"'},
+        )
+    )
+
+    with Cassette(path, "record") as cassette:
+        async with GitHubClient(cassette=cassette) as client:
+            assert await client.get_commit_activity("test/repo", exact=True) == 42
+        recorded_at = cassette.recorded_at
+
+    respx_mock.reset()
+    with Cassette(path, "replay") as cassette:
+        assert cassette.recorded_at == recorded_at
+        async with GitHubClient(cassette=cassette) as client:
+            assert await client.get_commit_activity("test/repo", exact=True) == 42
+
+    assert not respx_mock.calls
@@ -0,0 +1,67 @@
+import pytest
+import httpx
+from crypto_auto.api.circuit_breaker import CircuitBreaker
+from crypto_auto.api.defillama import DeFiLlamaClient
+from crypto_auto.api.errors import APIError, CircuitOpenError
+
+HOST = "api.llama.fi"
+
+
+def test_circuit_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    for _ in range(2):
+        breaker.record_failure(HOST, now=0)
+    breaker.record_success(HOST)
+    for _ in range(2):
+        breaker.record_failure(HOST, now=0)
+    breaker.check(HOST, now=0)
+
+    breaker.record_failure(HOST, now=0)
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.check(HOST, now=10)
+    assert exc_info.value.retry_after == 20
+    breaker.check("api.github.com", now=10)
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure(HOST, now=0)
+
+    breaker.check(HOST, now=31)
+    with pytest.raises(CircuitOpenError):
+        breaker.check(HOST, now=32)
+
+    breaker.record_failure(HOST, now=33)
+    with pytest.raises(CircuitOpenError):
+        breaker.check(HOST, now=40)
+
+    breaker.check(HOST, now=64)
+    breaker.record_success(HOST)
+    assert not breaker.is_open(HOST)
+    breaker.check(HOST, now=65)
+
+
+def test_unanswered_probe_expires():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure(HOST, now=0)
+    breaker.check(HOST, now=31)
+
+    breaker.check(HOST, now=62)
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_requests(respx_mock):
+    route = respx_mock.get("https://api.llama.fi/protocol/bitcoin").mock(
+        return_value=httpx.Response(503)
+    )
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    async with DeFiLlamaClient(circuit_breaker=breaker) as client:
+        for _ in range(2):
+            with pytest.raises(APIError):
+                await client.get("/protocol/bitcoin")
+        with pytest.raises(CircuitOpenError):
+            await client.get("/protocol/bitcoin")
+
+    assert route.call_count == 2
@@ -0,0 +1,130 @@
+from datetime import timedelta
+import pytest
+import httpx
+from crypto_auto.analysis.commit_sync import IncrementalCommitSync
+from crypto_auto.api.github_api import GitHubClient, activity_window_end, parse_link_page
+from crypto_auto.config.settings import settings
+from crypto_auto.storage.snapshot_store import SnapshotStore
+
+COMMITS_URL = "https://api.github.com/repos/ethereum/go-ethereum/commits"
+
+
+def _commit(sha, days_ago):
+    date = (activity_window_end() - timedelta(days=days_ago)).isoformat().replace("+00:00", "Z")
+    return {"sha": sha, "commit": {"committer": {"date": date}}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with SnapshotStore(tmp_path / "snapshots.db") as store:
+        yield store
+
+
+def test_parse_link_page_next():
+    link = (
+        '<https://api.github.com/repositories/1/commits?page=3&per_page=100>; rel="next", '
+        '<https://api.github.com/repositories/1/commits?page=9&per_page=100>; rel="last"'
+    )
+
+    assert parse_link_page(link, "next") == 3
+    assert parse_link_page(link, "last") == 9
+
+
+@pytest.mark.asyncio
+async def test_initial_sync_pages_through_window(respx_mock, store):
+    route = respx_mock.get(COMMITS_URL).mock(
+        side_effect=[
+            httpx.Response(
+                200,
+                json=[_commit("c3", 1), _commit("c2", 5)],
+                headers={"Link": f'<{COMMITS_URL}?page=2>; rel="next"'},
+            ),
+            httpx.Response(200, json=[_commit("c1", 20)]),
+        ]
+    )
+
+    async with GitHubClient() as client:
+        count = await IncrementalCommitSync(client, store).sync("ethereum/go-ethereum", days=30)
+
+    assert count == 3
+    assert route.call_count == 2
+    assert "page=2" in str(route.calls.last.request.url)
+    assert store.commit_checkpoint("ethereum/go-ethereum").sha == "c3"
+
+
+@pytest.mark.asyncio
+async def test_followup_sync_fetches_only_new_commits(respx_mock, store):
+    respx_mock.get(COMMITS_URL).mock(
+        side_effect=[
+            httpx.Response(200, json=[_commit("c2", 3), _commit("c1", 45)]),
+            httpx.Response(200, json=[_commit("c4", 0), _commit("c3", 1), _commit("c2", 3)]),
+        ]
+    )
+
+    async with GitHubClient() as client:
+        sync = IncrementalCommitSync(client, store)
+        first = await sync.sync("ethereum/go-ethereum", days=30)
+        checkpoint = store.commit_checkpoint("ethereum/go-ethereum")
+        second = await sync.sync("ethereum/go-ethereum", days=30)
+
+    last_request = respx_mock.calls.last.request
+    assert first == 1
+    assert second == 3
+    assert checkpoint.committed_at[:19] in str(last_request.url.params["since"])
+    assert store.commit_checkpoint("ethereum/go-ethereum").sha == "c4"
+
+
+@pytest.mark.asyncio
+async def test_sync_all_skips_failed_repos(respx_mock, store):
+    respx_mock.get(COMMITS_URL).mock(return_value=httpx.Response(200, json=[_commit("a", 1)]))
+    respx_mock.get("https://api.github.com/repos/gone/repo/commits").mock(
+        return_value=httpx.Response(404, json={"message": "Not Found"})
+    )
+
+    async with GitHubClient() as client:
+        counts = await IncrementalCommitSync(client, store).sync_all(
+            ["ethereum/go-ethereum", "gone/repo"], days=30
+        )
+
+    assert counts == {"ethereum/go-ethereum": 1}
+
+
+@pytest.mark.asyncio
+async def test_page_cap_falls_back_to_exact_count(respx_mock, store, monkeypatch):
+    monkeypatch.setattr(settings, "github_sync_max_pages", 1)
+    respx_mock.get(COMMITS_URL).mock(
+        side_effect=[
+            httpx.Response(
+                200,
+                json=[_commit("c3", 1), _commit("c2", 5)],
+                headers={"Link": f'<{COMMITS_URL}?page=2>; rel="next"'},
+            ),
+            httpx.Response(
+                200,
+                json=[_commit("c3", 1)],
+                headers={"Link": f'<{COMMITS_URL}?page=250&per_page=1>; rel="last"'},
+            ),
+        ]
+    )
+
+    async with GitHubClient() as client:
+        count = await IncrementalCommitSync(client, store).sync("ethereum/go-ethereum", days=30)
+
+    assert count == 250
+    assert store.commit_checkpoint("ethereum/go-ethereum") is None
+
+
+@pytest.mark.asyncio
+async def test_sync_all_skips_timed_out_and_malformed_repos(respx_mock, store, monkeypatch):
+    monkeypatch.setattr(settings, "max_retries", 1)
+    respx_mock.get(COMMITS_URL).mock(side_effect=httpx.ReadTimeout("timed out"))
+    respx_mock.get("https://api.github.com/repos/odd/repo/commits").mock(
+        return_value=httpx.Response(200, json=[{"commit": {}}])
+    )
+
+    async with GitHubClient() as client:
+        counts = await IncrementalCommitSync(client, store).sync_all(
+            ["ethereum/go-ethereum", "odd/repo"], days=30
+        )
+
+    assert counts == {}
@@ -100,3 +100,59 @@ async def test_defillama_invalid_json(respx_mock):
     async with DeFiLlamaClient() as client:
         with pytest.raises(APIError, match="Invalid JSON response"):
             await client.get_market_data("broken")
+
+
+@pytest.mark.asyncio
+async def test_defillama_protocol_index_serves_market_data(respx_mock):
+    listing_route = respx_mock.get("https://api.llama.fi/protocols").mock(
+        return_value=httpx.Response(
+            200,
+            json=[
+                {"slug": "aave", "mcap": 2_000_000_000, "fdv": 2_500_000_000, "price": 130.0},
+                {"slug": "uniswap", "mcap": 4_000_000_000, "fdv": 8_000_000_000, "price": 7.0},
+                {"name": "no slug", "mcap": 1},
+            ],
+        )
+    )
+    slug_route = respx_mock.get("https://api.llama.fi/protocol/aave")
+
+    async with DeFiLlamaClient() as client:
+        index = await client.load_protocol_index()
+        aave = await client.get_market_data("aave")
+        uniswap = await client.get_market_data("uniswap")
+
+    assert set(index) == {"aave", "uniswap"}
+    assert listing_route.call_count == 1
+    assert not slug_route.called
+    assert aave.price == 130.0
+    assert uniswap.mcap_fdv_ratio == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_defillama_protocol_index_falls_back_to_slug_endpoint(respx_mock):
+    respx_mock.get("https://api.llama.fi/protocols").mock(
+        return_value=httpx.Response(200, json=[{"slug": "empty", "tvl": 0}])
+    )
+    slug_route = respx_mock.get("https://api.llama.fi/protocol/empty").mock(
+        return_value=httpx.Response(200, json={"mcap": 100, "fdv": 200, "price": 1.0})
+    )
+
+    async with DeFiLlamaClient() as client:
+        await client.load_protocol_index()
+        market_data = await client.get_market_data("empty")
+
+    assert slug_route.call_count == 1
+    assert market_data.fdv == 200
+
+
+@pytest.mark.asyncio
+async def test_defillama_protocol_index_rejects_unexpected_payload(respx_mock):
+    respx_mock.get("https://api.llama.fi/protocols").mock(
+        return_value=httpx.Response(200, json={"error": "maintenance"})
+    )
+
+    async with DeFiLlamaClient() as client:
+        with pytest.raises(APIError, match="Unexpected /protocols response"):
+            await client.load_protocol_index()
+
+        assert client.protocol_index is None
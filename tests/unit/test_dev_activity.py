@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+import httpx
+from crypto_auto.analysis.dev_activity import DevActivityAnalyzer
+from crypto_auto.api.defillama import DeFiLlamaClient
+from crypto_auto.api.github_api import GitHubClient
+from crypto_auto.commands.run import analyze_project
+from crypto_auto.storage.snapshot_store import SnapshotStore
+
+
+def test_calculate_change():
+    change = DevActivityAnalyzer.calculate_change(
+        {"a/a": 60, "b/b": 30}, {"a/a": 50, "b/b": 25, "c/c": 1}
+    )
+
+    assert change == pytest.approx(20.0)
+
+
+def test_calculate_change_requires_history_for_every_repo():
+    assert DevActivityAnalyzer.calculate_change({"a/a": 60, "b/b": 30}, {"a/a": 50}) is None
+    assert DevActivityAnalyzer.calculate_change({}, {}) is None
+    assert DevActivityAnalyzer.calculate_change({"a/a": 5}, {"a/a": 0}) is None
+
+
+def test_previous_dev_activity_picks_nearest_window(tmp_path):
+    now = datetime(2024, 6, 3, 9, tzinfo=timezone.utc)
+
+    with SnapshotStore(tmp_path / "snapshots.db") as store:
+        for weeks_ago, commits in [(3, 40), (4, 35), (5, 30)]:
+            store.record_dev_activity(
+                {"bitcoin/bitcoin": commits}, now - timedelta(weeks=weeks_ago), window_days=30
+            )
+        store.record_dev_activity({"bitcoin/bitcoin": 99}, now - timedelta(days=30), 90)
+
+        previous = store.previous_dev_activity(
+            ["bitcoin/bitcoin", "new/repo"], now, window_days=30, tolerance=timedelta(days=3.5)
+        )
+
+    # 30 days back falls between the runs 4 and 5 weeks ago; 4 weeks is nearer
+    assert previous == {"bitcoin/bitcoin": 35}
+
+
+def test_previous_dev_activity_outside_tolerance(tmp_path):
+    now = datetime(2024, 6, 3, 9, tzinfo=timezone.utc)
+
+    with SnapshotStore(tmp_path / "snapshots.db") as store:
+        store.record_dev_activity({"bitcoin/bitcoin": 40}, now - timedelta(days=10), 30)
+        previous = store.previous_dev_activity(
+            ["bitcoin/bitcoin"], now, window_days=30, tolerance=timedelta(days=3.5)
+        )
+
+    assert previous == {}
+
+
+@pytest.mark.asyncio
+async def test_analyze_project_sets_dev_activity_change(respx_mock, sample_crypto_project):
+    respx_mock.get("https://api.llama.fi/protocol/bitcoin").mock(
+        return_value=httpx.Response(200, json={"mcap": 100, "fdv": 100, "price": 1.0})
+    )
+
+    async with DeFiLlamaClient() as defillama_client, GitHubClient() as github_client:
+        analysis = await analyze_project(
+            sample_crypto_project,
+            defillama_client,
+            github_client,
+            dev_activity={"bitcoin/bitcoin": 30},
+            previous_activity={"bitcoin/bitcoin": 40},
+        )
+
+    assert analysis.repo_commits == {"bitcoin/bitcoin": 30}
+    assert analysis.dev_activity_change == pytest.approx(-25.0)
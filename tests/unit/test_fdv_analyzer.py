@@ -1,5 +1,6 @@
+import numpy as np
 import pytest
-from crypto_auto.analysis.fdv_analyzer import FDVAnalyzer
+from crypto_auto.analysis.fdv_analyzer import FDVAnalyzer, fdv_status_codes
 from crypto_auto.models.market_data import MarketData
 
 
@@ -97,3 +98,57 @@ def test_fdv_analyzer_zero_fdv():
 
     assert result.ratio == 0
     assert result.status == "WARNING"
+
+
+def test_fdv_batch_matches_per_item_path():
+    ratios = [0.0, 0.2, 0.399999999, 0.4, 0.425, 0.45, 0.475, 0.5, 0.500001, 0.973, 1.0]
+    tickers = [f"T{i}" for i in range(len(ratios))]
+
+    batch = FDVAnalyzer.analyze_fdv_health_batch(ratios, tickers)
+
+    expected = [
+        FDVAnalyzer.analyze_fdv_health(
+            MarketData(ticker=t, price=1, market_cap=r, fdv=1, mcap_fdv_ratio=r)
+        )
+        for t, r in zip(tickers, ratios)
+    ]
+    assert batch.to_models() == expected
+    assert list(batch.statuses) == [e.status for e in expected]
+
+
+def test_fdv_batch_counts_and_masks():
+    batch = FDVAnalyzer.analyze_fdv_health_batch(
+        np.array([0.1, 0.3, 0.42, 0.48, 0.9]), np.array(["A", "B", "C", "D", "E"])
+    )
+
+    assert batch.counts() == {
+        "WARNING": 2,
+        "CAUTION": 1,
+        "HEALTHY": 1,
+        "EXCELLENT": 1,
+        "UNKNOWN": 0,
+    }
+    assert list(batch.tickers[batch.mask("WARNING")]) == ["A", "B"]
+    assert batch.health_status(2).message == "Below target range: 42.0% < 45.0%"
+
+
+def test_fdv_batch_custom_thresholds():
+    batch = FDVAnalyzer.analyze_fdv_health_batch(
+        [0.55, 0.65, 0.75], ["A", "B", "C"], warning_threshold=0.6, target_min=0.7, target_max=0.7
+    )
+
+    assert list(batch.statuses) == ["WARNING", "CAUTION", "EXCELLENT"]
+
+
+def test_fdv_status_codes_mark_nan_ratios_unknown():
+    codes = fdv_status_codes(np.array([np.nan, 0.1, 0.6]), 0.4, 0.45, 0.5)
+
+    assert codes.tolist() == [4, 0, 3]
+    batch = FDVAnalyzer.analyze_fdv_health_batch([np.nan], ["A"])
+    assert list(batch.statuses) == ["UNKNOWN"]
+    assert batch.health_status(0).message == "MCap/FDV ratio unavailable"
+
+
+def test_fdv_batch_shape_mismatch():
+    with pytest.raises(ValueError, match="same shape"):
+        FDVAnalyzer.analyze_fdv_health_batch([0.1, 0.2], ["A"])
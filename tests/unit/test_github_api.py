@@ -1,7 +1,10 @@
+import json
 import pytest
 import respx
 import httpx
-from crypto_auto.api.github_api import GitHubClient
+from crypto_auto.api.circuit_breaker import CircuitBreaker
+from crypto_auto.api.errors import APIError, CircuitOpenError
+from crypto_auto.api.github_api import GitHubClient, build_history_query, parse_last_page
 from crypto_auto.config.settings import settings
 
 
@@ -63,15 +66,14 @@ async def test_github_authorization_header(respx_mock):
 
 
 @pytest.mark.asyncio
-async def test_github_api_error_returns_zero(respx_mock):
+async def test_github_api_error_is_raised(respx_mock):
     respx_mock.get("https://api.github.com/repos/error/repo/commits").mock(
         return_value=httpx.Response(404, json={"message": "Not Found"})
     )
 
     async with GitHubClient() as client:
-        commit_count = await client.get_commit_activity("error/repo")
-
-    assert commit_count == 0
+        with pytest.raises(APIError):
+            await client.get_commit_activity("error/repo")
 
 
 @pytest.mark.asyncio
@@ -81,9 +83,24 @@ async def test_github_unexpected_response_type(respx_mock):
     )
 
     async with GitHubClient() as client:
-        commit_count = await client.get_commit_activity("test/repo")
+        with pytest.raises(APIError, match="Unexpected commits response"):
+            await client.get_commit_activity("test/repo")
 
-    assert commit_count == 0
+
+@pytest.mark.asyncio
+async def test_github_open_circuit_is_raised(respx_mock):
+    route = respx_mock.get("https://api.github.com/repos/test/repo/commits").mock(
+        return_value=httpx.Response(200, json=[])
+    )
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure("api.github.com")
+
+    async with GitHubClient(circuit_breaker=breaker) as client:
+        with pytest.raises(CircuitOpenError):
+            await client.get_commit_activity("test/repo")
+
+    assert not route.called
 
 
 @pytest.mark.asyncio
@@ -99,3 +116,110 @@ async def test_github_since_parameter(respx_mock):
     request = route.calls.last.request
     assert "since" in str(request.url)
     assert "per_page=100" in str(request.url)
+    # Day-aligned, so later runs that day reuse (and revalidate) the cached response
+    assert request.url.params["since"].endswith("T00:00:00+00:00")
+
+
+def test_parse_last_page():
+    link = (
+        '<https://api.github.com/repositories/1/commits?per_page=1&page=2>; rel="next", '
+        '<https://api.github.com/repositories/1/commits?per_page=1&page=1234>; rel="last"'
+    )
+
+    assert parse_last_page(link) == 1234
+    assert parse_last_page('<https://api.github.com/x?page=2>; rel="next"') is None
+    assert parse_last_page(None) is None
+
+
+@pytest.mark.asyncio
+async def test_github_exact_commit_count_from_link_header(respx_mock):
+    route = respx_mock.get("https://api.github.com/repos/ethereum/go-ethereum/commits").mock(
+        return_value=httpx.Response(
+            200,
+            json=[{"sha": "abc123"}],
+            headers={
+                "Link": '<https://api.github.com/repositories/15452919/commits?since=x'
+                '&per_page=1&page=2>; rel="next", <https://api.github.com/repositories/'
+                '15452919/commits?since=x&per_page=1&page=412>; rel="last"'
+            },
+        )
+    )
+
+    async with GitHubClient() as client:
+        commit_count = await client.get_commit_activity("ethereum/go-ethereum", exact=True)
+
+    assert commit_count == 412
+    assert route.call_count == 1
+    assert "per_page=1" in str(route.calls.last.request.url)
+
+
+@pytest.mark.asyncio
+async def test_github_exact_commit_count_single_page(respx_mock):
+    respx_mock.get("https://api.github.com/repos/quiet/repo/commits").mock(
+        return_value=httpx.Response(200, json=[{"sha": "abc123"}])
+    )
+
+    async with GitHubClient() as client:
+        commit_count = await client.get_commit_activity("quiet/repo", exact=True)
+
+    assert commit_count == 1
+
+
+def test_build_history_query_aliases_each_repo():
+    query = build_history_query(["bitcoin/bitcoin", "ethereum/go-ethereum"])
+
+    assert 'r0: repository(owner: "bitcoin", name: "bitcoin")' in query
+    assert 'r1: repository(owner: "ethereum", name: "go-ethereum")' in query
+    assert "$since: GitTimestamp!" in query
+
+
+def _history_node(total):
+    return {"defaultBranchRef": {"target": {"history": {"totalCount": total}}}}
+
+
+@pytest.mark.asyncio
+async def test_github_dev_activity_batch(respx_mock, monkeypatch):
+    monkeypatch.setattr(settings, "github_graphql_batch_size", 2)
+    route = respx_mock.post("https://api.github.com/graphql").mock(
+        side_effect=[
+            httpx.Response(200, json={"data": {"r0": _history_node(120), "r1": _history_node(4)}}),
+            httpx.Response(
+                200,
+                json={"data": {"r0": None}, "errors": [{"message": "Could not resolve"}]},
+            ),
+        ]
+    )
+
+    async with GitHubClient() as client:
+        counts = await client.get_dev_activity_batch(
+            ["bitcoin/bitcoin", "ethereum/go-ethereum", "bitcoin/bitcoin", "gone/repo"]
+        )
+
+    assert counts == {"bitcoin/bitcoin": 120, "ethereum/go-ethereum": 4}
+    assert route.call_count == 2
+    assert "since" in json.loads(route.calls.last.request.content)["variables"]
+
+
+@pytest.mark.asyncio
+async def test_github_dev_activity_batch_http_error(respx_mock):
+    respx_mock.post("https://api.github.com/graphql").mock(
+        return_value=httpx.Response(502, json={"message": "Bad Gateway"})
+    )
+
+    async with GitHubClient() as client:
+        counts = await client.get_dev_activity_batch(["bitcoin/bitcoin"])
+
+    assert counts == {}
+
+
+@pytest.mark.asyncio
+async def test_github_dev_activity_batch_timeout(respx_mock, monkeypatch):
+    monkeypatch.setattr(settings, "max_retries", 1)
+    respx_mock.post("https://api.github.com/graphql").mock(
+        side_effect=httpx.ReadTimeout("timed out")
+    )
+
+    async with GitHubClient() as client:
+        counts = await client.get_dev_activity_batch(["bitcoin/bitcoin"])
+
+    assert counts == {}
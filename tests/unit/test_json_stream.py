@@ -0,0 +1,85 @@
+import json
+import pytest
+import httpx
+from crypto_auto.api.defillama import DeFiLlamaClient
+from crypto_auto.api.json_stream import TopLevelFieldExtractor, extract_fields
+
+PROTOCOL_PAYLOAD = {
+    "id": "2269",
+    "name": 'Tricky "name" with } and ] inside',
+    "tvl": [{"date": 1_600_000_000 + i, "totalLiquidityUSD": i * 1.5} for i in range(500)],
+    "chainTvls": {"Ethereum": {"tvl": [[i, {"note": "[{,}]"}] for i in range(100)]}},
+    "mcap": 1_200_000_000,
+    "fdv": None,
+    "price": 12.5,
+    "raises": [{"mcap": 1}],
+}
+
+
+def _feed_in_chunks(payload: bytes, fields, chunk_size: int) -> dict:
+    extractor = TopLevelFieldExtractor(fields)
+    for start in range(0, len(payload), chunk_size):
+        extractor.feed(payload[start : start + chunk_size])
+    return extractor.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 20])
+def test_extractor_picks_top_level_fields(chunk_size):
+    payload = json.dumps(PROTOCOL_PAYLOAD, indent=1).encode()
+
+    result = _feed_in_chunks(payload, ["mcap", "fdv", "price", "name"], chunk_size)
+
+    assert result == {
+        "name": PROTOCOL_PAYLOAD["name"],
+        "mcap": 1_200_000_000,
+        "fdv": None,
+        "price": 12.5,
+    }
+
+
+def test_extractor_captures_nested_values_and_escaped_keys():
+    payload = b'{"a\\"b": [1, {"c": "}"}], "skip": {"x": [[]]}, "last": {"k": 1}}'
+
+    result = _feed_in_chunks(payload, ['a"b', "last"], 2)
+
+    assert result == {'a"b': [1, {"c": "}"}], "last": {"k": 1}}
+
+
+def test_extractor_missing_fields_and_empty_object():
+    assert _feed_in_chunks(b'{"tvl": [1, 2]}', ["mcap"], 4) == {}
+    assert _feed_in_chunks(b" {} ", ["mcap"], 1) == {}
+
+
+@pytest.mark.parametrize("payload", [b"invalid json{", b"[1, 2]", b'{"mcap": 1, "tvl": [1'])
+def test_extractor_rejects_invalid_documents(payload):
+    with pytest.raises(ValueError):
+        _feed_in_chunks(payload, ["mcap", "price"], 4)
+
+
+@pytest.mark.asyncio
+async def test_extract_fields_stops_once_all_fields_are_seen():
+    consumed = []
+
+    async def chunks():
+        for chunk in [b'{"mcap": 5, ', b'"price": 2, ', b'"tvl": [', b"BROKEN"]:
+            consumed.append(chunk)
+            yield chunk
+
+    result = await extract_fields(chunks(), ["mcap", "price"])
+
+    assert result == {"mcap": 5, "price": 2}
+    assert len(consumed) == 2
+
+
+@pytest.mark.asyncio
+async def test_defillama_slug_endpoint_is_streamed(respx_mock):
+    respx_mock.get("https://api.llama.fi/protocol/big").mock(
+        return_value=httpx.Response(200, content=json.dumps(PROTOCOL_PAYLOAD).encode())
+    )
+
+    async with DeFiLlamaClient() as client:
+        market_data = await client.get_market_data("big")
+
+    assert market_data.market_cap == 1_200_000_000
+    assert market_data.fdv == 1_800_000_000
+    assert market_data.price == 12.5
@@ -0,0 +1,38 @@
+import gzip
+import json
+import pytest
+from crypto_auto.outputs import json_writer
+from crypto_auto.outputs.json_writer import write_analysis_json
+
+
+@pytest.fixture(params=["orjson", "pydantic_core"])
+def backend(request, monkeypatch):
+    if request.param == "pydantic_core":
+        monkeypatch.setattr(json_writer, "orjson", None)
+
+
+def test_compact_gzip_matches_indented(tmp_path, backend, sample_projects):
+    indented = write_analysis_json(sample_projects, [], tmp_path, compact=False, compress=False)
+    compressed = write_analysis_json(sample_projects, [], tmp_path, compact=True, compress=True)
+
+    data = json.loads(indented.read_text())
+    compact_text = gzip.decompress(compressed.read_bytes())
+    assert compressed.name.endswith(".json.gz")
+    assert b"\n" not in compact_text
+    assert json.loads(compact_text)["projects"] == data["projects"]
+    assert data["summary"]["total_commits"] == sum(p.dev_commits_30d for p in sample_projects)
+
+
+def test_failed_write_keeps_previous_file(tmp_path, sample_project_analysis):
+    path = write_analysis_json([sample_project_analysis], [], tmp_path, compact=False)
+    previous = path.read_bytes()
+
+    def projects():
+        yield sample_project_analysis
+        raise RuntimeError("analysis crashed")
+
+    with pytest.raises(RuntimeError):
+        write_analysis_json(projects(), [], tmp_path, compact=False)
+
+    assert path.read_bytes() == previous
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,57 @@
+import io
+import json
+import pytest
+import structlog
+from crypto_auto.main import configure_logging
+from crypto_auto.outputs.log_sink import BackgroundLogSink, BackgroundLogger
+
+
+@pytest.fixture
+def reset_structlog():
+    yield
+    structlog.reset_defaults()
+
+
+def test_sink_writes_lines_in_order_on_close():
+    stream = io.StringIO()
+    sink = BackgroundLogSink(stream, max_batch=3)
+    logger = BackgroundLogger(sink)
+
+    for i in range(10):
+        logger.info(f"line {i}")
+    sink.close()
+    sink.close()
+
+    assert stream.getvalue().splitlines() == [f"line {i}" for i in range(10)]
+
+
+def test_sink_survives_closed_stream():
+    stream = io.StringIO()
+    stream.close()
+    sink = BackgroundLogSink(stream)
+
+    sink.write("dropped")
+    sink.close()
+
+
+def test_configure_logging_filters_below_level(capsys, reset_structlog):
+    logger = configure_logging("warning")
+
+    logger.debug("allocation_calculated", ticker="BTC")
+    logger.info("api_request", url="https://api.llama.fi/protocols")
+    logger.warning("rate_limit_wait", host="api.github.com")
+    structlog.get_config()["logger_factory"].sink.close()
+
+    [line] = capsys.readouterr().out.splitlines()
+    assert json.loads(line)["event"] == "rate_limit_wait"
+
+
+def test_configure_logging_falls_back_to_info(capsys, reset_structlog):
+    logger = configure_logging("chatty")
+
+    logger.debug("allocation_calculated")
+    logger.info("api_request")
+    structlog.get_config()["logger_factory"].sink.close()
+
+    events = [json.loads(line)["event"] for line in capsys.readouterr().out.splitlines()]
+    assert events == ["unknown_log_level", "api_request"]
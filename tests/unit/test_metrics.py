@@ -0,0 +1,88 @@
+import json
+import pytest
+import httpx
+from crypto_auto.api.cache import ResponseCache
+from crypto_auto.api.defillama import DeFiLlamaClient
+from crypto_auto.api.github_api import GitHubClient
+from crypto_auto.api.metrics import LatencyHistogram, RequestMetrics, endpoint_template
+from crypto_auto.outputs.metrics_writer import write_metrics
+
+
+def test_endpoint_template_folds_resource_ids():
+    assert endpoint_template("/protocol/uniswap") == "/protocol/{id}"
+    assert endpoint_template("/repos/ethereum/go-ethereum/commits") == "/repos/{repo}/commits"
+    assert endpoint_template("/protocols") == "/protocols"
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = LatencyHistogram()
+    for seconds in (0.001, 0.02, 0.02, 0.3, 20.0):
+        histogram.observe(seconds)
+
+    assert histogram.count == 5
+    assert histogram.quantile(0.5) == 0.025
+    assert histogram.quantile(1.0) == float("inf")
+    assert sum(histogram.to_dict()["buckets"].values()) == 5
+
+
+def test_prometheus_histogram_is_cumulative():
+    metrics = RequestMetrics()
+    metrics.observe_response("GET", "api.llama.fi", "/protocol/a", 200, 0.02, 100)
+    metrics.observe_response("GET", "api.llama.fi", "/protocol/b", 404, 0.2, 10)
+
+    text = metrics.to_prometheus()
+    labels = 'method="GET",host="api.llama.fi",endpoint="/protocol/{id}"'
+
+    assert f'crypto_auto_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+    assert f'crypto_auto_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f'crypto_auto_requests_total{{{labels},status="404"}} 1' in text
+    assert f"crypto_auto_response_bytes_total{{{labels}}} 110" in text
+
+
+@pytest.mark.asyncio
+async def test_client_records_retries_and_throttling(respx_mock, monkeypatch):
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr("asyncio.sleep", no_sleep)
+    respx_mock.get("https://api.github.com/repos/busy/repo/commits").mock(
+        side_effect=[
+            httpx.Response(429, headers={"Retry-After": "3"}),
+            httpx.Response(200, json=[{"sha": "a"}]),
+        ]
+    )
+    metrics = RequestMetrics()
+
+    async with GitHubClient(metrics=metrics) as client:
+        assert await client.get_commit_activity("busy/repo") == 1
+
+    [endpoint] = metrics.endpoints.values()
+    host = metrics.hosts["api.github.com"]
+    assert endpoint.statuses == {"429": 1, "200": 1}
+    assert endpoint.response_bytes > 0
+    assert host.retries == 1
+    assert host.throttle_seconds == 3
+
+
+@pytest.mark.asyncio
+async def test_client_records_cache_hit_ratio(tmp_path, respx_mock):
+    respx_mock.get("https://api.llama.fi/protocol/bitcoin").mock(
+        return_value=httpx.Response(200, json={"mcap": 100, "fdv": 200, "price": 1.0})
+    )
+    metrics = RequestMetrics()
+
+    async with DeFiLlamaClient(cache=ResponseCache(tmp_path / "cache"), metrics=metrics) as client:
+        for _ in range(4):
+            await client.get_market_data("bitcoin")
+
+    host = metrics.hosts["api.llama.fi"]
+    assert (host.cache_misses, host.cache_hits) == (1, 3)
+    assert host.cache_hit_ratio == 0.75
+
+    metrics.record_phase("analyze", 0.5)
+    json_path, prometheus_path = write_metrics(metrics, tmp_path / "metrics")
+
+    exported = json.loads(json_path.read_text())
+    assert exported["hosts"]["api.llama.fi"]["cache_hit_ratio"] == 0.75
+    assert exported["phases"] == {"analyze": 0.5}
+    assert 'crypto_auto_cache_hits_total{host="api.llama.fi"} 3' in prometheus_path.read_text()
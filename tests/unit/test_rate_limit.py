@@ -0,0 +1,179 @@
+import time
+import pytest
+import httpx
+from crypto_auto.api.base import RateLimitError
+from crypto_auto.api.github_api import GitHubClient
+from crypto_auto.api.rate_limit import (
+    SECONDARY_LIMIT_WAIT,
+    RateLimiter,
+    is_rate_limited,
+    rate_limit_delay,
+    retry_after_seconds,
+)
+from crypto_auto.config.settings import settings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def recorded_sleeps(monkeypatch):
+    clock = FakeClock()
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr("crypto_auto.api.rate_limit.time", clock)
+    monkeypatch.setattr("asyncio.sleep", fake_sleep)
+    return sleeps
+
+
+def test_retry_after_seconds_formats():
+    now = 1_700_000_000.0
+
+    assert retry_after_seconds(httpx.Headers({"Retry-After": "7"}), now) == 7.0
+    assert retry_after_seconds(
+        httpx.Headers({"Retry-After": "Tue, 14 Nov 2023 22:13:40 GMT"}), now
+    ) == pytest.approx(20.0)
+    assert retry_after_seconds(
+        httpx.Headers({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(now) + 30)}), now
+    ) == pytest.approx(30.0)
+    assert retry_after_seconds(httpx.Headers({"X-RateLimit-Remaining": "12"}), now) is None
+
+
+def test_is_rate_limited():
+    assert is_rate_limited(httpx.Response(429))
+    assert is_rate_limited(httpx.Response(403, headers={"X-RateLimit-Remaining": "0"}))
+    assert not is_rate_limited(httpx.Response(403, json={"message": "Forbidden"}))
+    assert not is_rate_limited(httpx.Response(200))
+
+    secondary = httpx.Response(
+        403, json={"message": "You have exceeded a secondary rate limit. Please wait."}
+    )
+    assert is_rate_limited(secondary)
+    assert rate_limit_delay(secondary) == SECONDARY_LIMIT_WAIT
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_tracks_resources_separately(recorded_sleeps):
+    limiter = RateLimiter(reserve=1, max_wait=60)
+    reset_at = time.time() + 20
+    limiter.update(
+        "api.github.com",
+        httpx.Response(
+            200,
+            headers={
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(reset_at),
+                "X-RateLimit-Resource": "graphql",
+            },
+        ),
+    )
+    limiter.update(
+        "api.github.com",
+        httpx.Response(
+            200,
+            headers={
+                "X-RateLimit-Remaining": "4000",
+                "X-RateLimit-Reset": str(reset_at),
+                "X-RateLimit-Resource": "core",
+            },
+        ),
+    )
+
+    await limiter.acquire("api.github.com", "core")
+    assert recorded_sleeps == []
+
+    await limiter.acquire("api.github.com", "graphql")
+    assert recorded_sleeps[0] == pytest.approx(20, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_waits_for_reset_when_budget_exhausted(recorded_sleeps):
+    limiter = RateLimiter(reserve=1, max_wait=60)
+    reset_at = time.time() + 20
+    limiter.update(
+        "api.github.com",
+        httpx.Response(
+            200, headers={"X-RateLimit-Remaining": "2", "X-RateLimit-Reset": str(reset_at)}
+        ),
+    )
+
+    await limiter.acquire("api.github.com")
+    assert recorded_sleeps == []
+
+    await limiter.acquire("api.github.com")
+    assert len(recorded_sleeps) == 1
+    assert recorded_sleeps[0] == pytest.approx(20, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_fails_fast_beyond_max_wait():
+    limiter = RateLimiter(reserve=0, max_wait=5)
+    limiter.update(
+        "api.github.com",
+        httpx.Response(
+            403,
+            headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 600)},
+        ),
+    )
+
+    with pytest.raises(RateLimitError) as exc_info:
+        await limiter.acquire("api.github.com")
+
+    assert exc_info.value.retry_after > 5
+
+
+@pytest.mark.asyncio
+async def test_client_retries_after_retry_after(respx_mock, recorded_sleeps):
+    route = respx_mock.get("https://api.github.com/repos/busy/repo/commits").mock(
+        side_effect=[
+            httpx.Response(429, headers={"Retry-After": "3"}),
+            httpx.Response(200, json=[{"sha": "a"}]),
+        ]
+    )
+
+    async with GitHubClient(rate_limiter=RateLimiter()) as client:
+        commit_count = await client.get_commit_activity("busy/repo")
+
+    assert commit_count == 1
+    assert route.call_count == 2
+    assert 3 in [round(s) for s in recorded_sleeps]
+
+
+@pytest.mark.asyncio
+async def test_client_backs_off_when_429_has_no_delay(respx_mock, recorded_sleeps):
+    route = respx_mock.get("https://api.github.com/repos/busy/repo/commits").mock(
+        side_effect=[httpx.Response(429), httpx.Response(200, json=[{"sha": "a"}])]
+    )
+
+    async with GitHubClient(rate_limiter=RateLimiter()) as client:
+        commit_count = await client.get_commit_activity("busy/repo")
+
+    assert commit_count == 1
+    assert route.call_count == 2
+    # No advertised delay: the exponential backoff applies instead of an immediate retry
+    assert max(recorded_sleeps) >= 2
+
+
+@pytest.mark.asyncio
+async def test_exhausted_rate_limit_is_not_reported_as_zero_commits(respx_mock, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_max_wait", 5)
+    respx_mock.get("https://api.github.com/repos/busy/repo/commits").mock(
+        return_value=httpx.Response(
+            403,
+            headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 900)},
+            json={"message": "API rate limit exceeded"},
+        )
+    )
+
+    async with GitHubClient() as client:
+        with pytest.raises(RateLimitError):
+            await client.get_commit_activity("busy/repo")
@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+import httpx
+from crypto_auto.api.github_api import GitHubClient
+from crypto_auto.api.defillama import DeFiLlamaClient
+from crypto_auto.api.scheduler import RequestScheduler
+from crypto_auto.commands.run import analyze_project
+
+
+async def _track(scheduler, host, active, peaks):
+    async with scheduler.slot(host):
+        active[host] = active.get(host, 0) + 1
+        peaks[host] = max(peaks.get(host, 0), active[host])
+        peaks["total"] = max(peaks.get("total", 0), scheduler.in_flight)
+        await asyncio.sleep(0.01)
+        active[host] -= 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_enforces_per_host_limit():
+    scheduler = RequestScheduler(max_concurrency=10, per_host_limit=2)
+    active, peaks = {}, {}
+
+    await asyncio.gather(*(_track(scheduler, "api.github.com", active, peaks) for _ in range(6)))
+
+    assert peaks["api.github.com"] == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduler_enforces_global_limit_and_host_overrides():
+    scheduler = RequestScheduler(
+        max_concurrency=3, per_host_limit=3, host_limits={"api.llama.fi": 1}
+    )
+    active, peaks = {}, {}
+
+    await asyncio.gather(
+        *(_track(scheduler, "api.github.com", active, peaks) for _ in range(5)),
+        *(_track(scheduler, "api.llama.fi", active, peaks) for _ in range(5)),
+    )
+
+    assert peaks["api.llama.fi"] == 1
+    assert peaks["total"] <= 3
+
+
+@pytest.mark.asyncio
+async def test_analyze_project_fetches_repos_concurrently(respx_mock, sample_crypto_project):
+    project = sample_crypto_project.model_copy(
+        update={"github_repos": ["bitcoin/bitcoin", "bitcoin/bips", "bitcoin/secp256k1"]}
+    )
+    in_flight = 0
+    peak = 0
+
+    async def slow_response(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        if request.url.host == "api.llama.fi":
+            return httpx.Response(200, json={"mcap": 100, "fdv": 100, "price": 1.0})
+        return httpx.Response(200, json=[{"sha": "a"}, {"sha": "b"}])
+
+    respx_mock.get(url__regex=r".*").mock(side_effect=slow_response)
+    scheduler = RequestScheduler(max_concurrency=10, per_host_limit=10)
+
+    async with (
+        DeFiLlamaClient(scheduler=scheduler) as defillama_client,
+        GitHubClient(scheduler=scheduler) as github_client,
+    ):
+        analysis = await analyze_project(project, defillama_client, github_client)
+
+    assert analysis.dev_commits_30d == 6
+    assert peak == 4
+
+
+@pytest.mark.asyncio
+async def test_analyze_project_uses_prefetched_dev_activity(respx_mock, sample_crypto_project):
+    respx_mock.get("https://api.llama.fi/protocol/bitcoin").mock(
+        return_value=httpx.Response(200, json={"mcap": 100, "fdv": 100, "price": 1.0})
+    )
+
+    async with DeFiLlamaClient() as defillama_client, GitHubClient() as github_client:
+        analysis = await analyze_project(
+            sample_crypto_project,
+            defillama_client,
+            github_client,
+            dev_activity={"bitcoin/bitcoin": 42},
+        )
+
+    assert analysis.dev_commits_30d == 42
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import pytest
+import httpx
+from crypto_auto.api.defillama import DeFiLlamaClient
+from crypto_auto.api.github_api import GitHubClient
+from crypto_auto.commands.serve import PortfolioDaemon
+from crypto_auto.config.settings import settings
+
+
+@pytest.fixture
+def daemon_settings(monkeypatch):
+    monkeypatch.setattr(settings, "snapshot_store_enabled", False)
+    monkeypatch.setattr(settings, "github_graphql_enabled", False)
+    monkeypatch.setattr(settings, "github_exact_commit_count", False)
+
+
+async def _get(server, path: str) -> tuple[str, bytes]:
+    host, port = server.sockets[0].getsockname()[:2]
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return head.decode().split("\r\n")[0], body
+
+
+@pytest.mark.asyncio
+async def test_refreshes_are_independent_and_reads_are_served(
+    daemon_settings, sample_crypto_project, respx_mock
+):
+    market_route = respx_mock.get("https://api.llama.fi/protocols").mock(
+        return_value=httpx.Response(
+            200, json=[{"slug": "bitcoin", "mcap": 1_800, "fdv": 2_000, "price": 95_000.0}]
+        )
+    )
+    commits_route = respx_mock.get("https://api.github.com/repos/bitcoin/bitcoin/commits").mock(
+        return_value=httpx.Response(200, json=[{"sha": "a"}, {"sha": "b"}])
+    )
+
+    async with DeFiLlamaClient() as defillama_client, GitHubClient() as github_client:
+        daemon = PortfolioDaemon([sample_crypto_project], defillama_client, github_client)
+        await daemon.refresh_market_data()
+        await daemon.refresh_dev_activity()
+        daemon.rebuild()
+
+        market_route.mock(
+            return_value=httpx.Response(
+                200, json=[{"slug": "bitcoin", "mcap": 900, "fdv": 2_000, "price": 47_500.0}]
+            )
+        )
+        await daemon.refresh_market_data()
+        daemon.rebuild()
+
+        server = await asyncio.start_server(daemon.handle_request, "127.0.0.1", 0)
+        async with server:
+            status, body = await _get(server, "/analysis")
+            health_status, health = await _get(server, "/health")
+            missing_status, _ = await _get(server, "/nope")
+
+    assert market_route.call_count == 2
+    assert commits_route.call_count == 1
+
+    assert status == "HTTP/1.1 200 OK"
+    [analysis] = json.loads(body)
+    assert analysis["market_data"]["price"] == 47_500.0
+    assert analysis["dev_commits_30d"] == 2
+
+    assert health_status == "HTTP/1.1 200 OK"
+    assert set(json.loads(health)["refreshed_at"]) == {"market_data", "dev_activity"}
+    assert missing_status == "HTTP/1.1 404 Not Found"
+
+
+@pytest.mark.asyncio
+async def test_failed_market_refresh_keeps_last_good_value(
+    daemon_settings, sample_crypto_project, sample_market_data, respx_mock
+):
+    respx_mock.get("https://api.llama.fi/protocols").mock(return_value=httpx.Response(500))
+    respx_mock.get("https://api.llama.fi/protocol/bitcoin").mock(return_value=httpx.Response(500))
+
+    async with DeFiLlamaClient() as defillama_client, GitHubClient() as github_client:
+        daemon = PortfolioDaemon([sample_crypto_project], defillama_client, github_client)
+        daemon.market_data["BTC"] = sample_market_data
+        await daemon.refresh_market_data()
+        daemon.rebuild()
+
+    assert daemon.analyses["BTC"].market_data == sample_market_data
+
+
+@pytest.mark.asyncio
+async def test_failed_index_reload_is_not_reported_fresh(
+    daemon_settings, sample_crypto_project, respx_mock
+):
+    respx_mock.get("https://api.llama.fi/protocols").mock(
+        side_effect=[
+            httpx.Response(200, json=[{"slug": "bitcoin", "mcap": 1_000, "fdv": 2_000}]),
+            httpx.Response(500),
+            httpx.Response(500),
+        ]
+    )
+    protocol_route = respx_mock.get("https://api.llama.fi/protocol/bitcoin").mock(
+        side_effect=[
+            httpx.Response(500),
+            httpx.Response(200, json={"mcap": 3_000, "fdv": 4_000}),
+        ]
+    )
+
+    async with DeFiLlamaClient() as defillama_client, GitHubClient() as github_client:
+        daemon = PortfolioDaemon([sample_crypto_project], defillama_client, github_client)
+        await daemon.refresh_market_data()
+        refreshed_at = daemon.refreshed_at["market_data"]
+
+        # The stale index is dropped, so the failing per-protocol request is what counts
+        await daemon.refresh_market_data()
+        assert daemon.refreshed_at["market_data"] == refreshed_at
+        assert daemon.market_data["BTC"].market_cap == 1_000
+
+        await daemon.refresh_market_data()
+
+    assert protocol_route.call_count == 2
+    assert daemon.market_data["BTC"].market_cap == 3_000
+    assert daemon.refreshed_at["market_data"] != refreshed_at
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("interval", [0, 0.0, -5])
+async def test_serve_rejects_non_positive_interval(
+    temp_cryptos_json, monkeypatch, capsys, interval
+):
+    from crypto_auto.commands.serve import serve
+
+    monkeypatch.setattr(settings, "github_token", "test")
+
+    assert await serve(str(temp_cryptos_json), port=0, market_interval=interval) == 1
+    assert "market refresh interval must be positive" in capsys.readouterr().out
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from crypto_auto.storage.snapshot_store import SnapshotStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    with SnapshotStore(tmp_path / "snapshots.db") as store:
+        yield store
+
+
+def _analysis_at_price(analysis, price):
+    return analysis.model_copy(
+        update={"market_data": analysis.market_data.model_copy(update={"price": price})}
+    )
+
+
+def test_write_snapshot_and_read_history(store, sample_project_analysis):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for week in range(5):
+        store.write_snapshot(
+            [_analysis_at_price(sample_project_analysis, 90_000.0 + week)],
+            timestamp=start + timedelta(weeks=week),
+        )
+
+    history = store.history("btc")
+
+    assert [r.price for r in history] == [90_000.0, 90_001.0, 90_002.0, 90_003.0, 90_004.0]
+    assert history[0].fdv_status == "EXCELLENT"
+    assert history[0].dev_commits_30d == 150
+
+
+def test_history_range_query(store, sample_project_analysis):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for week in range(10):
+        store.write_snapshot([sample_project_analysis], timestamp=start + timedelta(weeks=week))
+
+    history = store.history(
+        "BTC",
+        start=(start + timedelta(weeks=2)).isoformat(),
+        end=(start + timedelta(weeks=4)).isoformat(),
+    )
+
+    assert len(history) == 3
+    assert history[0].timestamp == (start + timedelta(weeks=2)).isoformat()
+
+
+def test_history_query_uses_ticker_timestamp_index(store):
+    plan = store.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT price FROM project_snapshots "
+        "WHERE ticker = ? AND timestamp >= ? ORDER BY timestamp",
+        ("BTC", "2024-01-01"),
+    ).fetchall()
+
+    assert any("idx_project_snapshots_ticker_timestamp" in row[-1] for row in plan)
+
+
+def test_latest_and_tickers(store, sample_project_analysis):
+    store.write_snapshot(
+        [_analysis_at_price(sample_project_analysis, 1.0)],
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    store.write_snapshot(
+        [_analysis_at_price(sample_project_analysis, 2.0)],
+        timestamp=datetime(2024, 1, 8, tzinfo=timezone.utc),
+    )
+
+    assert store.latest("BTC").price == 2.0
+    assert store.latest("ETH") is None
+    assert store.tickers() == ["BTC"]
+
+
+def test_store_uses_wal_mode(store):
+    assert store.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_history_records_are_slotted(store, sample_project_analysis):
+    store.write_snapshot([sample_project_analysis])
+
+    (record,) = store.history("BTC")
+
+    assert not hasattr(record, "__dict__")
+    assert record.mcap_fdv_ratio == sample_project_analysis.market_data.mcap_fdv_ratio
+    assert record.health_status == sample_project_analysis.health_status
+
+
+def test_weekly_series_buckets_by_iso_week(store, sample_project_analysis):
+    # Sun 2024-12-29 closes ISO week 2024-W52; Mon 2024-12-30 to Sun 2025-01-05 is 2025-W01
+    for day, price in [((2024, 12, 29), 1.0), ((2024, 12, 30), 2.0), ((2025, 1, 5), 3.0)]:
+        store.write_snapshot(
+            [_analysis_at_price(sample_project_analysis, price)],
+            timestamp=datetime(*day, 12, tzinfo=timezone.utc),
+        )
+
+    weeks, series = store.weekly_series(["BTC"], ("price",))
+
+    assert weeks == ["2024-12-23", "2024-12-30"]
+    assert series["price"][:, 0].tolist() == [1.0, 3.0]
@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+from benchmarks.bench_import_time import import_times
+
+HEAVY_MODULES = ("httpx", "tenacity", "pydantic_settings", "rich", "numpy", "structlog")
+
+
+def test_cli_import_skips_heavy_dependencies():
+    times = import_times("crypto_auto.main")
+
+    assert not [m for m in HEAVY_MODULES if m in times]
+    assert times["crypto_auto.main"] < 100_000
+
+
+def test_importing_modules_does_not_load_settings():
+    env = {k: v for k, v in os.environ.items() if k != "GITHUB_TOKEN"}
+    code = (
+        "import crypto_auto.api.github_api, crypto_auto.analysis.fdv_analyzer, "
+        "crypto_auto.commands.run\n"
+        "from crypto_auto.config.settings import get_settings\n"
+        "assert get_settings.cache_info().currsize == 0"
+    )
+
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,45 @@
+import io
+import json
+from crypto_auto.outputs import console as console_module
+from crypto_auto.outputs.console import LiveAnalysisTable
+from crypto_auto.outputs.json_writer import AnalysisStreamWriter
+
+
+def test_stream_writer_flushes_each_project(tmp_path, sample_project_analysis):
+    with AnalysisStreamWriter(tmp_path) as writer:
+        writer.write(sample_project_analysis)
+        # Readable before the writer is closed
+        [line] = writer.path.read_text().splitlines()
+
+    assert json.loads(line)["ticker"] == "BTC"
+    assert writer.path.name.endswith(".ndjson")
+
+
+def test_live_table_keeps_only_latest_rows(monkeypatch, sample_project_analysis):
+    monkeypatch.setattr(console_module.console, "record", True)
+
+    with LiveAnalysisTable(total=5, max_rows=2) as table:
+        for _ in range(5):
+            table.add(sample_project_analysis)
+
+    assert table.completed == 5
+    assert len(table._rows) == 2
+    assert "5/5 projects analyzed (latest 2 shown)" in console_module.console.export_text()
+
+
+def test_log_lines_are_printed_above_the_live_table(monkeypatch, capsys, sample_project_analysis):
+    from rich.console import Console
+    from crypto_auto.outputs.log_sink import BackgroundLogSink, BackgroundLogger
+
+    screen = io.StringIO()
+    monkeypatch.setattr(console_module, "console", Console(file=screen, force_terminal=True))
+    sink = BackgroundLogSink()
+
+    with LiveAnalysisTable(total=1) as table:
+        BackgroundLogger(sink).info('{"event": "api_request"}')
+        # Joins the writer thread, so the line is written while the table is live
+        sink.close()
+        table.add(sample_project_analysis)
+
+    assert "api_request" in screen.getvalue()
+    assert "api_request" not in capsys.readouterr().out
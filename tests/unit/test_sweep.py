@@ -0,0 +1,150 @@
+import json
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+from crypto_auto.analysis.backtest import run_dca_backtest
+from crypto_auto.analysis.sweep import expand_grid, run_sweep, simulate
+from crypto_auto.config.loader import ConfigurationError, load_sweep_grid
+from crypto_auto.main import cli
+from crypto_auto.models.sweep import SweepGrid
+from crypto_auto.storage.snapshot_store import SnapshotStore
+
+TICKERS = ["BTC", "ETH"]
+
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(3)
+    prices = np.cumprod(1 + rng.normal(0, 0.05, (40, 2)), axis=0) * [95000.0, 4200.0]
+    ratios = np.column_stack([np.full(40, 0.95), np.linspace(0.2, 0.6, 40)])
+    return prices, ratios
+
+
+def test_expand_grid_skips_inconsistent_thresholds():
+    grid = SweepGrid(
+        fdv_ratio_warning_threshold=[0.3, 0.5],
+        fdv_ratio_target_min=[0.45],
+        fdv_ratio_target_max=[0.5, 0.6],
+        allocations=[{"btc": 0.7, "eth": 0.3}, {"BTC": 0.5, "ETH": 0.5}],
+    )
+
+    thresholds, allocations, allocation_dicts = expand_grid(grid, TICKERS, {})
+
+    assert thresholds.tolist() == [[0.3, 0.45, 0.5]] * 2 + [[0.3, 0.45, 0.6]] * 2
+    assert allocations.tolist() == [[0.7, 0.3], [0.5, 0.5]] * 2
+    assert allocation_dicts[0] == {"BTC": 0.7, "ETH": 0.3}
+
+
+def test_expand_grid_rejects_unknown_tickers():
+    grid = SweepGrid(allocations=[{"SOL": 1.0}])
+
+    with pytest.raises(ValueError, match="SOL"):
+        expand_grid(grid, TICKERS, {})
+
+
+def test_sweep_grid_rejects_allocations_not_summing_to_one():
+    with pytest.raises(ValueError, match="sums to"):
+        SweepGrid(allocations=[{"BTC": 0.5}])
+
+
+def test_sweep_warning_threshold_blocks_purchases(history):
+    prices, ratios = history
+    grid = SweepGrid(
+        fdv_ratio_warning_threshold=[0.0, 0.7],
+        fdv_ratio_target_min=[0.7],
+        fdv_ratio_target_max=[0.8],
+    )
+
+    results = run_sweep(
+        prices, ratios, grid, TICKERS, {"BTC": 0.5, "ETH": 0.5}, 100.0, workers=1,
+        rank_by="healthy_share",
+    )
+
+    blocked = next(r for r in results if r.warning_threshold == 0.7)
+    unblocked = next(r for r in results if r.warning_threshold == 0.0)
+    assert blocked.healthy_share == pytest.approx(1.0)
+    assert unblocked.healthy_share < 1.0
+    assert results[0] == blocked
+
+
+def test_simulate_skips_assets_without_ratio():
+    prices = np.ones((10, 2))
+    # BTC sits in CAUTION (bought, not healthy); ETH has no ratio at all
+    ratios = np.column_stack([np.full(10, 0.42), np.full(10, np.nan)])
+
+    metrics = simulate(prices, ratios, np.array([[0.4, 0.45, 0.5]]), np.array([[0.5, 0.5]]), 100.0)
+
+    final_value, total_return, *_, healthy_share = metrics[0]
+    assert final_value == pytest.approx(1000.0)
+    assert total_return == pytest.approx(0.0)
+    assert healthy_share == 0.0
+
+
+def test_sweep_matches_single_backtest(history):
+    prices, ratios = history
+    grid = SweepGrid(fdv_ratio_warning_threshold=[0.0])
+
+    (result,) = run_sweep(prices, ratios, grid, TICKERS, {"BTC": 0.6, "ETH": 0.4}, 100.0, workers=1)
+
+    expected = run_dca_backtest(prices, np.array([0.6, 0.4]), 100.0).summary()
+    assert result.total_return == pytest.approx(expected["total_return"])
+    assert result.mean_drift == pytest.approx(expected["mean_drift"])
+
+
+def test_sweep_process_pool_matches_serial(history):
+    prices, ratios = history
+    grid = SweepGrid(
+        fdv_ratio_warning_threshold=[0.2, 0.3, 0.4],
+        fdv_ratio_target_min=[0.45, 0.5],
+        allocations=[{"BTC": w, "ETH": 1 - w} for w in (0.3, 0.5, 0.7)],
+    )
+    allocation = {"BTC": 0.5, "ETH": 0.5}
+
+    serial = run_sweep(prices, ratios, grid, TICKERS, allocation, 100.0, workers=1)
+    parallel = run_sweep(prices, ratios, grid, TICKERS, allocation, 100.0, workers=2, chunk_size=4)
+
+    assert [r.model_dump() for r in parallel] == [r.model_dump() for r in serial]
+
+
+def test_run_sweep_rejects_unknown_rank_metric(history):
+    prices, ratios = history
+
+    with pytest.raises(ValueError, match="rank"):
+        run_sweep(prices, ratios, SweepGrid(), TICKERS, {"BTC": 1.0}, 100.0, rank_by="sharpe")
+
+
+def test_load_sweep_grid_errors(tmp_path):
+    with pytest.raises(ConfigurationError, match="not found"):
+        load_sweep_grid(tmp_path / "missing.json")
+
+    bad = tmp_path / "grid.json"
+    bad.write_text(json.dumps({"allocations": [{"BTC": 2.0}]}))
+    with pytest.raises(ConfigurationError, match="Failed to parse"):
+        load_sweep_grid(bad)
+
+
+def test_sweep_command(temp_cryptos_json, sample_project_analysis, tmp_path, capsys):
+    db_path = tmp_path / "snapshots.db"
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with SnapshotStore(db_path) as store:
+        for week in range(4):
+            store.write_snapshot([sample_project_analysis], start + timedelta(weeks=week))
+    grid_path = tmp_path / "grid.json"
+    grid_path.write_text(json.dumps({"fdv_ratio_warning_threshold": [0.3, 0.4]}))
+    output_path = tmp_path / "sweep.json"
+
+    with pytest.raises(SystemExit) as exc_info:
+        cli(
+            [
+                "sweep",
+                "--grid", str(grid_path),
+                "--config", str(temp_cryptos_json),
+                "--db", str(db_path),
+                "--workers", "1",
+                "--output", str(output_path),
+            ]
+        )
+
+    assert exc_info.value.code == 0
+    assert "Parameter Sweep" in capsys.readouterr().out
+    assert len(json.loads(output_path.read_text())) == 2
@@ -0,0 +1,191 @@
+import numpy as np
+import pytest
+import httpx
+from crypto_auto.analysis.history_sync import PriceHistorySync, coin_id
+from crypto_auto.api.defillama import DeFiLlamaCoinsClient
+from crypto_auto.storage.timeseries import DAY_SECONDS, TimeSeriesStore
+
+CHART_URL = "https://coins.llama.fi/chart/coingecko:bitcoin"
+NOW = 1_700_000_000
+TODAY = NOW - NOW % DAY_SECONDS
+
+
+def _chart(days):
+    return {
+        "coins": {
+            "coingecko:bitcoin": {
+                "symbol": "BTC",
+                "prices": [
+                    {"timestamp": TODAY - d * DAY_SECONDS + 60, "price": 100.0 - d} for d in days
+                ],
+            }
+        }
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TimeSeriesStore(tmp_path / "history")
+
+
+def test_append_and_read_memmap_views(store):
+    days = np.arange(5) * DAY_SECONDS
+
+    assert store.append("btc", days, price=np.arange(5.0)) == 5
+
+    data = store.read("BTC", start=DAY_SECONDS, end=3 * DAY_SECONDS)
+    assert isinstance(data["price"], np.memmap)
+    assert data["price"].tolist() == [1.0, 2.0, 3.0]
+    assert np.isnan(data["market_cap"]).all()
+    assert store.tickers() == ["BTC"]
+
+
+def test_append_skips_rows_already_stored(store):
+    store.append("BTC", np.array([0, DAY_SECONDS]), price=np.array([1.0, 2.0]))
+
+    appended = store.append(
+        "BTC", np.array([DAY_SECONDS, 2 * DAY_SECONDS]), price=np.array([9.0, 3.0])
+    )
+
+    assert appended == 1
+    assert store.column("BTC", "price").tolist() == [1.0, 2.0, 3.0]
+
+
+def test_append_rejects_unsorted_timestamps(store):
+    with pytest.raises(ValueError, match="increasing"):
+        store.append("BTC", np.array([DAY_SECONDS, 0]), price=np.array([1.0, 2.0]))
+
+
+def test_interrupted_append_is_truncated(store):
+    store.append("BTC", np.array([0, DAY_SECONDS]), price=np.array([1.0, 2.0]))
+    with open(store.directory / "BTC" / "timestamp.bin", "ab") as f:
+        f.write(np.array([2 * DAY_SECONDS], dtype="<i8").tobytes())
+
+    assert store.length("BTC") == 2
+    assert store.last_timestamp("BTC") == DAY_SECONDS
+
+
+def test_append_keeps_a_row_per_day_and_gaps_fill_in_place(store):
+    store.append("BTC", np.array([0, 3 * DAY_SECONDS]), price=np.array([1.0, 4.0]))
+
+    assert store.column("BTC", "timestamp").tolist() == [d * DAY_SECONDS for d in range(4)]
+    assert store.missing_days("BTC").tolist() == [DAY_SECONDS, 2 * DAY_SECONDS]
+
+    assert store.update("BTC", np.array([DAY_SECONDS, 9 * DAY_SECONDS]), price=[2.0, 9.0]) == 1
+    assert store.missing_days("BTC").tolist() == [2 * DAY_SECONDS]
+    assert store.column("BTC", "price")[:2].tolist() == [1.0, 2.0]
+
+
+def test_weekly_series_takes_last_value_of_each_iso_week(store):
+    # 2024-01-01 is a Monday
+    monday = 1_704_067_200
+    days = monday + np.arange(10) * DAY_SECONDS
+    store.append("BTC", days, price=np.arange(10.0), market_cap=np.full(10, 50.0))
+    store.append("ETH", days[7:8], price=[7.0], market_cap=[30.0], fdv=[60.0])
+
+    weeks, series = store.weekly_series(["BTC", "ETH"], ("price", "mcap_fdv_ratio"))
+
+    assert weeks == ["2024-01-01", "2024-01-08"]
+    assert series["price"][0, 0] == 6.0
+    assert np.isnan(series["price"][0, 1])
+    assert series["price"][1].tolist() == [9.0, 7.0]
+    assert np.isnan(series["mcap_fdv_ratio"][:, 0]).all()
+    assert series["mcap_fdv_ratio"][1, 1] == 0.5
+
+
+def test_invalid_ticker_rejected(store):
+    with pytest.raises(ValueError, match="Invalid ticker"):
+        store.column("../etc", "price")
+
+
+def test_coin_id_prefers_gecko_id():
+    index = {"ethereum": {"gecko_id": "ethereum"}, "uniswap": {"gecko_id": "uniswap"}}
+
+    assert coin_id("uniswap", index) == "coingecko:uniswap"
+    assert coin_id("bitcoin", index) == "coingecko:bitcoin"
+
+
+@pytest.mark.asyncio
+async def test_history_sync_backfills_then_resumes(respx_mock, store, sample_project_analysis):
+    route = respx_mock.get(CHART_URL).mock(
+        side_effect=[
+            httpx.Response(200, json=_chart([3, 2, 1])),
+            httpx.Response(200, json=_chart([-1])),
+        ]
+    )
+
+    async with DeFiLlamaCoinsClient() as client:
+        sync = PriceHistorySync(client, store, backfill_days=3)
+        assert await sync.sync("BTC", "coingecko:bitcoin", now=NOW) == 3
+
+        sync.record_snapshot([sample_project_analysis], now=NOW)
+        assert await sync.sync("BTC", "coingecko:bitcoin", now=NOW + DAY_SECONDS) == 0
+        assert await sync.sync("BTC", "coingecko:bitcoin", now=NOW + 2 * DAY_SECONDS) == 1
+
+    first = route.calls[0].request.url.params
+    assert int(first["start"]) == TODAY - 3 * DAY_SECONDS
+    assert first["span"] == "3"
+    # Later runs start after today's snapshot row, so stored days are never re-fetched
+    assert route.call_count == 2
+    resumed = route.calls[1].request.url.params
+    assert (int(resumed["start"]), resumed["span"]) == (TODAY + DAY_SECONDS, "1")
+
+    data = store.read("BTC")
+    assert data["timestamp"].tolist() == [TODAY - d * DAY_SECONDS for d in (3, 2, 1, 0, -1)]
+    assert data["price"].tolist() == [97.0, 98.0, 99.0, 95000.0, 101.0]
+    assert data["market_cap"][3] == 1_800_000_000_000
+    assert np.isnan(data["fdv"][:3]).all()
+
+
+@pytest.mark.asyncio
+async def test_history_sync_refetches_missing_days(respx_mock, store):
+    route = respx_mock.get(CHART_URL).mock(
+        side_effect=[
+            httpx.Response(200, json=_chart([3, 1])),
+            httpx.Response(200, json=_chart([2])),
+        ]
+    )
+
+    async with DeFiLlamaCoinsClient() as client:
+        sync = PriceHistorySync(client, store, backfill_days=3)
+        assert await sync.sync("BTC", "coingecko:bitcoin", now=NOW) == 2
+        assert await sync.sync("BTC", "coingecko:bitcoin", now=NOW) == 1
+
+    refetch = route.calls[1].request.url.params
+    assert (int(refetch["start"]), refetch["span"]) == (TODAY - 2 * DAY_SECONDS, "1")
+    assert store.read("BTC")["price"].tolist() == [97.0, 98.0, 99.0]
+
+
+@pytest.mark.asyncio
+async def test_history_sync_all_skips_failed_coins(respx_mock, store, sample_crypto_project):
+    respx_mock.get(CHART_URL).mock(return_value=httpx.Response(200, json={"coins": {}}))
+
+    async with DeFiLlamaCoinsClient() as client:
+        synced = await PriceHistorySync(client, store, backfill_days=2).sync_all(
+            [sample_crypto_project], {"bitcoin": {"gecko_id": "bitcoin"}}
+        )
+
+    assert synced == {}
+
+
+@pytest.mark.asyncio
+async def test_history_sync_all_isolates_unexpected_errors(store, sample_crypto_project):
+    def broken_missing_days(ticker):
+        raise OSError("corrupt column file")
+
+    store.missing_days = broken_missing_days
+    async with DeFiLlamaCoinsClient() as client:
+        synced = await PriceHistorySync(client, store).sync_all([sample_crypto_project])
+
+    assert synced == {}
+
+
+def test_record_snapshot_stores_zero_values_as_gaps(store, sample_project_analysis):
+    market_data = sample_project_analysis.market_data.model_copy(update={"fdv": 0.0})
+    analysis = sample_project_analysis.model_copy(update={"market_data": market_data})
+
+    PriceHistorySync(None, store).record_snapshot([analysis], now=NOW)
+
+    data = store.read("BTC")
+    assert data["price"].tolist() == [market_data.price]
+    assert np.isnan(data["fdv"]).all()
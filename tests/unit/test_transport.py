@@ -0,0 +1,49 @@
+import httpx
+import pytest
+from crypto_auto.api.defillama import DeFiLlamaClient
+from crypto_auto.api.github_api import GitHubClient
+from crypto_auto.api.transport import create_http_client
+from crypto_auto.config.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_api_clients_share_one_pool(respx_mock):
+    respx_mock.get("https://api.llama.fi/protocols").mock(return_value=httpx.Response(200, json=[]))
+    route = respx_mock.get("https://api.github.com/repos/test/repo/commits").mock(
+        return_value=httpx.Response(200, json=[])
+    )
+
+    async with create_http_client() as http_client:
+        async with DeFiLlamaClient(http_client=http_client) as defillama_client:
+            async with GitHubClient(http_client=http_client) as github_client:
+                assert defillama_client.client is github_client.client
+                await defillama_client.get("/protocols")
+                await github_client.get_commit_activity("test/repo")
+
+        # Closing an API client leaves the shared pool open for the others
+        assert not http_client.is_closed
+
+    assert route.calls.last.request.headers["Authorization"] == f"token {settings.github_token}"
+    assert "Authorization" not in respx_mock.calls[0].request.headers
+
+
+@pytest.mark.asyncio
+async def test_pool_limits_come_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "http2_enabled", False)
+    monkeypatch.setattr(settings, "http_max_connections", 7)
+    monkeypatch.setattr(settings, "http_max_keepalive_connections", 3)
+
+    async with create_http_client() as http_client:
+        pool = http_client._transport._pool
+
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+    assert not pool._http2
+
+
+@pytest.mark.asyncio
+async def test_standalone_client_owns_its_pool():
+    client = GitHubClient()
+    await client.close()
+
+    assert client.client.is_closed